@@ -1,46 +1,219 @@
+import glob
 import os
-import sqlite3
+import queue
 import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
 from utils.logger import log
+from utils.metrics import metrics
+
+# Rows pulled from SQLite per fetchmany() call
+FETCH_BATCH = 5000
+# Records buffered between the profile readers and the consumer
+QUEUE_SIZE = 20000
+
+# Chromium timestamps count microseconds from 1601-01-01; Firefox from 1970
+_WEBKIT_EPOCH_OFFSET = 11644473600
+
+def _browser_roots():
+    """(browser, engine, profiles directory) for every supported browser on this OS."""
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+        roaming = os.environ.get("APPDATA", os.path.join(home, "AppData", "Roaming"))
+        return [
+            ("Chrome", "chromium", os.path.join(local, "Google", "Chrome", "User Data")),
+            ("Chromium", "chromium", os.path.join(local, "Chromium", "User Data")),
+            ("Edge", "chromium", os.path.join(local, "Microsoft", "Edge", "User Data")),
+            ("Brave", "chromium", os.path.join(local, "BraveSoftware", "Brave-Browser", "User Data")),
+            ("Vivaldi", "chromium", os.path.join(local, "Vivaldi", "User Data")),
+            ("Opera", "chromium", os.path.join(roaming, "Opera Software", "Opera Stable")),
+            ("Firefox", "firefox", os.path.join(roaming, "Mozilla", "Firefox", "Profiles")),
+        ]
+    if sys.platform == "darwin":
+        support = os.path.join(home, "Library", "Application Support")
+        return [
+            ("Chrome", "chromium", os.path.join(support, "Google", "Chrome")),
+            ("Chromium", "chromium", os.path.join(support, "Chromium")),
+            ("Edge", "chromium", os.path.join(support, "Microsoft Edge")),
+            ("Brave", "chromium", os.path.join(support, "BraveSoftware", "Brave-Browser")),
+            ("Vivaldi", "chromium", os.path.join(support, "Vivaldi")),
+            ("Opera", "chromium", os.path.join(support, "com.operasoftware.Opera")),
+            ("Firefox", "firefox", os.path.join(support, "Firefox", "Profiles")),
+        ]
+    config = os.environ.get("XDG_CONFIG_HOME", os.path.join(home, ".config"))
+    return [
+        ("Chrome", "chromium", os.path.join(config, "google-chrome")),
+        ("Chromium", "chromium", os.path.join(config, "chromium")),
+        ("Chromium", "chromium", os.path.join(home, "snap", "chromium", "common", "chromium")),
+        ("Edge", "chromium", os.path.join(config, "microsoft-edge")),
+        ("Brave", "chromium", os.path.join(config, "BraveSoftware", "Brave-Browser")),
+        ("Vivaldi", "chromium", os.path.join(config, "vivaldi")),
+        ("Opera", "chromium", os.path.join(config, "opera")),
+        ("Firefox", "firefox", os.path.join(home, ".mozilla", "firefox")),
+        ("Firefox", "firefox", os.path.join(home, "snap", "firefox", "common", ".mozilla", "firefox")),
+    ]
+
+# Per engine: history database name, visits query, and timestamp conversion to epoch seconds
+_ENGINES = {
+    "chromium": (
+        "History",
+        "SELECT u.url, u.title, v.visit_time FROM visits v JOIN urls u ON u.id = v.url ORDER BY v.visit_time",
+        lambda t: t / 1e6 - _WEBKIT_EPOCH_OFFSET if t else None
+    ),
+    "firefox": (
+        "places.sqlite",
+        "SELECT p.url, p.title, v.visit_date FROM moz_historyvisits v JOIN moz_places p ON p.id = v.place_id "
+        "ORDER BY v.visit_date",
+        lambda t: t / 1e6 if t else None
+    ),
+}
 
 class BrowserHistoryExtractor:
-    def __init__(self):
+    def __init__(self, roots=None, workers=4):
+        # (browser, engine, profiles directory); defaults to the known locations for this OS
+        self.roots = roots if roots is not None else _browser_roots()
+        self.workers = max(1, workers)
         self.history_data = []
 
-    def get_chrome_history(self):
-        """Extracts Chrome history."""
-        # Windows path for Chrome User Data
-        history_path = os.path.expanduser('~') + r"\AppData\Local\Google\Chrome\User Data\Default\History"
-        if not os.path.exists(history_path):
-            log.warning("Chrome history file not found.")
+    def find_profiles(self, engine=None):
+        """Returns (browser, engine, profile name, database path) for every profile with history."""
+        profiles = []
+        for browser, kind, root in self.roots:
+            if engine and kind != engine:
+                continue
+            database = _ENGINES[kind][0]
+            # Profiles are direct children of the root (Opera keeps its history in the root itself)
+            for path in sorted(glob.glob(os.path.join(glob.escape(root), "*", database))) + \
+                        sorted(glob.glob(os.path.join(glob.escape(root), database))):
+                profile = os.path.basename(os.path.dirname(path))
+                profiles.append((browser, kind, profile, path))
+        return profiles
+
+    def iter_profile(self, browser, engine, profile, path):
+        """Yields every visit in one profile's history, oldest first, in fetchmany batches."""
+        _, query, to_epoch = _ENGINES[engine]
+        with _open_readonly(path) as conn:
+            cursor = conn.execute(query)
+            while True:
+                rows = cursor.fetchmany(FETCH_BATCH)
+                if not rows:
+                    break
+                for url, title, visited in rows:
+                    yield {
+                        "browser": browser,
+                        "profile": profile,
+                        "url": url,
+                        "title": title,
+                        "timestamp": to_epoch(visited)
+                    }
+
+    def iter_history(self, engine=None):
+        """Streams visits from every profile, reading the profiles concurrently.
+
+        Each profile is read on a worker thread into a bounded queue, so
+        memory stays flat however many visits there are. Records of
+        different profiles interleave; each one names its browser and profile.
+        """
+        profiles = self.find_profiles(engine)
+        if not profiles:
             return
+        records = queue.Queue(QUEUE_SIZE)
+        done = object()
+        # Set when the consumer stops early, so readers blocked on a full queue give up
+        stopped = threading.Event()
 
-        # Copy to temp location to avoid lock
-        temp_path = "temp_chrome_history"
-        try:
-            shutil.copy2(history_path, temp_path)
-            conn = sqlite3.connect(temp_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT url, title, last_visit_time FROM urls ORDER BY last_visit_time DESC LIMIT 50")
-            
-            for row in cursor.fetchall():
-                self.history_data.append({
-                    "browser": "Chrome",
-                    "url": row[0],
-                    "title": row[1],
-                    "timestamp": row[2]
-                })
-            
-            conn.close()
-            os.remove(temp_path)
-            log.info(f"[bold green]Parsed Chrome history ({len(self.history_data)} entries).[/bold green]")
-        except Exception as e:
-            log.error(f"Failed to extract Chrome history: {e}")
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    records.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read(profile):
+            browser, _, name, path = profile
+            count = 0
+            try:
+                for record in self.iter_profile(*profile):
+                    if not put(record):
+                        return
+                    count += 1
+                log.info(f"[bold green]Parsed {browser} history for profile {name} ({count} visits).[/bold green]")
+            except Exception as e:
+                metrics.error("browser_history", e)
+                log.error(f"Failed to extract {browser} history from {path}: {e}")
+            finally:
+                put(done)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for profile in profiles:
+                pool.submit(read, profile)
+            remaining = len(profiles)
+            try:
+                while remaining:
+                    record = records.get()
+                    if record is done:
+                        remaining -= 1
+                    else:
+                        yield record
+            finally:
+                stopped.set()
+
+    def get_chrome_history(self):
+        """Extracts history from every Chromium-family browser profile."""
+        found = self._collect("chromium")
+        if not found:
+            log.warning("Chrome history file not found.")
+        return self.history_data
 
     def get_firefox_history(self):
-        # Placeholder for Firefox - logic is similar but different path/query
-        pass
+        """Extracts history from every Firefox profile."""
+        found = self._collect("firefox")
+        if not found:
+            log.warning("Firefox history file not found.")
+        return self.history_data
+
+    def _collect(self, engine):
+        if not self.find_profiles(engine):
+            return False
+        self.history_data.extend(self.iter_history(engine))
+        return True
 
     def get_all_history(self):
         self.get_chrome_history()
+        self.get_firefox_history()
         return self.history_data
+
+@contextmanager
+def _open_readonly(path):
+    """Opens a browser database without modifying or locking it.
+
+    Databases are opened in place as immutable read-only URIs. A live
+    browser may still hold recent visits in a write-ahead log that an
+    immutable open would ignore; in that case the database and its WAL
+    are copied to a private temporary directory and read from there.
+    """
+    wal = path + "-wal"
+    if os.path.exists(wal) and os.path.getsize(wal):
+        with tempfile.TemporaryDirectory(prefix="nx_history_") as tmpdir:
+            copy = os.path.join(tmpdir, os.path.basename(path))
+            shutil.copyfile(path, copy)
+            shutil.copyfile(wal, copy + "-wal")
+            conn = sqlite3.connect(copy)
+            try:
+                yield conn
+            finally:
+                conn.close()
+    else:
+        conn = sqlite3.connect(f"{Path(os.path.abspath(path)).as_uri()}?mode=ro&immutable=1", uri=True)
+        try:
+            yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,213 @@
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from artifacts.browser_history import BrowserHistoryExtractor
+from artifacts.recent_files import DEFAULT_EXCLUDES, DEFAULT_MAX_DEPTH, RecentFilesScanner
+from artifacts.system_info import get_system_info
+from core.index import ScanIndex
+from utils.metrics import metrics
+
+# Registered collector plugins, by report key, in registration order
+COLLECTORS = {}
+
+def register(cls):
+    """Class decorator that makes a Collector available to the artifacts command."""
+    COLLECTORS[cls.name] = cls
+    return cls
+
+class Collector:
+    """An artifact collector plugin.
+
+    `collect(cancel)` runs on its own thread and returns the report value.
+    Streaming collectors return an iterable of records instead; it is
+    spooled to disk as it is produced, and they should stop early once
+    `cancel` is set. A collector that has not finished within `timeout`
+    seconds is reported as timed out and abandoned.
+    """
+
+    name = None
+    title = None
+    timeout = 120
+    streaming = False
+
+    @classmethod
+    def from_args(cls, args):
+        return cls()
+
+    def collect(self, cancel):
+        raise NotImplementedError
+
+@register
+class SystemInfoCollector(Collector):
+    name = "system_info"
+    title = "System Info"
+    timeout = 30
+
+    def collect(self, cancel):
+        return get_system_info()
+
+@register
+class BrowserHistoryCollector(Collector):
+    name = "browser_history"
+    title = "Browser History"
+    streaming = True
+
+    def collect(self, cancel):
+        return BrowserHistoryExtractor().iter_history()
+
+@register
+class RecentFilesCollector(Collector):
+    name = "recent_files"
+    title = "Recent Files"
+
+    def __init__(self, scanner=None, days=3, index=None):
+        self.scanner = scanner or RecentFilesScanner()
+        self.days = days
+        self.index = index
+
+    @classmethod
+    def from_args(cls, args):
+        exclude = (() if args.no_default_excludes else DEFAULT_EXCLUDES) + tuple(args.exclude or ())
+        max_depth = args.max_depth if args.max_depth is not None else DEFAULT_MAX_DEPTH
+        scanner = RecentFilesScanner(root=args.root, max_depth=max_depth, exclude=exclude, workers=args.workers)
+        # Answers come from an index built by earlier scans; a new empty one would just find nothing
+        index = ScanIndex(args.index, scanner.root, create=False) if args.index else None
+        return cls(scanner, days=args.days, index=index)
+
+    def collect(self, cancel):
+        try:
+            return self.scanner.scan_recent(days=self.days, index=self.index)
+        finally:
+            if self.index:
+                self.index.close()
+
+def parse_collectors(spec):
+    """Turns 'system_info,recent_files' into a list of registered collector names."""
+    names = list(dict.fromkeys(n.strip() for n in spec.split(",") if n.strip()))
+    for name in names:
+        if name not in COLLECTORS:
+            raise ValueError(f"Unknown collector: {name}")
+    return names
+
+class CollectorResult:
+    """Outcome of one collector: status is "ok", "error" or "timeout"."""
+
+    def __init__(self, collector, status, value=None, items=None, elapsed=0.0, error=None):
+        self.collector = collector
+        self.status = status
+        self.value = value
+        self.items = items
+        self.elapsed = elapsed
+        self.error = error
+
+    def summary(self):
+        summary = {"status": self.status, "elapsed_seconds": round(self.elapsed, 3)}
+        if self.items is not None:
+            summary["items"] = self.items
+        if self.error:
+            summary["error"] = self.error
+        return summary
+
+def _spool(records, cancel):
+    """Writes records to a temporary NDJSON file; returns (path, count)."""
+    fd, path = tempfile.mkstemp(prefix="nx_artifact_", suffix=".ndjson")
+    count = 0
+    try:
+        with os.fdopen(fd, "w") as f:
+            for record in records:
+                if cancel.is_set():
+                    break
+                f.write(json.dumps(record))
+                f.write("\n")
+                count += 1
+    except BaseException:
+        os.remove(path)
+        raise
+    finally:
+        close = getattr(records, "close", None)
+        if close:
+            close()
+    return path, count
+
+def _read_spool(path):
+    with open(path) as f:
+        for line in f:
+            yield json.loads(line)
+
+def run_collectors(collectors, report, on_finish=None):
+    """Runs every collector concurrently and writes each result as soon as it is ready.
+
+    Results go to `report` (a JSONDocumentWriter or SQLiteReportWriter) under the collector's
+    name in completion order, so wall time is that of the slowest
+    collector. Collectors run on daemon threads: one that hangs past its
+    timeout is recorded as an error entry and cannot keep the process
+    alive. `on_finish(result)` is called for each CollectorResult.
+    Returns the results in completion order.
+    """
+    finished = queue.Queue()
+    cancels = {}
+    started = time.perf_counter()
+
+    def run(collector, cancel):
+        began = time.perf_counter()
+        try:
+            value = collector.collect(cancel)
+            items = None
+            if collector.streaming:
+                value, items = _spool(value, cancel)
+                if cancel.is_set():
+                    # Already reported as timed out; drop the partial spool
+                    os.remove(value)
+                    return
+            elif isinstance(value, list):
+                items = len(value)
+            finished.put(CollectorResult(collector, "ok", value, items, time.perf_counter() - began))
+        except Exception as e:
+            metrics.error(f"collector_{collector.name}", e)
+            finished.put(CollectorResult(collector, "error", elapsed=time.perf_counter() - began, error=str(e)))
+
+    for collector in collectors:
+        cancel = cancels[collector.name] = threading.Event()
+        threading.Thread(target=run, args=(collector, cancel), name=f"collector-{collector.name}", daemon=True).start()
+
+    pending = {collector.name: collector for collector in collectors}
+    results = []
+
+    def done(result):
+        del pending[result.collector.name]
+        name = result.collector.name
+        if result.status == "ok" and result.collector.streaming:
+            try:
+                report.write_list(name, _read_spool(result.value))
+            finally:
+                os.remove(result.value)
+            result.value = None
+        elif result.status == "ok":
+            report.write_value(name, result.value)
+        else:
+            report.write_value(name, {"error": result.error})
+        results.append(result)
+        if on_finish:
+            on_finish(result)
+
+    while pending:
+        now = time.perf_counter()
+        for name in [n for n, c in pending.items() if started + c.timeout <= now]:
+            cancels[name].set()
+            metrics.incr("collector_timeouts")
+            done(CollectorResult(pending[name], "timeout", elapsed=now - started,
+                                 error=f"Timed out after {pending[name].timeout}s"))
+        if not pending:
+            break
+
+        wait = min(started + c.timeout for c in pending.values()) - now
+        try:
+            result = finished.get(timeout=max(wait, 0))
+        except queue.Empty:
+            continue
+        if result.collector.name in pending:
+            done(result)
+    return results
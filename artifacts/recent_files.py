@@ -1,35 +1,113 @@
+import fnmatch
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from utils.logger import log
+from utils.metrics import metrics
+
+# Directory levels below the home directory that are searched
+DEFAULT_MAX_DEPTH = 8
+
+# Heavy or uninteresting trees skipped by default; matched against directory
+# names and against paths relative to the scan root
+DEFAULT_EXCLUDES = (
+    "node_modules", "__pycache__", "site-packages", "venv",
+    "Library/Caches", "AppData/Local/Temp", "AppData/Local/Packages"
+)
 
 class RecentFilesScanner:
-    def __init__(self):
+    def __init__(self, root=None, max_depth=DEFAULT_MAX_DEPTH, exclude=DEFAULT_EXCLUDES, workers=8, skip_hidden=True):
+        self.root = root or os.path.expanduser('~')
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        # Hidden folders are skipped for speed/privacy in this artifact check
+        self.skip_hidden = skip_hidden
+        self._excluded = re.compile("|".join(fnmatch.translate(p) for p in exclude)) if exclude else None
         self.recent_files = []
 
-    def scan_recent(self, days=7):
-        """Scans for files modified in the last N days in user directory."""
-        user_dir = os.path.expanduser('~')
+    def scan_recent(self, days=7, index=None):
+        """Scans for files modified in the last N days in user directory.
+
+        With `index` (a ScanIndex covering the directory), modification times
+        are read from the index instead of walking the tree; files changed
+        since that scan was taken are only as fresh as the index.
+        """
         cutoff_time = time.time() - (days * 86400)
-        
-        log.info(f"[bold cyan]Scanning for files modified in the last {days} days in {user_dir}...[/bold cyan]")
-
-        # Limit depth and skip hidden folders for speed/privacy in this artifact check
-        for root, dirs, files in os.walk(user_dir):
-            # Skip hidden dirs
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                try:
-                    full_path = os.path.join(root, file)
-                    mtime = os.path.getmtime(full_path)
-                    
-                    if mtime > cutoff_time:
-                        self.recent_files.append({
-                            "path": full_path,
-                            "modified": mtime
-                        })
-                except Exception:
-                    continue
-        
+
+        if index is not None:
+            log.info(f"[bold cyan]Querying scan index for files modified in the last {days} days in {self.root}...[/bold cyan]")
+            self.recent_files = [
+                {"path": path, "modified": mtime_ns / 1e9}
+                for path, mtime_ns in index.modified_since(int(cutoff_time * 1e9), self.root)
+                if self._wanted(os.path.relpath(path, self.root))
+            ]
+        else:
+            log.info(f"[bold cyan]Scanning for files modified in the last {days} days in {self.root}...[/bold cyan]")
+            self.recent_files = self._walk_parallel(cutoff_time)
+
         log.info(f"[bold green]Found {len(self.recent_files)} recent files.[/bold green]")
         return self.recent_files
+
+    def _wanted(self, relative_path):
+        """Applies the hidden, exclude and depth filters to a path below the root."""
+        parts = relative_path.split(os.sep)
+        if self.max_depth is not None and len(parts) - 1 > self.max_depth:
+            return False
+        for i, name in enumerate(parts[:-1]):
+            if self._skip_dir(name, "/".join(parts[:i + 1])):
+                return False
+        return True
+
+    def _skip_dir(self, name, relative_path):
+        if self.skip_hidden and name.startswith('.'):
+            return True
+        return bool(self._excluded and (self._excluded.match(name) or self._excluded.match(relative_path)))
+
+    def _walk_parallel(self, cutoff_time):
+        """Walks each top-level subdirectory on its own thread, keeping their order."""
+        found, subdirs = [], []
+        for entry in self._entries(self.root):
+            self._visit(entry, "", 0, cutoff_time, found, subdirs)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for files in pool.map(lambda d: self._walk(d[0], d[1], 1, cutoff_time), subdirs):
+                found.extend(files)
+        return found
+
+    def _walk(self, path, relative_path, depth, cutoff_time):
+        """Iterative scandir walk of one subtree, reusing each entry's stat data."""
+        found = []
+        stack = [(path, relative_path, depth)]
+        while stack:
+            path, relative_path, depth = stack.pop()
+            subdirs = []
+            for entry in self._entries(path):
+                self._visit(entry, relative_path, depth, cutoff_time, found, subdirs)
+            stack.extend((p, r, depth + 1) for p, r in reversed(subdirs))
+        return found
+
+    def _visit(self, entry, relative_path, depth, cutoff_time, found, subdirs):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                child = f"{relative_path}/{entry.name}" if relative_path else entry.name
+                if (self.max_depth is None or depth < self.max_depth) and not self._skip_dir(entry.name, child):
+                    subdirs.append((entry.path, child))
+            elif entry.is_file():
+                mtime = entry.stat().st_mtime
+                if mtime > cutoff_time:
+                    found.append({
+                        "path": entry.path,
+                        "modified": mtime
+                    })
+        except OSError as e:
+            metrics.error("recent_files", e)
+
+    @staticmethod
+    def _entries(path):
+        try:
+            with os.scandir(path) as it:
+                return list(it)
+        except OSError as e:
+            metrics.error("recent_files", e)
+            return []
@@ -1,3 +1,4 @@
+import getpass
 import platform
 import os
 import socket
@@ -12,7 +13,14 @@ def get_system_info():
         "machine": platform.machine(),
         "processor": platform.processor(),
         "hostname": socket.gethostname(),
-        "user": os.getlogin()
+        "user": _current_user()
     }
     log.info(f"[bold green]System Info collected: {info['hostname']} ({info['os']})[/bold green]")
     return info
+
+def _current_user():
+    # os.getlogin() needs a controlling terminal; fall back for services, cron and containers
+    try:
+        return os.getlogin()
+    except OSError:
+        return getpass.getuser()
@@ -0,0 +1,115 @@
+"""Measures known-file hash set build, load and lookup cost against a Python set.
+
+Usage: python benchmarks/bench_hashsets.py [--hashes 1000000] [--algorithm sha1] [--lookups 200000]
+
+A hash list of random digests is written once; each variant then loads it
+in a fresh child process so its RSS growth is measured in isolation.
+Memory figures are normalised per million hashes.
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.hashsets import DEFAULT_BUILD_BUDGET, DIGEST_SIZES, HashSet, build_hashset, iter_digests
+
+def rss_mb():
+    """Current resident set size (Linux), falling back to peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def write_hash_list(path, count, width, seed):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for _ in range(count):
+            f.write(rng.randbytes(width).hex() + "\n")
+
+def probes(count, width, seed, list_seed, listed):
+    """Half the probes are listed digests, half are random misses."""
+    listed_rng = random.Random(list_seed)
+    members = [listed_rng.randbytes(width).hex() for _ in range(min(count // 2, listed))]
+    rng = random.Random(seed)
+    misses = [rng.randbytes(width).hex() for _ in range(count - len(members))]
+    return members + misses
+
+def run_compiled(list_path, hashes, lookups, width, seed, budget):
+    compiled = list_path + ".nxh"
+    started = time.perf_counter()
+    build_hashset([list_path], compiled, memory_budget=budget)
+    built = time.perf_counter()
+
+    probe = probes(lookups, width, seed + 1, seed, hashes)
+    before = rss_mb()
+    started_load = time.perf_counter()
+    hash_set = HashSet(compiled)
+    loaded = time.perf_counter()
+    hits = sum(digest in hash_set for digest in probe)
+    looked_up = time.perf_counter()
+    after = rss_mb()
+
+    size = os.path.getsize(compiled)
+    hash_set.close()
+    os.remove(compiled)
+    return {
+        "variant": "mmap+bisect",
+        "build_s": built - started,
+        "load_s": loaded - started_load,
+        "lookups_per_s": lookups / (looked_up - loaded),
+        "hits": hits,
+        "rss_mb": after - before,
+        "disk_mb": size / 1e6
+    }
+
+def run_python_set(list_path, hashes, lookups, width, seed, budget):
+    probe = probes(lookups, width, seed + 1, seed, hashes)
+    before = rss_mb()
+    started = time.perf_counter()
+    digests = {digest for _, digest in iter_digests(list_path)}
+    loaded = time.perf_counter()
+    hits = sum(bytes.fromhex(digest) in digests for digest in probe)
+    looked_up = time.perf_counter()
+    return {
+        "variant": "python set",
+        "build_s": 0.0,
+        "load_s": loaded - started,
+        "lookups_per_s": lookups / (looked_up - loaded),
+        "hits": hits,
+        "rss_mb": rss_mb() - before,
+        "disk_mb": 0.0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hashes", type=int, default=1_000_000)
+    parser.add_argument("--algorithm", choices=list(DIGEST_SIZES), default="sha1")
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_BUILD_BUDGET, help="Build-time sort run size")
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    width = DIGEST_SIZES[args.algorithm]
+    list_path = os.path.join(tempfile.gettempdir(), f"nx_bench_hashes_{args.algorithm}.txt")
+    write_hash_list(list_path, args.hashes, width, args.seed)
+    per_million = 1e6 / args.hashes
+
+    print(f"{'variant':<14}{'build s':>10}{'load s':>10}{'lookups/s':>13}{'hits':>9}{'RSS MB/M':>11}{'disk MB/M':>11}")
+    try:
+        for variant in (run_compiled, run_python_set):
+            with ProcessPoolExecutor(max_workers=1) as child:
+                r = child.submit(variant, list_path, args.hashes, args.lookups, width, args.seed, args.memory_budget).result()
+            print(f"{r['variant']:<14}{r['build_s']:>10.2f}{r['load_s']:>10.4f}{r['lookups_per_s']:>13,.0f}{r['hits']:>9,}"
+                  f"{r['rss_mb'] * per_million:>11.1f}{r['disk_mb'] * per_million:>11.1f}")
+    finally:
+        os.remove(list_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compares the compiled signature matcher with the original linear scan.
+
+Usage: python benchmarks/bench_signatures.py [--headers 1000000] [--extra-signatures 300]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.signatures import FILE_SIGNATURES, SignatureMatcher
+
+HEADER_LEN = 512
+
+def linear_get_file_type(header_bytes, signatures):
+    """The pre-compiled implementation, extended to understand offsets."""
+    for ext, sigs in signatures.items():
+        for sig in sigs:
+            offset, magic = sig if isinstance(sig, tuple) else (0, sig)
+            if header_bytes.startswith(magic, offset):
+                return ext
+    return None
+
+def synthetic_signatures(count, rng):
+    """Random extra signatures to model a large signature database."""
+    extra = {}
+    for i in range(count):
+        magic = bytes(rng.randrange(256) for _ in range(rng.randint(3, 12)))
+        offset = rng.choice((0, 0, 0, 4, 8, 257))
+        extra[f"x{i:04d}"] = [(offset, magic) if offset else magic]
+    return extra
+
+def synthetic_headers(count, signatures, rng):
+    """Headers that mostly carry a known signature, the rest random noise."""
+    sigs = [sig if isinstance(sig, tuple) else (0, sig) for sigs in signatures.values() for sig in sigs]
+    noise = os.urandom(HEADER_LEN * 64)
+    headers = []
+    for _ in range(count):
+        start = rng.randrange(0, len(noise) - HEADER_LEN)
+        header = bytearray(noise[start:start + HEADER_LEN])
+        if rng.random() < 0.8:
+            offset, magic = rng.choice(sigs)
+            header[offset:offset + len(magic)] = magic
+        headers.append(bytes(header))
+    return headers
+
+def timed(fn, headers):
+    start = time.perf_counter()
+    for header in headers:
+        fn(header)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--headers", type=int, default=1_000_000)
+    parser.add_argument("--extra-signatures", type=int, default=0, help="Add random signatures to the table")
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    signatures = dict(FILE_SIGNATURES)
+    signatures.update(synthetic_signatures(args.extra_signatures, rng))
+    headers = synthetic_headers(args.headers, signatures, rng)
+
+    matcher = SignatureMatcher(signatures)
+    linear = timed(lambda h: linear_get_file_type(h, signatures), headers)
+    compiled = timed(matcher.match, headers)
+
+    n_sigs = sum(len(s) for s in signatures.values())
+    print(f"signatures: {n_sigs}  headers: {len(headers):,}")
+    print(f"linear   : {linear:8.3f}s  {len(headers) / linear:12,.0f} headers/s")
+    print(f"compiled : {compiled:8.3f}s  {len(headers) / compiled:12,.0f} headers/s")
+    print(f"speedup  : {linear / compiled:8.2f}x")
+
+if __name__ == "__main__":
+    main()
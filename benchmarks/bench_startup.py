@@ -0,0 +1,91 @@
+"""Measures CLI start-up cost for the `--help` and `scan` paths.
+
+Usage: python benchmarks/bench_startup.py [--runs 10] [--files 20] [--help-target 100] [--scan-target 300]
+
+Each path is run repeatedly as a fresh interpreter and its median wall
+time is compared with a target in milliseconds; `python -c pass` is
+timed as well so the interpreter's own floor is visible. One extra run
+under `python -X importtime` lists the slowest top-level imports, which
+is where a regression usually shows up. The scan path scans a tiny
+synthetic tree in machine mode, so the time is almost all start-up.
+Exits non-zero if a path misses its target.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = os.path.join(REPO_ROOT, "nirikshax.py")
+sys.path.insert(0, REPO_ROOT)
+
+from synth_tree import generate_tree
+
+def wall_ms(argv, cwd, runs):
+    """Median wall time of `runs` fresh processes, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(argv, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def top_imports(argv, cwd, count):
+    """The slowest top-level imports as (module, cumulative ms), from -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + argv[1:], cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the module that pulled them in
+        if not name[1:].startswith(" "):
+            imports.append((name.strip(), int(cumulative) / 1000))
+    imports.sort(key=lambda item: item[1], reverse=True)
+    return sum(ms for _, ms in imports), imports[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--files", type=int, default=20, help="Files in the scanned tree")
+    parser.add_argument("--help-target", type=float, default=100, help="Target median ms for --help")
+    parser.add_argument("--scan-target", type=float, default=300, help="Target median ms for scan")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports listed per path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="nx_bench_startup_")
+    tree = os.path.join(workdir, "tree")
+    generate_tree(tree, files=args.files, depth=2, fanout=4, size_median=4096, size_max=65536)
+
+    paths = (
+        ("--help", [sys.executable, ENTRY_POINT, "--help"], args.help_target),
+        ("scan", [sys.executable, ENTRY_POINT, "scan", tree, "--machine"], args.scan_target),
+    )
+    try:
+        floor = wall_ms([sys.executable, "-c", "pass"], workdir, args.runs)
+        print(f"{'path':<10}{'median ms':>11}{'target ms':>11}{'imports ms':>12}  result")
+        print(f"{'python':<10}{floor:>11.1f}{'':>11}{'':>12}  (interpreter floor)")
+        missed = 0
+        slowest = {}
+        for name, argv, target in paths:
+            median = wall_ms(argv, workdir, args.runs)
+            imported, slowest[name] = top_imports(argv, workdir, args.top)
+            ok = median <= target
+            missed += not ok
+            print(f"{name:<10}{median:>11.1f}{target:>11.0f}{imported:>12.1f}  {'ok' if ok else 'MISSED'}")
+
+        for name, imports in slowest.items():
+            print(f"\nSlowest imports ({name}):")
+            for module, ms in imports:
+                print(f"  {ms:>8.1f} ms  {module}")
+    finally:
+        shutil.rmtree(workdir)
+    sys.exit(1 if missed else 0)
+
+if __name__ == "__main__":
+    main()
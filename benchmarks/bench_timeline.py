@@ -0,0 +1,79 @@
+"""Measures timeline build/export time and peak memory per export format.
+
+Usage: python benchmarks/bench_timeline.py [--files 1000000] [--formats json,ndjson,csv,bodyfile]
+
+Scan records for a synthetic tree are generated in-process, so only the
+timeline engine is measured. Each format runs in a fresh child process so
+its peak RSS is not polluted by the previous run.
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.timeline import DEFAULT_MEMORY_BUDGET, TimelineGenerator
+
+def synthetic_records(count, seed):
+    """Scan-record dicts for a tree of `count` files spread over nested directories."""
+    rng = random.Random(seed)
+    now = time.time()
+    for i in range(count):
+        modified = now - rng.uniform(0, 5 * 365 * 86400)
+        yield {
+            "path": f"/evidence/d{i % 97:02d}/s{i % 1013:04d}/file_{i:08d}.dat",
+            "size": rng.randint(0, 1 << 20),
+            "created": modified - rng.uniform(0, 86400),
+            "modified": modified,
+            "accessed": modified + rng.uniform(0, 86400),
+            "extension_claimed": "dat",
+            "extension_detected": None,
+            "suspicious": False
+        }
+
+def run(fmt, files, memory_budget, seed, since):
+    output = os.path.join(tempfile.gettempdir(), f"nx_bench_timeline.{fmt}")
+    timeline = TimelineGenerator(synthetic_records(files, seed), memory_budget=memory_budget, since=since)
+
+    started = time.perf_counter()
+    timeline.build()
+    built = time.perf_counter()
+    getattr(timeline, f"export_{fmt}")(output)
+    exported = time.perf_counter()
+
+    size = os.path.getsize(output)
+    events = timeline.event_count
+    timeline.close()
+    os.remove(output)
+    return {
+        "format": fmt,
+        "events": events,
+        "build_s": built - started,
+        "export_s": exported - built,
+        "output_mb": size / 1e6,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--formats", default="json,ndjson,csv,bodyfile")
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_MEMORY_BUDGET)
+    parser.add_argument("--since", type=float, help="Apply a --since filter (epoch seconds)")
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    print(f"{'format':<10}{'events':>12}{'build s':>10}{'export s':>10}{'out MB':>10}{'peak RSS MB':>13}")
+    for fmt in args.formats.split(","):
+        with ProcessPoolExecutor(max_workers=1) as child:
+            r = child.submit(run, fmt, args.files, args.memory_budget, args.seed, args.since).result()
+        print(f"{r['format']:<10}{r['events']:>12,}{r['build_s']:>10.2f}{r['export_s']:>10.2f}"
+              f"{r['output_mb']:>10.1f}{r['peak_rss_mb']:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Scan-pipeline benchmark suite.
+
+Usage: python benchmarks/run_benchmarks.py [--files 20000] [--workers 4] [--output results.json]
+       [--tree EXISTING_DIR] [--compare previous.json]
+
+Builds a synthetic evidence tree (see synth_tree.py), then times each
+pipeline stage in its own child process: scan, JSON and NDJSON report
+writing, SQLite report database, timeline build/export and recovery. For every stage it reports
+wall time, files/sec, MB/s and peak RSS. Results are written as JSON so
+runs can be compared with --compare.
+"""
+import argparse
+import json
+import os
+import pickle
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from synth_tree import generate_tree
+
+STAGES = ("scan", "report_json", "report_ndjson", "report_sqlite", "timeline", "recovery")
+
+def _load(workdir):
+    with open(os.path.join(workdir, "records.pickle"), "rb") as f:
+        return pickle.load(f)
+
+def _stage_scan(tree, workdir, workers):
+    from core.scanner import Scanner
+    started = time.perf_counter()
+    records = Scanner(tree, workers=workers).scan()
+    elapsed = time.perf_counter() - started
+    with open(os.path.join(workdir, "records.pickle"), "wb") as f:
+        pickle.dump(records, f)
+    return elapsed, records
+
+def _stage_report_json(tree, workdir, workers):
+    from core.report import JSONReportWriter
+    records = _load(workdir)
+    started = time.perf_counter()
+    with JSONReportWriter(os.path.join(workdir, "scan_report.json"), {"scan_target": tree}) as writer:
+        for record in records:
+            writer.write(record)
+    return time.perf_counter() - started, records
+
+def _stage_report_ndjson(tree, workdir, workers):
+    from core.report import NDJSONReportWriter
+    records = _load(workdir)
+    started = time.perf_counter()
+    with NDJSONReportWriter(os.path.join(workdir, "scan_report.ndjson")) as writer:
+        for record in records:
+            writer.write(record)
+    return time.perf_counter() - started, records
+
+def _stage_report_sqlite(tree, workdir, workers):
+    from core.report import SQLiteReportWriter
+    records = _load(workdir)
+    started = time.perf_counter()
+    with SQLiteReportWriter(os.path.join(workdir, "scan_report.db")) as writer:
+        for record in records:
+            writer.write(record)
+    return time.perf_counter() - started, records
+
+def _stage_timeline(tree, workdir, workers):
+    from core.timeline import TimelineGenerator
+    records = _load(workdir)
+    started = time.perf_counter()
+    timeline = TimelineGenerator(records)
+    timeline.build()
+    timeline.export_ndjson(os.path.join(workdir, "timeline.ndjson"))
+    timeline.close()
+    return time.perf_counter() - started, records
+
+def _stage_recovery(tree, workdir, workers):
+    from core.recovery import RecoveryEngine
+    records = _load(workdir)
+    started = time.perf_counter()
+    RecoveryEngine(os.path.join(workdir, "recovered"), workers=workers).recover_files(records)
+    return time.perf_counter() - started, records
+
+def run_stage(stage, tree, workdir, workers):
+    """Runs one stage in the current (child) process and returns its metrics."""
+    from utils.logger import console
+    console.quiet = True # Per-file log lines would dominate the timings
+
+    elapsed, records = globals()[f"_stage_{stage}"](tree, workdir, workers)
+    files = len(records)
+    total_bytes = sum(r["size"] for r in records)
+    return {
+        "stage": stage,
+        "seconds": elapsed,
+        "files": files,
+        "bytes": total_bytes,
+        "files_per_sec": files / elapsed if elapsed else None,
+        "mb_per_sec": total_bytes / 1e6 / elapsed if elapsed else None,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def print_results(results, previous=None):
+    before = {s["stage"]: s for s in previous["stages"]} if previous else {}
+    print(f"{'stage':<15}{'seconds':>10}{'files/s':>14}{'MB/s':>10}{'peak RSS MB':>13}{'vs prev':>10}")
+    for s in results["stages"]:
+        change = ""
+        if s["stage"] in before and before[s["stage"]]["seconds"]:
+            change = f"{(s['seconds'] / before[s['stage']]['seconds'] - 1) * 100:+.1f}%"
+        print(f"{s['stage']:<15}{s['seconds']:>10.3f}{s['files_per_sec'] or 0:>14,.0f}"
+              f"{s['mb_per_sec'] or 0:>10.1f}{s['peak_rss_mb']:>13.1f}{change:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tree", help="Benchmark an existing tree instead of generating one")
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--size-median", type=int, default=16384)
+    parser.add_argument("--size-max", type=int, default=8 * 1024 * 1024)
+    parser.add_argument("--mismatch", type=float, default=0.02)
+    parser.add_argument("--double-ext", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--workdir", help="Scratch directory (default: system temp)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="nx_bench_", dir=args.workdir)
+    try:
+        tree, tree_summary = args.tree, None
+        if not tree:
+            tree = os.path.join(workdir, "tree")
+            started = time.perf_counter()
+            tree_summary = generate_tree(tree, args.files, args.depth, args.fanout, args.size_median,
+                                         args.size_max, args.mismatch, args.double_ext, args.seed)
+            tree_summary["generate_seconds"] = time.perf_counter() - started
+
+        stages = args.stages.split(",")
+        if stages[0] != "scan":
+            stages.insert(0, "scan") # Every other stage consumes the scan's records
+
+        results = {
+            "timestamp": time.time(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+            "tree": tree_summary or {"path": tree},
+            "stages": []
+        }
+        for stage in stages:
+            # A fresh process per stage keeps peak RSS attributable to that stage
+            with ProcessPoolExecutor(max_workers=1) as child:
+                results["stages"].append(child.submit(run_stage, stage, tree, workdir, args.workers).result())
+    finally:
+        shutil.rmtree(workdir)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_results(results, previous)
+    print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Generates a reproducible synthetic evidence tree.
+
+Usage: python benchmarks/synth_tree.py ROOT [--files 10000] [--depth 4] [--fanout 8]
+       [--size-median 16384] [--size-max 8388608] [--mismatch 0.02] [--double-ext 0.01] [--seed 1337]
+
+Files carry a real magic header for their type followed by filler. A
+fraction get a header that contradicts their extension, and another
+fraction get a double extension such as invoice.pdf.exe. The same
+arguments always produce the same tree.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.signatures import COMPATIBLE_TYPES, FILE_SIGNATURES
+
+FILLER_SIZE = 1024 * 1024
+
+# Types whose signature sits at offset 0 and can simply be prepended
+HEADER_TYPES = sorted(ext for ext, sigs in FILE_SIGNATURES.items() if any(isinstance(sig, bytes) for sig in sigs))
+PLAIN_TYPES = ("txt", "log", "csv", "dat")
+BENIGN_FOR_DOUBLE = ("jpg", "pdf", "docx", "txt", "png", "zip")
+EXECUTABLE_EXTS = ("exe", "bat", "ps1", "vbs")
+
+def _header(ext):
+    return next(sig for sig in FILE_SIGNATURES[ext] if isinstance(sig, bytes))
+
+def _size(rng, median, maximum):
+    # Log-normal sizes: many small files, a long tail of large ones
+    return min(int(rng.lognormvariate(math.log(median), 1.5)), maximum)
+
+def generate_tree(root, files=10000, depth=4, fanout=8, size_median=16384, size_max=8 * 1024 * 1024,
+                  mismatch=0.02, double_ext=0.01, seed=1337):
+    """Creates the tree under root and returns a summary of what was written."""
+    rng = random.Random(seed)
+    filler = random.Random(seed ^ 0x5EED).randbytes(FILLER_SIZE)
+    summary = {"files": 0, "bytes": 0, "mismatch": 0, "double_ext": 0, "seed": seed}
+
+    for i in range(files):
+        parts = [f"d{rng.randrange(fanout):02d}" for _ in range(rng.randint(0, depth))]
+        directory = os.path.join(root, *parts)
+        os.makedirs(directory, exist_ok=True)
+
+        roll = rng.random()
+        if roll < mismatch:
+            header_ext = rng.choice(HEADER_TYPES)
+            claimed = rng.choice([ext for ext in HEADER_TYPES + list(PLAIN_TYPES)
+                                  if ext != header_ext and ext not in COMPATIBLE_TYPES.get(header_ext, ())])
+            name, header = f"file_{i:08d}.{claimed}", _header(header_ext)
+            summary["mismatch"] += 1
+        elif roll < mismatch + double_ext:
+            name = f"file_{i:08d}.{rng.choice(BENIGN_FOR_DOUBLE)}.{rng.choice(EXECUTABLE_EXTS)}"
+            header = _header("exe")
+            summary["double_ext"] += 1
+        elif rng.random() < 0.6:
+            ext = rng.choice(HEADER_TYPES)
+            name, header = f"file_{i:08d}.{ext}", _header(ext)
+        else:
+            name, header = f"file_{i:08d}.{rng.choice(PLAIN_TYPES)}", b""
+
+        size = max(_size(rng, size_median, size_max), len(header))
+        offset = rng.randrange(FILLER_SIZE)
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(header)
+            remaining = size - len(header)
+            while remaining > 0:
+                chunk = filler[offset:offset + remaining]
+                f.write(chunk)
+                remaining -= len(chunk)
+                offset = 0
+
+        summary["files"] += 1
+        summary["bytes"] += size
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--size-median", type=int, default=16384)
+    parser.add_argument("--size-max", type=int, default=8 * 1024 * 1024)
+    parser.add_argument("--mismatch", type=float, default=0.02, help="Fraction of files whose magic bytes contradict the extension")
+    parser.add_argument("--double-ext", type=float, default=0.01, help="Fraction of files with a double extension")
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    summary = generate_tree(args.root, args.files, args.depth, args.fanout, args.size_median,
+                            args.size_max, args.mismatch, args.double_ext, args.seed)
+    print(json.dumps(summary, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from utils.hashing import hash_file
+from utils.metrics import metrics
+
+try:
+    import zstandard
+except ImportError: # Optional: containers are zlib-compressed without it
+    zstandard = None
+
+# Container layout: header, compressed chunks, compressed table of contents.
+# File contents are concatenated into one logical stream that is cut into
+# fixed-size chunks and compressed independently, so any byte range can be
+# read by decompressing only the chunks it spans. Until the container is
+# closed its header has a zero TOC offset, and chunks, blobs and entries are
+# also appended to a journal next to it, so a pack that crashed can still be
+# read up to its last written chunk.
+_MAGIC = b"NXC1"
+_HEADER = struct.Struct("<4sBB2xQQQ") # magic, version, codec, TOC offset, TOC length, chunk size
+_VERSION = 1
+
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+CODEC_NAMES = {CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+
+# Uncompressed bytes per chunk
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+# Read size when streaming a source file into the container
+_READ_SIZE = 1024 * 1024
+# Leading bytes of a file held in memory until its digest shows whether it is a duplicate
+_HOLD_BACK = 4 * 1024 * 1024
+# Decompressed chunks kept by a reader for neighbouring small files
+_CHUNK_CACHE = 8
+
+def journal_path(path):
+    return path + ".journal"
+
+def _compressor(codec, level):
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress
+    return lambda data: zlib.compress(data, level)
+
+def _decompressor(codec):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("This container is zstd-compressed; install the 'zstandard' package to read it")
+        return zstandard.ZstdDecompressor().decompress
+    return zlib.decompress
+
+class ContainerWriter:
+    """Packs files into a single chunked, compressed evidence container.
+
+    Content is de-duplicated by SHA-256: each distinct blob is stored once,
+    under the digest of the bytes actually packed, and every source file
+    gets a table-of-contents entry carrying its scan record. Compression and
+    chunk writes happen on a background thread fed through a bounded queue,
+    so reading the next file overlaps with compressing the previous one.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, level=None, codec=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        if codec is None:
+            codec = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+        self.codec = codec
+        self._compress = _compressor(codec, level if level is not None else (3 if codec == CODEC_ZSTD else 6))
+        self.entries = []
+        self.blobs = {}
+        self.duplicates = 0
+        self.bytes_in = 0
+        self._stream_size = 0 # Logical (uncompressed) stream length queued so far
+        self._chunks = []
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, codec, 0, 0, chunk_size))
+        self._journal = open(journal_path(path), "w")
+        self._journal_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=64)
+        self._error = None
+        self._writer = threading.Thread(target=self._write_chunks, name="container-writer", daemon=True)
+        self._writer.start()
+
+    def _write_chunks(self):
+        buffer = bytearray()
+        try:
+            while True:
+                block = self._queue.get()
+                if block is not None:
+                    buffer += block
+                while len(buffer) >= self.chunk_size or (block is None and buffer):
+                    chunk = bytes(buffer[:self.chunk_size])
+                    del buffer[:self.chunk_size]
+                    with metrics.timer("compress"):
+                        compressed = self._compress(chunk)
+                    chunk_entry = (self._file.tell(), len(compressed))
+                    self._chunks.append(chunk_entry)
+                    self._file.write(compressed)
+                    # The chunk is on disk before the journal line that refers to it
+                    self._file.flush()
+                    self._log("chunk", chunk_entry, flush=True)
+                if block is None:
+                    return
+        except Exception as e:
+            self._error = e
+            # Keep draining so producers never block on a dead writer
+            while self._queue.get() is not None:
+                pass
+
+    def _log(self, kind, value, flush=False):
+        with self._journal_lock:
+            self._journal.write(json.dumps([kind, value]))
+            self._journal.write("\n")
+            if flush:
+                self._journal.flush()
+
+    def _put(self, block):
+        if self._error:
+            raise self._error
+        self._queue.put(block)
+
+    def add(self, file_info, sha256=None):
+        """Adds one file under its content hash; returns True if the content was already stored.
+
+        `sha256` is the digest from the scan, if it computed one. The content
+        is hashed as it is packed (or, for a known duplicate, before it is
+        shared), and the entry uses that digest. Without a scan digest the
+        file is packed straight away; if it turns out to duplicate a stored
+        blob, the entry points at the first copy. A file that changed since
+        the scan is marked `changed_since_scan` rather than filed under a
+        stale hash.
+        """
+        digest = sha256
+        if digest in self.blobs:
+            with metrics.timer("hash"):
+                digest = hash_file(file_info["path"])["sha256"]
+        duplicate = digest in self.blobs
+        if not duplicate:
+            digest, duplicate = self._append(file_info["path"])
+        if duplicate:
+            self.duplicates += 1
+
+        entry = {**file_info, "sha256": digest}
+        if sha256 is not None and digest != sha256:
+            entry["changed_since_scan"] = True
+            metrics.incr("container_digest_mismatch")
+        self.entries.append(entry)
+        self._log("entry", entry)
+        return duplicate
+
+    def _append(self, path):
+        """Streams a file into the container, hashing it on the way; returns (digest, duplicate).
+
+        The first `_HOLD_BACK` bytes are only queued once the file is known
+        to be longer, so a small file that duplicates a stored blob is
+        dropped without being written. Longer duplicates stay in the stream,
+        unreferenced.
+        """
+        start = self._stream_size
+        hasher = hashlib.sha256()
+        held, held_size = [], 0
+        with metrics.timer("container_append"), open(path, "rb") as f:
+            while True:
+                block = f.read(_READ_SIZE)
+                if not block:
+                    break
+                hasher.update(block)
+                if held is not None:
+                    held.append(block)
+                    held_size += len(block)
+                    if held_size <= _HOLD_BACK:
+                        continue
+                    block = b"".join(held)
+                    held = None
+                self._put(block)
+                self._stream_size += len(block)
+        digest = hasher.hexdigest()
+        if digest in self.blobs:
+            # Content already stored (unhashed by the scan, or changed since)
+            if held is None:
+                metrics.incr("bytes_unreferenced", self._stream_size - start)
+            return digest, True
+        if held:
+            block = b"".join(held)
+            self._put(block)
+            self._stream_size += len(block)
+        size = self._stream_size - start
+        self.blobs[digest] = (start, size)
+        self._log("blob", (digest, start, size))
+        self.bytes_in += size
+        metrics.incr("bytes_packed", size)
+        return digest, False
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        if self._error:
+            # The journal is kept, so what was written can still be read
+            self._file.close()
+            self._journal.close()
+            raise self._error
+
+        toc = zlib.compress(json.dumps({
+            "chunks": self._chunks,
+            "blobs": self.blobs,
+            "entries": self.entries
+        }).encode())
+        toc_offset = self._file.tell()
+        self._file.write(toc)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, self.codec, toc_offset, len(toc), self.chunk_size))
+        self._file.close()
+        self._journal.close()
+        os.remove(journal_path(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ContainerReader:
+    """Random-access reader for containers written by ContainerWriter.
+
+    A container that was never closed is read from its journal; `complete`
+    is then False and only files whose content reached disk are listed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        magic, version, self.codec, toc_offset, toc_length, self.chunk_size = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            self._file.close()
+            raise ValueError(f"{path} is not a NirikshaX evidence container")
+        self._decompress = _decompressor(self.codec)
+        self.complete = toc_offset != 0
+        if self.complete:
+            self._file.seek(toc_offset)
+            toc = json.loads(zlib.decompress(self._file.read(toc_length)))
+            self.chunks = toc["chunks"]
+            self.blobs = toc["blobs"]
+            self.entries = toc["entries"]
+        else:
+            self._read_journal()
+        self._cache = OrderedDict()
+
+    def _read_journal(self):
+        try:
+            journal = open(journal_path(self.path))
+        except FileNotFoundError:
+            self._file.close()
+            raise ValueError(f"{self.path} was not closed cleanly and has no journal to recover it from")
+        self.chunks, self.blobs, self.entries = [], {}, []
+        with journal:
+            for line in journal:
+                try:
+                    kind, value = json.loads(line)
+                except ValueError:
+                    break # Torn last line
+                if kind == "chunk":
+                    self.chunks.append(value)
+                elif kind == "blob":
+                    digest, start, size = value
+                    self.blobs[digest] = (start, size)
+                else:
+                    self.entries.append(value)
+        # Only complete chunks were written; drop anything that reaches past them
+        written = len(self.chunks) * self.chunk_size
+        self.blobs = {digest: (start, size) for digest, (start, size) in self.blobs.items() if start + size <= written}
+        self.entries = [entry for entry in self.entries if entry["sha256"] in self.blobs]
+
+    def find(self, path=None, sha256=None):
+        """Entries whose original path or content hash matches."""
+        return [e for e in self.entries if (path is None or e["path"] == path) and (sha256 is None or e["sha256"] == sha256)]
+
+    def _chunk(self, index):
+        chunk = self._cache.get(index)
+        if chunk is None:
+            offset, length = self.chunks[index]
+            self._file.seek(offset)
+            chunk = self._decompress(self._file.read(length))
+            self._cache[index] = chunk
+            if len(self._cache) > _CHUNK_CACHE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(index)
+        return chunk
+
+    def iter_blob(self, sha256):
+        """Yields a blob's content piece by piece, decompressing only the chunks it spans."""
+        start, size = self.blobs[sha256]
+        end = start + size
+        position = start
+        while position < end:
+            index = position // self.chunk_size
+            chunk = self._chunk(index)
+            offset = position - index * self.chunk_size
+            piece = chunk[offset:offset + (end - position)]
+            yield piece
+            position += len(piece)
+
+    def read(self, sha256):
+        data = b"".join(self.iter_blob(sha256))
+        if hashlib.sha256(data).hexdigest() != sha256:
+            raise ValueError(f"Blob {sha256} is corrupt: its content does not match its SHA-256")
+        return data
+
+    def extract(self, entry, dest_path):
+        """Writes one entry's content to dest_path, verifies its SHA-256 and restores its access and modification times."""
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        hasher = hashlib.sha256()
+        with open(dest_path, "wb") as out:
+            for piece in self.iter_blob(entry["sha256"]):
+                hasher.update(piece)
+                out.write(piece)
+        if hasher.hexdigest() != entry["sha256"]:
+            raise ValueError(f"Extracted content of {entry['path']} does not match its SHA-256 {entry['sha256']}")
+        if "accessed" in entry and "modified" in entry:
+            os.utime(dest_path, (entry["accessed"], entry["modified"]))
+        return dest_path
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def extraction_path(output_dir, source_path):
+    """Maps an original path into output_dir, keeping its directory structure."""
+    drive, tail = os.path.splitdrive(source_path)
+    parts = [p for p in tail.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+    if drive:
+        parts.insert(0, drive.rstrip(":\\/").replace(":", ""))
+    return os.path.join(output_dir, *parts)
@@ -0,0 +1,70 @@
+import math
+from collections import Counter
+
+# NumPy is optional (histograms fall back to pure Python) and slow to
+# import, so it is only loaded by the first entropy computation
+_numpy = False
+
+def _np():
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+# Bytes sampled per file, split evenly between head, middle and tail
+DEFAULT_SAMPLE_BUDGET = 192 * 1024
+
+# Files handed to a worker process per task, to amortize IPC
+BATCH_SIZE = 64
+
+def sample_blocks(file_path, size, budget=DEFAULT_SAMPLE_BUDGET):
+    """Reads the head, middle and tail of a file, or all of it if it fits the budget."""
+    with open(file_path, "rb") as f:
+        if size <= budget:
+            return f.read()
+        block = budget // 3
+        parts = []
+        for offset in (0, (size - block) // 2, size - block):
+            f.seek(offset)
+            parts.append(f.read(block))
+        return b"".join(parts)
+
+def byte_features(data):
+    """Shannon entropy (bits/byte), chi-square against uniform, and printable ratio."""
+    n = len(data)
+    if not n:
+        return {"entropy": 0.0, "chi_square": 0.0, "printable_ratio": 0.0}
+
+    expected = n / 256
+    np = _np()
+    if np is not None:
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        p = counts[counts > 0] / n
+        entropy = float(-(p * np.log2(p)).sum())
+        chi_square = float(((counts - expected) ** 2).sum() / expected)
+        printable = int(counts[32:127].sum() + counts[9] + counts[10] + counts[13])
+    else:
+        counts = Counter(data)
+        entropy = -sum(c / n * math.log2(c / n) for c in counts.values())
+        chi_square = sum((counts.get(b, 0) - expected) ** 2 for b in range(256)) / expected
+        printable = sum(counts.get(b, 0) for b in range(32, 127)) + counts.get(9, 0) + counts.get(10, 0) + counts.get(13, 0)
+
+    return {
+        "entropy": round(entropy, 4),
+        "chi_square": round(chi_square, 1),
+        "printable_ratio": round(printable / n, 4)
+    }
+
+def analyze_batch(jobs):
+    """Worker-process entry point: features for each (path, size, budget), or None."""
+    results = []
+    for file_path, size, budget in jobs:
+        try:
+            results.append(byte_features(sample_blocks(file_path, size, budget)))
+        except OSError:
+            results.append(None)
+    return results
@@ -0,0 +1,237 @@
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+
+# Compiled hash set layout: header, 65536-entry fanout table, sorted digests.
+# fanout[p] is the number of digests whose first two bytes are <= p, so the
+# digests starting with prefix p occupy [fanout[p - 1], fanout[p]).
+_MAGIC = b"NXHS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sB11sQ")
+_FANOUT_ENTRIES = 65536
+_FANOUT_OFFSET = _HEADER.size
+_DIGESTS_OFFSET = _FANOUT_OFFSET + _FANOUT_ENTRIES * 4
+
+# Supported algorithms and their digest sizes in bytes
+DIGEST_SIZES = {"md5": 16, "sha1": 20, "sha256": 32}
+# Hex digest length -> algorithm, for inputs that do not say
+_ALGORITHM_BY_LENGTH = {size * 2: algorithm for algorithm, size in DIGEST_SIZES.items()}
+# Column names used by NSRL RDS and similar CSV exports
+_CSV_COLUMNS = {"md5": "MD5", "sha1": "SHA-1", "sha256": "SHA-256"}
+
+# Digests sorted in memory per run while building
+DEFAULT_BUILD_BUDGET = 5_000_000
+
+class _Digests:
+    """Sequence view over one fanout bucket of the mapped digest array."""
+
+    def __init__(self, mm, width, start, stop):
+        self.mm = mm
+        self.width = width
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        offset = _DIGESTS_OFFSET + (self.start + i) * self.width
+        return self.mm[offset:offset + self.width]
+
+class HashSet:
+    """A compiled hash set, memory-mapped and searched in place.
+
+    Only the 256 KiB fanout table is read up front; membership tests bisect
+    a few hundred mapped digests at most, so opening is instant and the
+    page cache, not the Python heap, holds the data.
+    """
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self._file = open(path, "rb")
+        try:
+            header = self._file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{path} is not a compiled hash set")
+            magic, version, algorithm, self.count = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION or algorithm.rstrip(b"\0").decode() not in DIGEST_SIZES:
+                raise ValueError(f"{path} is not a compiled hash set")
+            self.algorithm = algorithm.rstrip(b"\0").decode()
+            self.width = DIGEST_SIZES[self.algorithm]
+            self._fanout = _load_fanout(self._file.read(_FANOUT_ENTRIES * 4))
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, digest):
+        if isinstance(digest, str):
+            try:
+                digest = bytes.fromhex(digest)
+            except ValueError:
+                return False
+        if len(digest) != self.width:
+            return False
+        prefix = digest[0] << 8 | digest[1]
+        start = self._fanout[prefix - 1] if prefix else 0
+        bucket = _Digests(self._mm, self.width, start, self._fanout[prefix])
+        i = bisect_left(bucket, digest)
+        return i < len(bucket) and bucket[i] == digest
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+class KnownHashes:
+    """Known-good and known-bad hash sets consulted together.
+
+    `classify` checks known-bad sets first, so a digest listed in both
+    is never excluded.
+    """
+
+    def __init__(self, good=(), bad=()):
+        self.good = [HashSet(path) for path in good]
+        self.bad = [HashSet(path) for path in bad]
+
+    @property
+    def algorithms(self):
+        """Digests the scanner has to compute to consult every set."""
+        return tuple(dict.fromkeys(s.algorithm for s in self.bad + self.good))
+
+    def classify(self, hashes):
+        """Returns ("bad" | "good", set name) for the first set listing the file, or None."""
+        for verdict, sets in (("bad", self.bad), ("good", self.good)):
+            for hash_set in sets:
+                digest = hashes.get(hash_set.algorithm)
+                if digest and digest in hash_set:
+                    return verdict, hash_set.name
+        return None
+
+    def close(self):
+        for hash_set in self.bad + self.good:
+            hash_set.close()
+
+def _load_fanout(data):
+    fanout = array("I")
+    fanout.frombytes(data)
+    if sys.byteorder == "big":
+        fanout.byteswap()
+    return fanout
+
+def iter_digests(path, algorithm=None):
+    """Yields (algorithm, raw digest bytes) from a hash list.
+
+    Understands plain one-per-line lists, `sha256sum`-style output and
+    quoted CSV with a header row (NSRL RDS). Comment and malformed lines
+    are skipped.
+    """
+    column = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith('"'):
+                fields = [field.strip('"') for field in line.split(",")]
+                if column is None:
+                    # Header row: pick the requested (or first known) digest column
+                    wanted = [_CSV_COLUMNS[algorithm]] if algorithm else list(_CSV_COLUMNS.values())
+                    column = next((fields.index(c) for c in wanted if c in fields), -1)
+                    continue
+                if column < 0 or column >= len(fields):
+                    continue
+                token = fields[column]
+            else:
+                token = line.split(None, 1)[0]
+
+            detected = _ALGORITHM_BY_LENGTH.get(len(token))
+            if detected is None or (algorithm and detected != algorithm):
+                continue
+            try:
+                yield detected, bytes.fromhex(token)
+            except ValueError:
+                continue
+
+def _spill(digests, directory):
+    digests.sort()
+    run = tempfile.TemporaryFile(dir=directory)
+    run.write(b"".join(digests))
+    run.seek(0)
+    digests.clear()
+    return run
+
+def _read_run(run, width):
+    while True:
+        block = run.read(width * 4096)
+        if not block:
+            return
+        for offset in range(0, len(block), width):
+            yield block[offset:offset + width]
+
+def build_hashset(sources, output_path, algorithm=None, memory_budget=DEFAULT_BUILD_BUDGET):
+    """Compiles hash lists into a sorted, de-duplicated binary hash set.
+
+    Inputs are read in sorted runs of `memory_budget` digests that spill to
+    temporary files and are merged, so lists larger than RAM build fine.
+    Returns the number of distinct digests written.
+    """
+    if algorithm is not None and algorithm not in DIGEST_SIZES:
+        raise ValueError(f"Unsupported hash set algorithm: {algorithm}")
+    directory = os.path.dirname(os.path.abspath(output_path))
+    runs, digests = [], []
+    try:
+        for source in sources:
+            for detected, digest in iter_digests(source, algorithm):
+                if algorithm is None:
+                    algorithm = detected
+                elif detected != algorithm:
+                    continue
+                digests.append(digest)
+                if len(digests) >= memory_budget:
+                    runs.append(_spill(digests, directory))
+        if algorithm is None:
+            raise ValueError("No digests found in the input hash lists")
+        if digests or not runs:
+            runs.append(_spill(digests, directory))
+
+        width = DIGEST_SIZES[algorithm]
+        fanout = _load_fanout(bytes(_FANOUT_ENTRIES * 4))
+        count, last = 0, None
+        with open(output_path, "wb") as out:
+            out.write(bytes(_DIGESTS_OFFSET))
+            batch = []
+            for digest in heapq.merge(*(_read_run(run, width) for run in runs)):
+                if digest == last:
+                    continue
+                last = digest
+                fanout[digest[0] << 8 | digest[1]] += 1
+                batch.append(digest)
+                count += 1
+                if len(batch) >= 65536:
+                    out.write(b"".join(batch))
+                    batch.clear()
+            out.write(b"".join(batch))
+
+            # Bucket sizes -> running totals, then fill in the header
+            total = 0
+            for prefix in range(_FANOUT_ENTRIES):
+                total += fanout[prefix]
+                fanout[prefix] = total
+            if sys.byteorder == "big":
+                fanout.byteswap()
+            out.seek(0)
+            out.write(_HEADER.pack(_MAGIC, _VERSION, algorithm.encode(), count))
+            out.write(fanout.tobytes())
+        return count
+    finally:
+        for run in runs:
+            run.close()
@@ -0,0 +1,151 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import deque
+from core.report import RecordSpool
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dev INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    extension_detected TEXT,
+    hashes TEXT,
+    run INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_mtime ON files (mtime_ns);
+"""
+
+class ScanIndex:
+    """Persistent SQLite index of scanned files, keyed by (dev, inode, mtime, size).
+
+    Lookups may come from any scanner worker thread; each thread gets its own
+    read connection. Updates are staged and written in batches by whichever
+    thread calls `flush()`, normally the scan's consumer. With `create`
+    False the database must already exist, for callers that only read it.
+    """
+
+    def __init__(self, db_path, root, create=True):
+        if not create and not os.path.isfile(db_path):
+            raise FileNotFoundError(f"Scan index not found: {db_path}")
+        self.db_path = db_path
+        self._prefix, self._prefix_end = _path_range(root)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.run = self._conn.execute("SELECT COALESCE(MAX(run), 0) + 1 FROM files").fetchone()[0]
+
+        self._local = threading.local()
+        self._readers = []
+        self._staged = deque()
+        self.changes = {"added": 0, "modified": 0, "unchanged": 0, "error": 0, "deleted": 0}
+        # Paths removed by finish(), spooled to disk since the list can be huge
+        self.deleted_files = RecordSpool()
+        self._unlisted = []
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._local.conn = conn
+            self._readers.append(conn)
+        return conn
+
+    def lookup(self, path, stats):
+        """Classifies a file against the index.
+
+        Returns (status, cached) where status is "added", "modified" or
+        "unchanged". For unchanged files, cached holds the stored detection
+        results so the file does not need to be opened.
+        """
+        key = os.path.abspath(path)
+        row = self._reader().execute(
+            "SELECT dev, inode, mtime_ns, size, extension_detected, hashes FROM files WHERE path = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return "added", None
+        if row[:4] != (stats.st_dev, stats.st_ino, stats.st_mtime_ns, stats.st_size):
+            return "modified", None
+        return "unchanged", {
+            "extension_detected": row[4],
+            "hashes": json.loads(row[5]) if row[5] else {}
+        }
+
+    def stage(self, path, stats, status, extension_detected, hashes=None):
+        """Queues the index update for a scanned file (thread-safe)."""
+        self._staged.append((
+            status, os.path.abspath(path), stats.st_dev, stats.st_ino, stats.st_mtime_ns,
+            stats.st_size, extension_detected, json.dumps(hashes) if hashes else None
+        ))
+
+    def keep(self, path):
+        """Queues a file that exists but could not be analyzed, so its entry is kept rather than dropped as deleted."""
+        self._staged.append(("error", os.path.abspath(path), None, None, None, None, None, None))
+
+    def keep_tree(self, directory):
+        """Records a directory that could not be listed, so the entries below it are kept rather than dropped as deleted."""
+        self._unlisted.append(_path_range(directory))
+
+    def flush(self):
+        """Writes staged updates in a single transaction."""
+        upserts, seen = [], []
+        while self._staged:
+            row = self._staged.popleft()
+            self.changes[row[0]] += 1
+            if row[0] == "error" or (row[0] == "unchanged" and row[7] is None):
+                seen.append((self.run, row[1]))
+            else:
+                upserts.append(row[1:] + (self.run,))
+
+        with self._conn:
+            self._conn.executemany("UPDATE files SET run = ? WHERE path = ?", seen)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, dev, inode, mtime_ns, size, extension_detected, hashes, run) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                upserts
+            )
+
+    def finish(self):
+        """Flushes pending updates and drops entries under the root that were not seen."""
+        self.flush()
+        with self._conn:
+            for prefix, prefix_end in self._unlisted:
+                kept = self._conn.execute(
+                    "UPDATE files SET run = ? WHERE path >= ? AND path < ? AND run < ?",
+                    (self.run, prefix, prefix_end, self.run)
+                )
+                self.changes["error"] += kept.rowcount
+        bounds = (self._prefix, self._prefix_end, self.run)
+        for (path,) in self._conn.execute(
+            "SELECT path FROM files WHERE path >= ? AND path < ? AND run < ? ORDER BY path", bounds
+        ):
+            self.deleted_files.append(path)
+        with self._conn:
+            self._conn.execute("DELETE FROM files WHERE path >= ? AND path < ? AND run < ?", bounds)
+        self.changes["deleted"] = self.deleted_files.count
+        return self.changes
+
+    def modified_since(self, cutoff_ns, root=None):
+        """Yields (path, mtime_ns) of indexed files below root modified after the cutoff."""
+        prefix, prefix_end = _path_range(root) if root else (self._prefix, self._prefix_end)
+        yield from self._reader().execute(
+            "SELECT path, mtime_ns FROM files WHERE mtime_ns > ? AND path >= ? AND path < ? ORDER BY path",
+            (cutoff_ns, prefix, prefix_end)
+        )
+
+    def close(self):
+        self.deleted_files.close()
+        for conn in self._readers:
+            conn.close()
+        self._readers = []
+        self._conn.close()
+
+def _path_range(root):
+    """Every path below root sorts inside the returned [prefix, prefix_end)."""
+    prefix = os.path.abspath(root).rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
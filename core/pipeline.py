@@ -0,0 +1,47 @@
+from utils.concurrency import BackgroundConsumer
+from utils.metrics import metrics
+
+class Pipeline:
+    """Streams a single scan into several consumers at once.
+
+    Each sink is a callable taking one scan record. The tree is walked and
+    every file read exactly once, however many outputs are attached.
+    """
+
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.sinks = []
+        self.consumers = {}
+        # Return values of pull-based consumers, by name, once run() is done
+        self.results = {}
+
+    def add(self, name, sink, where=None):
+        """Attaches `sink`, optionally only for records matching `where`."""
+        self.sinks.append((f"sink_{name}", sink, where))
+
+    def add_consumer(self, name, consume, where=None):
+        """Attaches a pull-based consumer (one that takes an iterable of records).
+
+        It runs on its own thread while the scan is in progress; its return
+        value ends up in `results[name]`.
+        """
+        consumer = BackgroundConsumer(consume, name=name)
+        self.consumers[name] = consumer
+        self.add(name, consumer.put, where)
+
+    def run(self, progress_callback=None):
+        """Scans once, handing every record to each sink in turn.
+
+        Pull-based consumers are drained and joined before returning, even
+        if the scan fails part-way.
+        """
+        try:
+            for file_info in self.scanner.iter_scan(progress_callback):
+                for timer, sink, where in self.sinks:
+                    if where is None or where(file_info):
+                        with metrics.timer(timer):
+                            sink(file_info)
+        finally:
+            for name, consumer in self.consumers.items():
+                self.results[name] = consumer.close()
+        return self.scanner.files_scanned
@@ -0,0 +1,235 @@
+import os
+import sys
+import threading
+from array import array
+from collections.abc import MutableMapping
+
+# Keys every scan record has, in report order. Anything added later
+# (hashes, entropy, known_*, reason...) follows them in insertion order.
+FIELDS = ("path", "size", "created", "modified", "accessed", "extension_claimed", "extension_detected", "suspicious")
+_FIELD_SET = frozenset(FIELDS)
+
+# File types seen by this process, by small-int code. Codes are process-local:
+# records pickle and serialise by name, never by code.
+_type_names = [None]
+_type_codes = {None: 0}
+_type_lock = threading.Lock()
+
+def type_code(name):
+    """The small-int code for a file type name (claimed or detected extension)."""
+    code = _type_codes.get(name)
+    if code is None:
+        with _type_lock:
+            code = _type_codes.get(name)
+            if code is None:
+                code = len(_type_names)
+                # Published in the list before the dict, so a code is never seen without its name
+                _type_names.append(name)
+                _type_codes[name] = code
+    return code
+
+def _split(path):
+    """Splits a path into its interned directory prefix (with separator) and name."""
+    cut = path.rfind(os.sep)
+    if os.altsep:
+        cut = max(cut, path.rfind(os.altsep))
+    return sys.intern(path[:cut + 1]), path[cut + 1:]
+
+class FileRecord(MutableMapping):
+    """One scanned file, stored compactly but read and written like a dict.
+
+    The directory part of the path is interned, so files in the same
+    directory share one prefix string, and both extensions are small-int
+    codes into a shared type table. Optional keys live in a per-record dict
+    that is only created when the first one is set. `to_dict()` gives the
+    plain dict written to reports, with keys in the same order as before.
+    """
+
+    __slots__ = ("_dir", "_name", "size", "created", "modified", "accessed", "_claimed", "_detected", "suspicious", "_extra")
+
+    def __init__(self, path, size, created, modified, accessed, extension_claimed, extension_detected, suspicious=False):
+        self._dir, self._name = _split(path)
+        self.size = size
+        self.created = created
+        self.modified = modified
+        self.accessed = accessed
+        self._claimed = type_code(extension_claimed)
+        self._detected = type_code(extension_detected)
+        self.suspicious = suspicious
+        self._extra = None
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls(*(data[field] for field in FIELDS[:-1]), suspicious=data.get("suspicious", False))
+        for key, value in data.items():
+            if key not in _FIELD_SET:
+                record[key] = value
+        return record
+
+    @property
+    def path(self):
+        return self._dir + self._name
+
+    @path.setter
+    def path(self, value):
+        self._dir, self._name = _split(value)
+
+    @property
+    def extension_claimed(self):
+        return _type_names[self._claimed]
+
+    @extension_claimed.setter
+    def extension_claimed(self, value):
+        self._claimed = type_code(value)
+
+    @property
+    def extension_detected(self):
+        return _type_names[self._detected]
+
+    @extension_detected.setter
+    def extension_detected(self, value):
+        self._detected = type_code(value)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            raise TypeError(f"{key!r} is a fixed field of a scan record")
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key):
+        return key in _FIELD_SET or (self._extra is not None and key in self._extra)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __iter__(self):
+        yield from FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return len(FIELDS) + (len(self._extra) if self._extra else 0)
+
+    def to_dict(self):
+        data = {
+            "path": self._dir + self._name,
+            "size": self.size,
+            "created": self.created,
+            "modified": self.modified,
+            "accessed": self.accessed,
+            "extension_claimed": _type_names[self._claimed],
+            "extension_detected": _type_names[self._detected],
+            "suspicious": self.suspicious
+        }
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __reduce__(self):
+        # Type codes mean nothing in another process
+        return FileRecord.from_dict, (self.to_dict(),)
+
+    def __repr__(self):
+        return f"FileRecord({self.to_dict()!r})"
+
+class RecordStore:
+    """Append-only, column-per-field storage for the records of a whole scan.
+
+    Sizes, timestamps and type codes are packed into typed arrays, file
+    names are concatenated into one UTF-8 buffer, and each directory prefix
+    is stored once, so a retained record costs about 60 bytes plus the
+    length of its name. Indexing or iterating materialises FileRecords;
+    changing one does not change the stored copy.
+    """
+
+    def __init__(self, records=()):
+        self._dirs = []
+        self._dir_ids = {}
+        self._dir = array("I")
+        # Encoded file names back to back; _name_ends[i] is where name i stops
+        self._names = bytearray()
+        self._name_ends = array("Q")
+        self._sizes = array("Q")
+        self._times = array("d") # created, modified, accessed
+        self._types = array("I") # claimed, detected
+        self._suspicious = bytearray()
+        self._extra = []
+        for record in records:
+            self.append(record)
+
+    def append(self, record):
+        if not isinstance(record, FileRecord):
+            record = FileRecord.from_dict(record)
+        dir_id = self._dir_ids.get(record._dir)
+        if dir_id is None:
+            dir_id = self._dir_ids[record._dir] = len(self._dirs)
+            self._dirs.append(record._dir)
+        self._dir.append(dir_id)
+        self._names += record._name.encode("utf-8", "surrogateescape")
+        self._name_ends.append(len(self._names))
+        self._sizes.append(record.size)
+        self._times.extend((record.created, record.modified, record.accessed))
+        self._types.extend((record._claimed, record._detected))
+        self._suspicious.append(bool(record.suspicious))
+        self._extra.append(dict(record._extra) if record._extra else None)
+
+    def __len__(self):
+        return len(self._name_ends)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        record = FileRecord.__new__(FileRecord)
+        record._dir = self._dirs[self._dir[index]]
+        start = self._name_ends[index - 1] if index else 0
+        record._name = self._names[start:self._name_ends[index]].decode("utf-8", "surrogateescape")
+        record.size = self._sizes[index]
+        record.created, record.modified, record.accessed = self._times[index * 3:index * 3 + 3]
+        record._claimed, record._detected = self._types[index * 2:index * 2 + 2]
+        record.suspicious = bool(self._suspicious[index])
+        extra = self._extra[index]
+        record._extra = dict(extra) if extra else None
+        return record
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Type codes are process-local; ship the names they stand for
+        state["_type_names"] = list(_type_names)
+        return state
+
+    def __setstate__(self, state):
+        codes = [type_code(name) for name in state.pop("_type_names")]
+        state["_types"] = array("I", (codes[code] for code in state["_types"]))
+        self.__dict__.update(state)
+
+def json_default(value):
+    """`default=` hook for json.dump(s): writes scan records as their plain dict."""
+    if isinstance(value, FileRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -1,40 +1,210 @@
 import os
-import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from core.container import ContainerWriter
+from core.report import NDJSONReportWriter
+from core.signatures import SPECIALISED_TYPES
+from utils.concurrency import ordered_map
+from utils.fileio import copy_file, copy_file_hashed
+from utils.hashing import hash_file
 from utils.logger import log
+from utils.metrics import metrics
 
 class RecoveryEngine:
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, workers=1, dedup=False, container=None):
         self.output_dir = output_dir
+        self.workers = max(1, workers)
+        # Store identical content once under blobs/, with a manifest per source
+        self.dedup = dedup
+        # Pack everything into this evidence container instead of output_dir
+        self.container = container
+        self.duplicates = 0
+        # Digest -> Future resolved to True once that content is stored, False if storing it failed
+        self._stored = {}
+        self._stored_lock = threading.Lock()
+        self._taken = set()
+        if container:
+            return
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        # Names left by earlier runs, listed once instead of probed per file
+        self._taken = set(os.listdir(output_dir))
 
     def recover_files(self, file_list, extensions=None):
         """Copies identified files to the recovery directory."""
+        if self.container:
+            return self._pack_files(file_list, extensions)
         log.info(f"[bold cyan]Starting recovery to {self.output_dir}[/bold cyan]")
-        
+
         recovered_count = 0
-        
-        for file_info in file_list:
-            if extensions:
-                # Filter by detected type if available, else claimed
-                ext = file_info.get("extension_detected") or file_info.get("extension_claimed")
-                if ext not in extensions:
+        # Digest lists in sha256sum format, one per algorithm found in the scan records
+        checksum_files = {}
+        manifest = NDJSONReportWriter(os.path.join(self.output_dir, "manifest.ndjson")) if self.dedup else None
+
+        jobs = (self._plan(file_info) for file_info in file_list if self._wanted(file_info, extensions))
+
+        # Copies run on a bounded pool; results come back in input order
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for file_info, dest_path, digest, duplicate, error in ordered_map(pool, self._copy, jobs, window=self.workers * 4):
+                if error:
+                    metrics.error("recover", error)
+                    log.error(f"Failed to recover {file_info['path']}: {error}", per_file=True)
                     continue
-            
-            try:
-                dest_path = os.path.join(self.output_dir, os.path.basename(file_info["path"]))
-                
-                # Handle duplicate filenames
-                if os.path.exists(dest_path):
-                    base, ext = os.path.splitext(os.path.basename(file_info["path"]))
-                    dest_path = os.path.join(self.output_dir, f"{base}_{int(file_info['created'])}{ext}")
-
-                shutil.copy2(file_info["path"], dest_path)
+
                 recovered_count += 1
-                log.info(f"Recovered: {file_info['path']}")
-                
-            except Exception as e:
-                log.error(f"Failed to recover {file_info['path']}: {e}")
+                if duplicate:
+                    self.duplicates += 1
+                    log.info(f"Recovered (duplicate content): {file_info['path']}", per_file=True)
+                else:
+                    log.info(f"Recovered: {file_info['path']}", per_file=True)
+
+                if manifest:
+                    manifest.write({
+                        "source": file_info["path"],
+                        "blob": os.path.relpath(dest_path, self.output_dir),
+                        "sha256": digest,
+                        "size": file_info["size"],
+                        "duplicate": duplicate
+                    })
+
+                if not duplicate:
+                    for algorithm, value in file_info.get("hashes", {}).items():
+                        if algorithm not in checksum_files:
+                            checksum_files[algorithm] = open(os.path.join(self.output_dir, f"{algorithm.upper()}SUMS"), "w")
+                        checksum_files[algorithm].write(f"{value}  {os.path.relpath(dest_path, self.output_dir)}\n")
+
+        for checksum_file in checksum_files.values():
+            checksum_file.close()
+        if manifest:
+            manifest.close()
 
         log.info(f"[bold green]Recovery complete. Recovered {recovered_count} files.[/bold green]")
         return recovered_count
+
+    def _pack_files(self, file_list, extensions):
+        """Packs identified files into the evidence container, content-addressed by SHA-256."""
+        log.info(f"[bold cyan]Starting recovery into container {self.container}[/bold cyan]")
+
+        recovered_count = 0
+        # Each file is read once, by the container writer, which hashes it as it is packed
+        with ContainerWriter(self.container) as container:
+            for file_info in file_list:
+                if not self._wanted(file_info, extensions):
+                    continue
+                try:
+                    duplicate = container.add(file_info, file_info.get("hashes", {}).get("sha256"))
+                except Exception as e:
+                    metrics.error("recover", e)
+                    log.error(f"Failed to recover {file_info['path']}: {e}", per_file=True)
+                    continue
+
+                recovered_count += 1
+                if duplicate:
+                    log.info(f"Recovered (duplicate content): {file_info['path']}", per_file=True)
+                else:
+                    log.info(f"Recovered: {file_info['path']}", per_file=True)
+            self.duplicates = container.duplicates
+
+        log.info(f"[bold green]Recovery complete. Recovered {recovered_count} files.[/bold green]")
+        return recovered_count
+
+    def _wanted(self, file_info, extensions):
+        if not extensions:
+            return True
+        # Filter by detected type if available, else claimed
+        ext = file_info.get("extension_detected") or file_info.get("extension_claimed")
+        if ext in extensions:
+            return True
+        # A more specific signature of a requested type (docx for zip) still counts as that type
+        return any(ext in SPECIALISED_TYPES.get(requested, ()) for requested in extensions)
+
+    def _plan(self, file_info):
+        """Picks a unique destination name; done serially so names are deterministic."""
+        if self.dedup:
+            return file_info, None # Named after the content hash once it is known
+
+        name = os.path.basename(file_info["path"])
+        # Handle duplicate filenames
+        if name in self._taken:
+            base, ext = os.path.splitext(name)
+            name = f"{base}_{int(file_info['created'])}{ext}"
+            suffix = 1
+            while name in self._taken:
+                name = f"{base}_{int(file_info['created'])}_{suffix}{ext}"
+                suffix += 1
+        self._taken.add(name)
+        return file_info, os.path.join(self.output_dir, name)
+
+    def _blob_path(self, digest, file_info):
+        ext = file_info.get("extension_detected")
+        name = f"{digest}.{ext}" if ext else digest
+        return os.path.join(self.output_dir, "blobs", digest[:2], name)
+
+    def _blob_intact(self, blob_path, digest):
+        """True if a blob left by an earlier run exists and still hashes to its digest."""
+        if not os.path.exists(blob_path):
+            return False
+        with metrics.timer("hash"):
+            return hash_file(blob_path)["sha256"] == digest
+
+    def _claim(self, digest):
+        """Returns None if the caller should store this content, or True once another copy of it is stored.
+
+        A duplicate waits for the copy that claimed the digest first; if that
+        copy fails, the claim is released and the duplicate tries instead.
+        """
+        while True:
+            with self._stored_lock:
+                stored = self._stored.get(digest)
+                if stored is None:
+                    self._stored[digest] = Future()
+                    return None
+            if stored.result():
+                return True
+
+    def _release(self, digest, success):
+        with self._stored_lock:
+            stored = self._stored[digest] if success else self._stored.pop(digest)
+        stored.set_result(success)
+
+    def _copy(self, job):
+        """Worker: copies one file, or skips it when its content is already stored."""
+        file_info, dest_path = job
+        digest, claimed, partial_path = None, False, None
+        try:
+            if self.dedup:
+                digest = file_info.get("hashes", {}).get("sha256")
+                if not digest:
+                    with metrics.timer("hash"):
+                        digest = hash_file(file_info["path"])["sha256"]
+                dest_path = self._blob_path(digest, file_info)
+                if self._claim(digest):
+                    return file_info, dest_path, digest, True, None
+                claimed = True
+                if self._blob_intact(dest_path, digest):
+                    # Stored by an earlier run into the same output directory
+                    self._release(digest, True)
+                    return file_info, dest_path, digest, False, None
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+
+            # Copied under a temporary name and renamed into place, so a crash never leaves a partial file under the final name
+            partial_path = dest_path + ".part"
+            with metrics.timer("copy"):
+                if self.dedup:
+                    # The blob is named by its digest, so check the bytes actually copied carry it
+                    copied, copied_digest = copy_file_hashed(file_info["path"], partial_path)
+                    if copied_digest != digest:
+                        raise ValueError(f"Content changed since it was hashed (now {copied_digest}, expected {digest})")
+                else:
+                    copied = copy_file(file_info["path"], partial_path)
+                os.replace(partial_path, dest_path)
+            metrics.incr("bytes_copied", copied)
+            if claimed:
+                self._release(digest, True)
+            return file_info, dest_path, digest, False, None
+        except Exception as e:
+            if partial_path and os.path.exists(partial_path):
+                os.remove(partial_path)
+            if claimed:
+                self._release(digest, False)
+            return file_info, dest_path, digest, False, e
@@ -0,0 +1,366 @@
+import json
+import os
+import sqlite3
+import tempfile
+from collections.abc import Iterator
+from core.records import json_default
+from utils.concurrency import BackgroundConsumer
+from utils.metrics import metrics
+
+# Characters of report text buffered before a chunk is handed to the writer thread
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Rows per table buffered before a batch is inserted and committed
+DEFAULT_BATCH_ROWS = 5000
+# Chunks or batches queued for a writer thread before producers wait
+_QUEUED = 8
+
+def _indented(value, depth):
+    """Pretty-prints a value as it would appear nested `depth` levels deep."""
+    return json.dumps(value, indent=4, default=json_default).replace("\n", "\n" + "    " * depth)
+
+def _compact(value, depth=0):
+    return json.dumps(value, separators=(",", ":"), default=json_default)
+
+class ChunkedWriter:
+    """Text file whose writes are gathered into chunks and written by a background thread.
+
+    Formatting stays on the caller's thread while encoding and disk I/O
+    overlap with it. Every chunk is flushed once written, so a run that
+    dies late still leaves everything up to its last chunk on disk.
+    """
+
+    def __init__(self, output_path, chunk_size=DEFAULT_CHUNK_SIZE, **open_args):
+        self.output_path = output_path
+        self.chunk_size = chunk_size
+        self._file = open(output_path, "w", **open_args)
+        self._parts = []
+        self._size = 0
+        self._writer = BackgroundConsumer(self._drain, maxsize=_QUEUED, name="report-writer")
+
+    def _drain(self, chunks):
+        for chunk in chunks:
+            with metrics.timer("report_flush"):
+                self._file.write(chunk)
+                self._file.flush()
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self._writer.put("".join(self._parts))
+            self._parts = []
+            self._size = 0
+
+    def close(self):
+        try:
+            self.flush()
+            self._writer.close()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class RecordSpool:
+    """Temporary NDJSON file holding records until they are read back.
+
+    Lets a writer list a section (suspicious files, deleted paths) after the
+    records it was collected from without keeping it in memory.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile("w+", encoding="utf-8", prefix="nx_spool_", suffix=".ndjson")
+        self.count = 0
+
+    def append(self, record):
+        self._file.write(json.dumps(record, default=json_default))
+        self._file.write("\n")
+        self.count += 1
+
+    def __iter__(self):
+        self._file.flush()
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line)
+        self._file.seek(0, os.SEEK_END)
+
+    def close(self):
+        self._file.close()
+
+class NDJSONReportWriter:
+    """Writes one JSON record per line as files are analyzed."""
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.records_written = 0
+        self._file = ChunkedWriter(output_path)
+
+    def write(self, record):
+        with metrics.timer("json_write"):
+            self._file.write(json.dumps(record, default=json_default))
+            self._file.write("\n")
+        self.records_written += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JSONDocumentWriter:
+    """Writes a JSON object key by key.
+
+    Values are written as they become available and list values can be
+    streamed from any iterable, so large sections never sit in memory.
+    By default the document is compact, with one list item per line; with
+    `pretty` it matches json.dump(..., indent=4) of the same object.
+    """
+
+    def __init__(self, output_path, pretty=False):
+        self.output_path = output_path
+        self.pretty = pretty
+        self._keys = 0
+        self._items = 0 # Items written to the list currently open
+        if pretty:
+            self._format, self._key_sep, self._item_sep = _indented, "\n    ", "\n        "
+        else:
+            self._format, self._key_sep, self._item_sep = _compact, "\n", "\n"
+        self._file = ChunkedWriter(output_path)
+        self._file.write("{")
+
+    def _key(self, key):
+        if self._keys:
+            self._file.write("," + self._key_sep)
+        elif self.pretty:
+            self._file.write(self._key_sep)
+        self._file.write(f"{json.dumps(key)}: " if self.pretty else f"{json.dumps(key)}:")
+        self._keys += 1
+
+    def write_value(self, key, value):
+        if isinstance(value, (list, Iterator, RecordSpool)):
+            # Same text when pretty; one item per line when compact. Iterators are streamed
+            self.write_list(key, value)
+            return
+        with metrics.timer("json_write"):
+            self._key(key)
+            self._file.write(self._format(value, 1))
+
+    def begin_list(self, key):
+        """Opens a list value; fill it with append() and finish it with end_list()."""
+        self._key(key)
+        self._items = 0
+
+    def append(self, item):
+        with metrics.timer("json_write"):
+            self._file.write(("," if self._items else "[") + self._item_sep)
+            self._file.write(self._format(item, 2))
+        self._items += 1
+
+    def end_list(self):
+        """Closes the open list; returns the number of items written to it."""
+        self._file.write(self._key_sep + "]" if self._items else "[]")
+        return self._items
+
+    def write_list(self, key, records):
+        """Streams an iterable as a list value; returns the number of items written."""
+        self.begin_list(key)
+        for record in records:
+            self.append(record)
+        return self.end_list()
+
+    def close(self):
+        self._file.write("\n}\n" if self._keys and self.pretty else "}\n")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JSONReportWriter:
+    """Streams the scan report to disk as one JSON document.
+
+    `all_files` is written incrementally; suspicious records are spooled to
+    a temporary file so they can be listed once the scan finishes without
+    being held in memory.
+    """
+
+    def __init__(self, output_path, header, pretty=False):
+        self.output_path = output_path
+        self.files_found = 0
+        self._suspicious = RecordSpool()
+        # Extra top-level keys written after the records, set before close()
+        self.trailer = {}
+        self._document = JSONDocumentWriter(output_path, pretty=pretty)
+        for key, value in header.items():
+            self._document.write_value(key, value)
+        self._document.begin_list("all_files")
+
+    def write(self, record):
+        self._document.append(record)
+        self.files_found += 1
+        if record["suspicious"]:
+            self._suspicious.append(record)
+
+    def close(self):
+        try:
+            self._document.end_list()
+            self._document.write_list("suspicious_files", self._suspicious)
+            for key, value in self.trailer.items():
+                self._document.write_value(key, value)
+            self._document.write_value("files_found", self.files_found)
+            self._document.close()
+        finally:
+            self._suspicious.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Report database layout. Scan records go to `files` (keys without a column
+# are kept as JSON in `extra`), timeline events to `events`, list values
+# such as artifact sections to `records`, and other values to `meta`.
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (
+    path TEXT, size INTEGER, created REAL, modified REAL, accessed REAL,
+    extension_claimed TEXT, extension_detected TEXT, suspicious INTEGER, reason TEXT, extra TEXT
+);
+CREATE TABLE events (timestamp REAL, type TEXT, file TEXT);
+CREATE TABLE records (section TEXT, seq INTEGER, data TEXT);
+CREATE VIEW suspicious_files AS SELECT * FROM files WHERE suspicious;
+"""
+# Built once all rows are in, which is much faster than maintaining them per insert
+_INDEXES = """
+CREATE INDEX files_path ON files (path);
+CREATE INDEX files_type ON files (extension_detected);
+CREATE INDEX files_modified ON files (modified);
+CREATE INDEX files_suspicious ON files (suspicious);
+CREATE INDEX events_timestamp ON events (timestamp);
+CREATE INDEX records_section ON records (section, seq);
+"""
+_INSERTS = {
+    "meta": "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+    "files": "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "events": "INSERT INTO events VALUES (?, ?, ?)",
+    "records": "INSERT INTO records VALUES (?, ?, ?)"
+}
+_FILE_COLUMNS = frozenset(("path", "size", "created", "modified", "accessed",
+                           "extension_claimed", "extension_detected", "suspicious", "reason"))
+
+def _text(path):
+    """Paths SQLite can store as text; undecodable file names are kept byte-exact as BLOBs."""
+    try:
+        path.encode("utf-8")
+        return path
+    except UnicodeEncodeError:
+        return path.encode("utf-8", "surrogateescape")
+
+class SQLiteReportWriter:
+    """Writes a report as an indexed SQLite database instead of a JSON document.
+
+    Offers the same write(), write_value() and write_list() calls as the
+    JSON writers. Rows are batched per table and inserted and committed on
+    a background thread, so a crash late in a run keeps every committed
+    batch. Indexes are built on close().
+    """
+
+    def __init__(self, output_path, batch_size=DEFAULT_BATCH_ROWS):
+        self.output_path = output_path
+        self.batch_size = batch_size
+        self.records_written = 0
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        self._batches = {}
+        self._writer = BackgroundConsumer(self._drain, maxsize=_QUEUED, name="report-db-writer")
+
+    def _drain(self, batches):
+        conn = sqlite3.connect(self.output_path)
+        try:
+            # Reports are rewritten from scratch each run; surviving power loss is not worth an fsync per batch
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(_SCHEMA)
+            for table, rows in batches:
+                with metrics.timer("report_flush"):
+                    conn.executemany(_INSERTS[table], rows)
+                    conn.commit()
+            with metrics.timer("report_index"):
+                conn.executescript(_INDEXES)
+                conn.commit()
+        finally:
+            conn.close()
+
+    def _add(self, table, row):
+        rows = self._batches.get(table)
+        if rows is None:
+            rows = self._batches[table] = []
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self._writer.put((table, rows))
+            del self._batches[table]
+
+    def write(self, record):
+        """Adds one scan record to the `files` table."""
+        with metrics.timer("db_write"):
+            extra = {key: record[key] for key in record if key not in _FILE_COLUMNS}
+            self._add("files", (
+                _text(record["path"]), record["size"], record["created"], record["modified"], record["accessed"],
+                record["extension_claimed"], record["extension_detected"], int(record["suspicious"]),
+                record.get("reason"), json.dumps(extra, default=json_default) if extra else None
+            ))
+        self.records_written += 1
+
+    def write_value(self, key, value):
+        if isinstance(value, (list, Iterator, RecordSpool)):
+            # Lists are stored row by row so they can be queried
+            self.write_list(key, value)
+            return
+        self._writer.put(("meta", [(key, json.dumps(value, default=json_default))]))
+
+    def write_list(self, key, records):
+        """Streams an iterable into `records` under `key`; returns the number of items written."""
+        count = 0
+        for record in records:
+            with metrics.timer("db_write"):
+                self._add("records", (key, count, json.dumps(record, default=json_default)))
+            count += 1
+        return count
+
+    def write_events(self, events):
+        """Streams timeline events into the `events` table; returns the number written."""
+        count = 0
+        for event in events:
+            self._add("events", (event["timestamp"], event["type"], _text(event["file"])))
+            count += 1
+        return count
+
+    def close(self):
+        for table, rows in self._batches.items():
+            self._writer.put((table, rows))
+        self._batches = {}
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_summary(output_path, summary):
+    """Writes a small summary document alongside a streamed report; iterator values are streamed as lists."""
+    with JSONDocumentWriter(output_path, pretty=True) as document:
+        for key, value in summary.items():
+            document.write_value(key, value)
@@ -0,0 +1,139 @@
+import json
+import os
+import re
+from core.signatures import COMPATIBLE_TYPES
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "suspicious_rules.json")
+
+RULE_TYPES = ("extension", "name", "location", "size", "double_extension", "magic_mismatch", "entropy", "known_bad")
+
+class RuleEngine:
+    """Evaluates suspicious-file rules in one pass per file.
+
+    Rules are compiled once: extension rules become a single dict lookup,
+    name and location patterns are OR-ed into one regex per kind that acts
+    as a pre-filter, so per-pattern checks only run on the rare files that
+    hit it. Every matching rule contributes a reason.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._by_extension = {}
+        self._name_rules = []
+        self._location_rules = []
+        self._size_rules = []
+        self._double_ext = []
+        self._mismatch = []
+        self._entropy_rules = []
+        self._known_bad = []
+
+        for position, rule in enumerate(rules):
+            if not rule.get("name"):
+                raise ValueError(f"Rule {position} has no name")
+            kind = rule.get("type")
+            if kind not in RULE_TYPES:
+                raise ValueError(f"Unknown rule type {kind!r} in rule {position} ({rule['name']!r})")
+            extensions = frozenset(e.lower() for e in rule.get("extensions", ()))
+            reason = rule["reason"] if "reason" in rule else rule["name"]
+
+            if kind == "extension":
+                for ext in extensions:
+                    self._by_extension.setdefault(ext, []).append(reason)
+            elif kind in ("name", "location"):
+                compiled = re.compile("|".join(f"(?:{p})" for p in rule["patterns"]), re.IGNORECASE)
+                target = self._name_rules if kind == "name" else self._location_rules
+                target.append((compiled, extensions, reason))
+            elif kind == "size":
+                self._size_rules.append((rule.get("min"), rule.get("max"), extensions, reason))
+            elif kind == "double_extension":
+                self._double_ext.append((
+                    frozenset(rule["decoy_extensions"]), frozenset(rule["executable_extensions"]), reason
+                ))
+            elif kind == "entropy":
+                self._entropy_rules.append((
+                    rule.get("min_entropy", 7.5), rule.get("min_size", 0),
+                    frozenset(rule.get("exempt_types", ())), frozenset(rule.get("require_signature", ())), reason
+                ))
+            elif kind == "known_bad":
+                self._known_bad.append(reason)
+            else:
+                self._mismatch.append(reason)
+
+        self._any_name = self._combine(self._name_rules)
+        self._any_location = self._combine(self._location_rules)
+
+    @staticmethod
+    def _combine(rules):
+        if not rules:
+            return None
+        return re.compile("|".join(f"(?:{r[0].pattern})" for r in rules), re.IGNORECASE)
+
+    def evaluate(self, file_info, relative_path=None):
+        """Returns the reasons of every rule the file matches, in rule-kind order.
+
+        Location patterns see `relative_path` (the path below the scan root)
+        when given, so a hidden scan root does not taint every file.
+        """
+        reasons = []
+        path = file_info["path"]
+        name = os.path.basename(path)
+        ext = file_info["extension_claimed"]
+
+        reasons.extend(self._by_extension.get(ext, ()))
+
+        known_bad = file_info.get("known_bad")
+        if known_bad and self._known_bad:
+            reasons.extend(r.format(set=known_bad) for r in self._known_bad)
+
+        if self._double_ext:
+            parts = name.lower().rsplit(".", 2)
+            if len(parts) == 3:
+                for decoys, executables, reason in self._double_ext:
+                    if parts[1] in decoys and parts[2] in executables:
+                        reasons.append(reason)
+
+        detected = file_info["extension_detected"]
+        if self._mismatch and detected and detected != ext and ext not in COMPATIBLE_TYPES.get(detected, ()):
+            reasons.extend(r.format(claimed=ext, detected=detected) for r in self._mismatch)
+
+        if self._any_name and self._any_name.search(name):
+            for pattern, extensions, reason in self._name_rules:
+                if (not extensions or ext in extensions) and pattern.search(name):
+                    reasons.append(reason)
+
+        if self._any_location:
+            location = (relative_path if relative_path is not None else path).replace(os.sep, "/")
+            if self._any_location.search(location):
+                for pattern, extensions, reason in self._location_rules:
+                    if (not extensions or ext in extensions) and pattern.search(location):
+                        reasons.append(reason)
+
+        size = file_info["size"]
+        for low, high, extensions, reason in self._size_rules:
+            if (not extensions or ext in extensions) and (low is None or size >= low) and (high is None or size <= high):
+                reasons.append(reason)
+
+        entropy = file_info.get("entropy")
+        if entropy is not None:
+            for min_entropy, min_size, exempt, signed, reason in self._entropy_rules:
+                if entropy >= min_entropy and size >= min_size and not self._entropy_expected(ext, detected, exempt, signed):
+                    reasons.append(reason.format(entropy=entropy, claimed=ext, detected=detected))
+
+        return reasons
+
+    @staticmethod
+    def _entropy_expected(claimed, detected, exempt, signed):
+        """Whether the file's type accounts for high entropy.
+
+        A detected type decides. Otherwise the claimed extension is trusted
+        unless it is one whose header is always present (`signed`), so an
+        encrypted blob that kept its .jpg name but lost its header is flagged.
+        """
+        if detected:
+            return detected in exempt
+        return claimed in exempt and claimed not in signed
+
+def load_rules(path=None):
+    """Loads and compiles a rules file (JSON with a top-level "rules" list)."""
+    with open(path or DEFAULT_RULES_PATH) as f:
+        return RuleEngine(json.load(f)["rules"])
@@ -1,91 +1,262 @@
+import multiprocessing
 import os
 import time
-from core.signatures import get_file_type
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from core.entropy import BATCH_SIZE, analyze_batch
+from core.records import FileRecord, RecordStore
+from core.rules import load_rules
+from core.signatures import HEADER_SIZE, get_file_type
+from utils.concurrency import ordered_map
+from utils.hashing import hash_file
 from utils.logger import log
+from utils.metrics import metrics
+
+# Staged scan-index updates are committed in batches of this many files
+INDEX_FLUSH_EVERY = 5000
 
 class Scanner:
-    def __init__(self, target_dir):
+    def __init__(self, target_dir, workers=1, index=None, hash_algorithms=(), rules=None,
+                 entropy_budget=None, entropy_workers=None, known_hashes=None):
         self.target_dir = target_dir
-        self.scan_results = []
+        self.rules = rules or load_rules()
+        self.workers = max(1, workers)
+        self.index = index
+        # Known-file hash sets need their digests computed for every file
+        self.known_hashes = known_hashes
+        if known_hashes:
+            hash_algorithms = tuple(hash_algorithms) + known_hashes.algorithms
+        self.hash_algorithms = tuple(dict.fromkeys(hash_algorithms))
+        # Bytes sampled per file for entropy features; None skips the stage
+        self.entropy_budget = entropy_budget
+        self.entropy_workers = entropy_workers or os.cpu_count() or 1
+        # Retained by scan() only; columnar so whole-tree results stay small
+        self.scan_results = RecordStore()
         self.suspicious_files = []
 
     def scan(self, progress_callback=None):
         """Recursively scans the directory for files and identifies them."""
         # log.info(f"Starting scan on: {self.target_dir}") # Moved logging to CLI for cleaner output control
-        
-        for root, dirs, files in os.walk(self.target_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                try:
-                    file_info = self.analyze_file(file_path)
-                    if file_info:
-                        self.scan_results.append(file_info)
-                        self.check_suspicious(file_info)
-                        
-                        if progress_callback:
-                            progress_callback(file_info)
-                            
-                except Exception as e:
-                    # log.error(f"Error scanning {file_path}: {e}")
-                    pass # Suppress individual file errors during scan to keep CLI clean
+
+        for file_info in self.iter_scan(progress_callback):
+            self.scan_results.append(file_info)
+            if file_info["suspicious"]:
+                self.suspicious_files.append(file_info)
 
         # log.success(f"Scan complete. Found {len(self.scan_results)} files.")
         return self.scan_results
 
-    def analyze_file(self, file_path):
+    def iter_scan(self, progress_callback=None):
+        """Yields each analyzed file as soon as it is ready, retaining nothing.
+
+        Only the running counters `files_scanned`, `suspicious_count` and
+        `walk_errors` are kept, so memory stays flat however large the tree is.
+        Raises OSError if the target itself cannot be listed.
+        """
+        self.files_scanned = 0
+        self.walk_errors = 0
+        self.suspicious_count = 0
+        self.known_good_excluded = 0
+
+        if self.workers > 1:
+            # Header reads fan out over the pool; results come back in walk order
+            # so the result stream and suspicious flags match a serial scan.
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                analyzed = ordered_map(pool, self._analyze_entry, self.walk(), window=self.workers * 4)
+                yield from self._checked(self._with_entropy(self._without_known_good(analyzed)), progress_callback)
+        else:
+            analyzed = map(self._analyze_entry, self.walk())
+            yield from self._checked(self._with_entropy(self._without_known_good(analyzed)), progress_callback)
+
+        if self.index:
+            self.index.finish()
+
+    def _without_known_good(self, analyzed):
+        """Drops files listed in a known-good hash set before any further work."""
+        if not self.known_hashes or not self.known_hashes.good:
+            yield from analyzed
+            return
+        for file_info in analyzed:
+            if file_info and "known_good" in file_info:
+                self.known_good_excluded += 1
+                metrics.incr("known_good_excluded")
+                continue
+            yield file_info
+
+    def _with_entropy(self, analyzed):
+        """Attaches sampled byte-distribution features to each analyzed file.
+
+        Files are sent to a process pool in batches of BATCH_SIZE and come
+        back in order, so downstream stages see the same stream as without
+        the stage. Records the sampler could not read pass through unchanged.
+        """
+        if not self.entropy_budget:
+            yield from analyzed
+            return
+
+        pending = deque()
+
+        def batches():
+            batch = []
+            for file_info in analyzed:
+                if file_info is None:
+                    continue
+                pending.append(file_info)
+                batch.append((file_info["path"], file_info["size"], self.entropy_budget))
+                if len(batch) == BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        # The scan already runs threads, so workers must not be forked from it
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        with ProcessPoolExecutor(max_workers=self.entropy_workers, mp_context=context) as pool:
+            for results in ordered_map(pool, analyze_batch, batches(), window=self.entropy_workers * 2):
+                for features in results:
+                    file_info = pending.popleft()
+                    if features is None:
+                        metrics.incr("entropy_unreadable")
+                    else:
+                        file_info["entropy"] = features.pop("entropy")
+                        file_info["byte_features"] = features
+                    yield file_info
+
+    def walk(self):
+        """Yields a DirEntry for every regular file below the target, top-down."""
+        stack = [self.target_dir]
+        while stack:
+            root = stack.pop()
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError as e:
+                if root is self.target_dir:
+                    raise
+                metrics.error("walk", e)
+                self.walk_errors += 1
+                if self.index:
+                    self.index.keep_tree(root)
+                continue
+
+            subdirs = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+            # Reversed so the first subdirectory is popped (and walked) first
+            stack.extend(reversed(subdirs))
+
+    def _analyze_entry(self, entry):
+        try:
+            with metrics.timer("stat"):
+                stats = entry.stat()
+        except OSError as e:
+            metrics.error("stat", e)
+            if self.index and not isinstance(e, FileNotFoundError):
+                self.index.keep(entry.path)
+            return None
+        return self.analyze_file(entry.path, stats)
+
+    def _checked(self, analyzed, progress_callback):
+        for file_info in analyzed:
+            if not file_info:
+                continue
+            try:
+                with metrics.timer("suspicious_check"):
+                    self.check_suspicious(file_info)
+                if progress_callback:
+                    with metrics.timer("progress"):
+                        progress_callback(file_info)
+            except Exception as e:
+                # log.error(f"Error scanning {file_info['path']}: {e}")
+                metrics.error("check", e) # Suppress individual file errors during scan to keep CLI clean
+
+            self.files_scanned += 1
+            if file_info["suspicious"]:
+                self.suspicious_count += 1
+            if self.index and self.files_scanned % INDEX_FLUSH_EVERY == 0:
+                with metrics.timer("index_flush"):
+                    self.index.flush()
+            metrics.incr("files_scanned")
+            yield file_info
+
+    def analyze_file(self, file_path, stats=None):
         """Extracts metadata and identifies file type using magic bytes."""
         try:
-            stats = os.stat(file_path)
+            # Reuse stat data from the directory walk when the caller has it
+            if stats is None:
+                with metrics.timer("stat"):
+                    stats = os.stat(file_path)
             file_size = stats.st_size
             created = stats.st_ctime
             modified = stats.st_mtime
             accessed = stats.st_atime
             
-            # Read magic bytes
-            with open(file_path, "rb") as f:
-                header = f.read(32)
-            
-            detected_type = get_file_type(header)
+            status, cached = None, None
+            if self.index:
+                with metrics.timer("index_lookup"):
+                    status, cached = self.index.lookup(file_path, stats)
+            if cached:
+                # Unchanged since the last indexed scan: no need to open the file
+                metrics.incr("index_hits")
+                detected_type = cached["extension_detected"]
+            else:
+                # Read magic bytes
+                with metrics.timer("open_read"):
+                    with open(file_path, "rb") as f:
+                        header = f.read(HEADER_SIZE)
+                with metrics.timer("signature_match"):
+                    detected_type = get_file_type(header)
+
+            hashes, fresh_hashes = None, None
+            if self.hash_algorithms:
+                hashes = cached["hashes"] if cached else {}
+                missing = [a for a in self.hash_algorithms if a not in hashes]
+                if missing:
+                    with metrics.timer("hash"):
+                        fresh_hashes = {**hashes, **hash_file(file_path, missing)}
+                    metrics.incr("bytes_hashed", file_size)
+                    hashes = fresh_hashes
+                hashes = {a: hashes[a] for a in self.hash_algorithms}
+
             extension = os.path.splitext(file_path)[1].lower().replace(".", "")
 
-            return {
-                "path": file_path,
-                "size": file_size,
-                "created": created,
-                "modified": modified,
-                "accessed": accessed,
-                "extension_claimed": extension,
-                "extension_detected": detected_type,
-                "suspicious": False
-            }
-        except PermissionError:
-            log.warning(f"Permission denied: {file_path}")
-            return None
-        except Exception:
+            file_info = FileRecord(file_path, file_size, created, modified, accessed, extension, detected_type)
+            if hashes is not None:
+                file_info["hashes"] = hashes
+                if self.known_hashes:
+                    with metrics.timer("hashset_lookup"):
+                        known = self.known_hashes.classify(hashes)
+                    if known:
+                        verdict, set_name = known
+                        file_info[f"known_{verdict}"] = set_name
+            if self.index:
+                file_info["index_status"] = status
+                # Unchanged entries only need their stored hashes rewritten if new ones were computed
+                self.index.stage(file_path, stats, status, detected_type, fresh_hashes)
+            return file_info
+        except Exception as e:
+            metrics.error("analyze", e)
+            if isinstance(e, PermissionError):
+                log.warning(f"Permission denied: {file_path}", per_file=True)
+            if self.index and not isinstance(e, FileNotFoundError):
+                # Still there, only unreadable: not a deletion
+                self.index.keep(file_path)
             return None
 
     def check_suspicious(self, file_info):
         """Checks for suspicious indicators."""
-        # Check for double extensions
-        if file_info["path"].count(".") > 1:
-             # loose check for double extension like .jpg.exe
-             parts = file_info["path"].lower().split(".")
-             if len(parts) >= 3:
-                 # Check if the second to last part is a common file extension
-                 known_exts = {"jpg", "jpeg", "png", "pdf", "docx", "txt", "zip"}
-                 if parts[-2] in known_exts and parts[-1] in {"exe", "bat", "ps1", "vbs"}:
-                     file_info["suspicious"] = True
-                     file_info["reason"] = "Double extension detected"
-                     self.suspicious_files.append(file_info)
-                     log.warning(f"[bold red]Suspicious file detecting (Double Extension): {file_info['path']}[/bold red]")
-
-        # Check for mismatched extensions
-        if file_info["extension_detected"] and file_info["extension_detected"] != file_info["extension_claimed"]:
-             # Verify it's not just a specificity issue (e.g. docx is a zip)
-             if file_info["extension_detected"] == "zip" and file_info["extension_claimed"] in ["docx", "xlsx", "pptx", "apk", "jar"]:
-                 pass # benign
-             else:
-                 file_info["suspicious"] = True
-                 file_info["reason"] = f"Extension Mismatch (Claimed: {file_info['extension_claimed']}, Detected: {file_info['extension_detected']})"
-                 self.suspicious_files.append(file_info)
-                 log.warning(f"[bold red]Suspicious file detected (Mismatch): {file_info['path']}[/bold red]")
+        # Location rules look at the path below the scan root only
+        relative_path = file_info["path"][len(self.target_dir):]
+        reasons = self.rules.evaluate(file_info, relative_path)
+        if reasons:
+            file_info["suspicious"] = True
+            file_info["reason"] = "; ".join(reasons)
+            file_info["reasons"] = reasons
+            log.warning(f"[bold red]Suspicious file detected ({file_info['reason']}): {file_info['path']}[/bold red]", per_file=True)
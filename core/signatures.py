@@ -1,4 +1,5 @@
 # Common file signatures (Magic Bytes)
+# A signature is either raw bytes expected at offset 0, or an (offset, bytes) pair.
 FILE_SIGNATURES = {
     "jpg": [b"\xFF\xD8\xFF"],
     "png": [b"\x89\x50\x4E\x47\x0D\x0A\x1A\x0A"],
@@ -8,14 +9,91 @@ FILE_SIGNATURES = {
     "exe": [b"\x4D\x5A"],
     "rar": [b"\x52\x61\x72\x21\x1A\x07\x00"],
     "mp3": [b"\x49\x44\x33"],
-    "mp4": [b"\x00\x00\x00\x18\x66\x74\x79\x70", b"\x00\x00\x00\x20\x66\x74\x79\x70"],
+    "mp4": [b"\x00\x00\x00\x18\x66\x74\x79\x70", b"\x00\x00\x00\x20\x66\x74\x79\x70", (4, b"ftypisom"), (4, b"ftypmp42")],
     "docx": [b"\x50\x4B\x03\x04\x14\x00\x06\x00"], # ZIP-based (Office Open XML)
+    "tar": [(257, b"ustar")],
 }
 
+# Trailers used to find where a carved file ends: ext -> (footer, bytes that follow it)
+FILE_FOOTERS = {
+    "jpg": (b"\xFF\xD9", 0),
+    "png": (b"\x49\x45\x4E\x44\xAE\x42\x60\x82", 0), # IEND chunk
+    "pdf": (b"\x25\x25\x45\x4F\x46", 0), # %%EOF
+    "gif": (b"\x00\x3B", 0),
+    "zip": (b"\x50\x4B\x05\x06", 18), # End of central directory record
+    "docx": (b"\x50\x4B\x05\x06", 18),
+}
+
+# Formats that are zip archives underneath
+ZIP_CONTAINERS = frozenset(("zip", "docx", "xlsx", "pptx", "odt", "ods", "odp", "epub",
+                            "apk", "jar", "war", "ear", "aar", "ipa", "xpi", "whl", "nupkg", "vsix"))
+
+# Claimed extensions that legitimately carry another type's signature:
+# aliases of the same format and formats built on another one.
+# The docx signature is only a zip local file header with particular version
+# and flag bytes, which any zip writer may produce, so it is a specialisation
+# of zip and accepts everything zip does.
+COMPATIBLE_TYPES = {
+    "zip": ZIP_CONTAINERS - {"zip"},
+    "docx": ZIP_CONTAINERS - {"docx"},
+    "jpg": {"jpeg", "jpe", "jfif", "jif"},
+    "mp4": {"m4a", "m4v", "m4b", "m4p", "mov", "3gp", "3g2", "f4v"}, # ISO base media file format
+    "exe": {"dll", "sys", "scr", "cpl", "ocx", "drv", "efi", "mui", "com"}, # Windows PE images
+    "pdf": {"ai"},
+    "rar": {"cbr"},
+}
+
+# Signatures that detect a more specific form of another type: a file
+# detected as one of these still counts as the general type when that is
+# what was requested (recover --type zip, carve --type zip).
+SPECIALISED_TYPES = {
+    "zip": frozenset(("docx",)),
+}
+
+class SignatureMatcher:
+    """Precompiled magic-byte matcher.
+
+    Signatures are grouped by offset and dispatched on their first byte, so a
+    lookup costs one dict probe per distinct offset instead of one comparison
+    per signature. The longest matching signature wins.
+    """
+
+    def __init__(self, signatures):
+        tables = {}
+        self.header_size = 0
+        for ext, sigs in signatures.items():
+            for sig in sigs:
+                offset, magic = sig if isinstance(sig, tuple) else (0, sig)
+                tables.setdefault(offset, {}).setdefault(magic[0], []).append((magic, ext))
+                self.header_size = max(self.header_size, offset + len(magic))
+
+        for table in tables.values():
+            for bucket in table.values():
+                bucket.sort(key=lambda item: len(item[0]), reverse=True)
+        self._tables = sorted(tables.items())
+
+    def match(self, header_bytes):
+        """Returns the extension of the longest signature found in the header."""
+        best, best_len = None, 0
+        for offset, table in self._tables:
+            if offset >= len(header_bytes):
+                break
+            bucket = table.get(header_bytes[offset])
+            if not bucket:
+                continue
+            for magic, ext in bucket:
+                if len(magic) <= best_len:
+                    break
+                if header_bytes.startswith(magic, offset):
+                    best, best_len = ext, len(magic)
+                    break
+        return best
+
+_matcher = SignatureMatcher(FILE_SIGNATURES)
+
+# Bytes a caller must read for every signature to be checkable
+HEADER_SIZE = _matcher.header_size
+
 def get_file_type(header_bytes):
     """Detects file type based on magic bytes."""
-    for ext, signatures in FILE_SIGNATURES.items():
-        for sig in signatures:
-            if header_bytes.startswith(sig):
-                return ext
-    return None
+    return _matcher.match(header_bytes)
@@ -1,47 +1,309 @@
+import csv
+import heapq
 import json
+import math
+import mmap
+import struct
+import tempfile
+from array import array
 from datetime import datetime
+from operator import itemgetter
+from core.report import ChunkedWriter, SQLiteReportWriter
 from utils.logger import log
+from utils.metrics import metrics
+
+EVENT_TYPES = ("CREATED", "MODIFIED", "ACCESSED")
+_EVENT_FIELDS = ("created", "modified", "accessed")
+
+# Events held in memory before a sorted run is spilled to disk
+DEFAULT_MEMORY_BUDGET = 2_000_000
+
+# On-disk layouts: a sorted event (timestamp, path id, type code) and a file entry header
+_EVENT = struct.Struct("<dIB")
+_FILE = struct.Struct("<QdddI")
+_RUN_READ_EVENTS = 65536
+# Events sorted as Python objects at once; larger buffers are sorted block by block and merged
+_SORT_BLOCK = 65536
+# Characters that would split a bodyfile field or line
+_BODYFILE_ESCAPES = str.maketrans({"|": "\\|", "\n": "\\n", "\r": "\\r"})
+
+def parse_timestamp(value):
+    """Parses an epoch number or an ISO-8601 date/time into an epoch timestamp."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+class PathTable:
+    """Append-only, file-backed table of per-file metadata.
+
+    Ids are insertion order; only an 8-byte offset per file stays in memory.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._offsets = array("Q")
+        self._end = 0
+        self._mm = None
+
+    def add(self, file_info):
+        path = file_info["path"].encode("utf-8", "surrogateescape")
+        entry = _FILE.pack(file_info["size"], file_info["created"], file_info["modified"],
+                           file_info["accessed"], len(path)) + path
+        self._offsets.append(self._end)
+        self._file.write(entry)
+        self._end += len(entry)
+        return len(self._offsets) - 1
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _view(self):
+        if self._mm is None:
+            self._file.flush()
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def get(self, path_id):
+        """Returns (path, size, created, modified, accessed) for a file id."""
+        mm = self._view()
+        offset = self._offsets[path_id]
+        size, created, modified, accessed, length = _FILE.unpack_from(mm, offset)
+        start = offset + _FILE.size
+        path = mm[start:start + length].decode("utf-8", "surrogateescape")
+        return path, size, created, modified, accessed
+
+    def path(self, path_id):
+        return self.get(path_id)[0]
+
+    def __iter__(self):
+        for path_id in range(len(self._offsets)):
+            yield self.get(path_id)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
 
 class TimelineGenerator:
-    def __init__(self, file_list):
+    """Builds a chronological timeline of file events in bounded memory.
+
+    Events are kept column-wise (timestamp, path id, type code) rather than
+    as dicts. Once `memory_budget` events are buffered they are sorted and
+    spilled to a temporary run file; iteration k-way merges the runs.
+    Timestamps are only formatted when exported. Events outside the
+    optional [since, until] window are dropped before they are stored.
+    """
+
+    def __init__(self, file_list=None, memory_budget=DEFAULT_MEMORY_BUDGET, since=None, until=None):
         self.file_list = file_list
-        self.timeline = []
+        self.memory_budget = memory_budget
+        self.since = since
+        self.until = until
+        self.paths = PathTable()
+        self.event_count = 0
+        self._timestamps = array("d")
+        self._path_ids = array("I")
+        self._types = array("B")
+        self._runs = []
+
+    def add(self, file_info):
+        """Adds the CREATED/MODIFIED/ACCESSED events of one scanned file."""
+        events = [(code, file_info[field]) for code, field in enumerate(_EVENT_FIELDS)]
+        if self.since is not None or self.until is not None:
+            events = [(code, timestamp) for code, timestamp in events if self._in_window(timestamp)]
+            if not events:
+                return
+
+        path_id = self.paths.add(file_info)
+        for code, timestamp in events:
+            self._timestamps.append(timestamp)
+            self._path_ids.append(path_id)
+            self._types.append(code)
+        self.event_count += len(events)
+
+        if len(self._timestamps) >= self.memory_budget:
+            self._spill()
+
+    def _in_window(self, timestamp):
+        if self.since is not None and timestamp < self.since:
+            return False
+        if self.until is not None and timestamp > self.until:
+            return False
+        return True
+
+    def _sorted_order(self):
+        """Yields buffer indices in timestamp order; stable, so equal timestamps keep insertion order.
+
+        Only _SORT_BLOCK events at a time are sorted as Python objects; each
+        sorted block is kept as an array of indices and the blocks are merged,
+        so peak memory stays close to the column arrays themselves.
+        """
+        timestamps = self._timestamps
+        count = len(timestamps)
+        blocks = [
+            array("q", sorted(range(start, min(start + _SORT_BLOCK, count)), key=timestamps.__getitem__))
+            for start in range(0, count, _SORT_BLOCK)
+        ]
+        if len(blocks) <= 1:
+            return iter(blocks[0] if blocks else ())
+        # Ties go to the earlier block, which keeps the order stable
+        return heapq.merge(*blocks, key=timestamps.__getitem__)
+
+    def _spill(self):
+        """Writes the buffered events to disk as one sorted run."""
+        run = tempfile.TemporaryFile()
+        pack = _EVENT.pack
+        timestamps, path_ids, types = self._timestamps, self._path_ids, self._types
+        block = bytearray()
+        for i in self._sorted_order():
+            block += pack(timestamps[i], path_ids[i], types[i])
+            if len(block) >= _EVENT.size * _RUN_READ_EVENTS:
+                run.write(block)
+                block.clear()
+        run.write(block)
+        run.seek(0)
+        self._runs.append(run)
+
+        self._timestamps = array("d")
+        self._path_ids = array("I")
+        self._types = array("B")
+
+    def _sort_buffer(self):
+        timestamps, path_ids, types = array("d"), array("I"), array("B")
+        for i in self._sorted_order():
+            timestamps.append(self._timestamps[i])
+            path_ids.append(self._path_ids[i])
+            types.append(self._types[i])
+        self._timestamps, self._path_ids, self._types = timestamps, path_ids, types
 
     def build(self):
         """Generates a chronological timeline of file events."""
         log.info("[bold cyan]Building timeline...[/bold cyan]")
-        
-        for file in self.file_list:
-            self.timeline.append({
-                "timestamp": file["created"],
-                "formatted_time": datetime.fromtimestamp(file["created"]).strftime('%Y-%m-%d %H:%M:%S'),
-                "type": "CREATED",
-                "file": file["path"]
-            })
-            self.timeline.append({
-                "timestamp": file["modified"],
-                "formatted_time": datetime.fromtimestamp(file["modified"]).strftime('%Y-%m-%d %H:%M:%S'),
-                "type": "MODIFIED",
-                "file": file["path"]
-            })
-            self.timeline.append({
-                "timestamp": file["accessed"],
-                "formatted_time": datetime.fromtimestamp(file["accessed"]).strftime('%Y-%m-%d %H:%M:%S'),
-                "type": "ACCESSED",
-                "file": file["path"]
-            })
-
-        # Sort by timestamp
-        self.timeline.sort(key=lambda x: x["timestamp"])
-        
-        log.info(f"[bold green]Timeline built with {len(self.timeline)} events.[/bold green]")
-        return self.timeline
-
-    def export_json(self, output_path):
-        """Exports the timeline to a JSON file."""
+
+        with metrics.timer("timeline_build"):
+            if self.file_list is not None:
+                for file in self.file_list:
+                    self.add(file)
+
+            # Sort by timestamp
+            self._sort_buffer()
+
+        spilled = f" ({len(self._runs)} runs spilled to disk)" if self._runs else ""
+        log.info(f"[bold green]Timeline built with {self.event_count} events{spilled}.[/bold green]")
+        return self.event_count
+
+    def _read_run(self, run):
+        run.seek(0)
+        while True:
+            block = run.read(_EVENT.size * _RUN_READ_EVENTS)
+            if not block:
+                return
+            yield from _EVENT.iter_unpack(block)
+
+    def __len__(self):
+        return self.event_count
+
+    def __iter__(self):
+        """Yields (timestamp, path_id, type_code) in chronological order."""
+        in_memory = zip(self._timestamps, self._path_ids, self._types)
+        if not self._runs:
+            return iter(in_memory)
+        # The buffer holds the newest events, so it goes last to keep the merge stable
+        return heapq.merge(*(self._read_run(run) for run in self._runs), in_memory, key=itemgetter(0))
+
+    def iter_events(self):
+        """Yields timeline events as dicts, formatting timestamps on the fly."""
+        last_second, formatted = None, None
+        for timestamp, path_id, code in self:
+            # Sorted input: consecutive events often share a second, so reuse its string
+            second = math.floor(timestamp)
+            if second != last_second:
+                last_second = second
+                formatted = datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+            yield {
+                "timestamp": timestamp,
+                "formatted_time": formatted,
+                "type": EVENT_TYPES[code],
+                "file": self.paths.path(path_id)
+            }
+
+    def _export(self, output_path, write, text=True):
         try:
-            with open(output_path, "w") as f:
-                json.dump(self.timeline, f, indent=4)
+            with metrics.timer("timeline_export"):
+                if text:
+                    # Written in chunks on a background thread; surrogateescape keeps undecodable file names byte-exact
+                    with ChunkedWriter(output_path, newline="", errors="surrogateescape") as f:
+                        write(f)
+                else:
+                    write(output_path)
             log.info(f"[bold green]Timeline exported to {output_path}[/bold green]")
         except Exception as e:
+            metrics.error("timeline_export", e)
             log.error(f"Failed to export timeline: {e}")
+
+    def export_json(self, output_path, pretty=False):
+        """Exports the timeline to a JSON file, one event per line unless `pretty`."""
+        def write(f):
+            f.write("[")
+            for n, event in enumerate(self.iter_events()):
+                if pretty:
+                    f.write(",\n    " if n else "\n    ")
+                    f.write(json.dumps(event, indent=4).replace("\n", "\n    "))
+                else:
+                    f.write(",\n" if n else "\n")
+                    f.write(json.dumps(event, separators=(",", ":")))
+            f.write("\n]" if self.event_count else "]")
+            if not pretty:
+                f.write("\n")
+        self._export(output_path, write)
+
+    def export_ndjson(self, output_path):
+        """Exports the timeline as one JSON event per line."""
+        def write(f):
+            for event in self.iter_events():
+                f.write(json.dumps(event))
+                f.write("\n")
+        self._export(output_path, write)
+
+    def export_csv(self, output_path):
+        """Exports the timeline as CSV rows."""
+        def write(f):
+            writer = csv.writer(f)
+            writer.writerow(("timestamp", "formatted_time", "type", "file"))
+            for event in self.iter_events():
+                writer.writerow((event["timestamp"], event["formatted_time"], event["type"], event["file"]))
+        self._export(output_path, write)
+
+    def export_sqlite(self, output_path):
+        """Exports the timeline to an SQLite report database, in its indexed `events` table."""
+        def write(path):
+            with SQLiteReportWriter(path) as db:
+                db.write_events(self.iter_events())
+                db.write_value("event_count", self.event_count)
+        self._export(output_path, write, text=False)
+
+    def export_bodyfile(self, output_path):
+        """Exports a Sleuth Kit bodyfile (TSK 3.x) for use with mactime.
+
+        One line per file: MD5|name|inode|mode|UID|GID|size|atime|mtime|ctime|crtime.
+        Fields the scanner does not collect are written as 0, and so are
+        times outside the [since, until] window, which the other formats
+        drop. A "|" in a name is written as "\\|" and line breaks as "\\n",
+        so every line keeps its fields.
+        """
+        def time_field(timestamp):
+            return int(timestamp) if self._in_window(timestamp) else 0
+
+        def write(f):
+            for path, size, created, modified, accessed in self.paths:
+                f.write(f"0|{path.translate(_BODYFILE_ESCAPES)}|0|0|0|0|{size}|"
+                        f"{time_field(accessed)}|{time_field(modified)}|{time_field(created)}|0\n")
+        self._export(output_path, write)
+
+    def close(self):
+        """Removes the temporary run and path files."""
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self.paths.close()
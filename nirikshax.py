@@ -1,23 +1,44 @@
 import argparse
+import importlib
 import sys
-import json
-import os
-import time
-from datetime import datetime
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskID
-from rich.layout import Layout
-from rich.live import Live
-
-from core.scanner import Scanner
-from core.recovery import RecoveryEngine
-from core.timeline import TimelineGenerator
-from artifacts.system_info import get_system_info
-from artifacts.recent_files import RecentFilesScanner
-from artifacts.browser_history import BrowserHistoryExtractor
-from utils.logger import log, console
+
+# Only modules needed to build the argument parser are imported here. Each
+# command imports its own dependencies (rich, the scanner, the collectors),
+# so `--help` and scripted runs don't pay for subsystems they never use.
+from core.entropy import DEFAULT_SAMPLE_BUDGET
+
+# Digests hash sets can hold (the keys of core.hashsets.DIGEST_SIZES), spelled
+# out so building the parser does not import the hash-set module
+HASHSET_ALGORITHMS = ("md5", "sha1", "sha256")
+
+# Suspicious files listed in the on-screen table; the report has all of them
+SUSPICIOUS_DISPLAY_LIMIT = 100
+
+# Outputs a triage run can produce from its single scan
+TRIAGE_OUTPUTS = ("scan", "timeline", "recover")
+
+# Where recovered files are written
+RECOVERY_DIR = "output/recovered"
+
+# Default output file per timeline export format
+TIMELINE_OUTPUTS = {
+    "json": "timeline.json",
+    "ndjson": "timeline.ndjson",
+    "csv": "timeline.csv",
+    "bodyfile": "timeline.body",
+    "sqlite": "timeline.db"
+}
+
+def lazy(module, name):
+    """An argparse type that imports module.name only when the option is given."""
+    def convert(value):
+        try:
+            return getattr(importlib.import_module(module), name)(value)
+        except ValueError as e:
+            # argparse drops a ValueError's message; this keeps the reason in the usage error
+            raise argparse.ArgumentTypeError(str(e))
+    convert.__name__ = name # argparse names the type in "invalid ... value" errors
+    return convert
 
 def print_banner():
     banner_text = """
@@ -47,196 +68,705 @@ def print_banner():
     [bold white]          NirikshaX — Digital Forensic Recovery & Investigation Toolkit[/bold white]
     [dim]                  v1.0.0 | Author: NirikshaX Team[/dim]
     """
+    from utils.logger import console
+
     console.print(banner_text, justify="center")
     console.print("[bold red][!] AUTHORIZED USE ONLY. OBSERVE & REPORT.[/bold red]", justify="center")
     console.print()
 
-def cmd_scan(args):
-    """Handles the scan command with professional UI."""
-    log.info(f"Target: [bold white]{args.target}[/bold white]")
-    log.info("Initializing scanning engine...")
-    
-    scanner = Scanner(args.target)
-    
-    # Live scan progress
-    with Progress(
-        SpinnerColumn(style="bold cyan"),
-        TextColumn("[bold cyan]{task.description}"),
-        BarColumn(bar_width=None, style="dim white"),
-        TextColumn("[bold green]{task.fields[last_file]}"),
-        console=console
-    ) as progress:
-        task = progress.add_task("[cyan]Scanning filesystem...", total=None, last_file="")
+def open_index(args):
+    """Opens the persistent scan index requested with --index, if any."""
+    if not args.index:
+        return None
+    import os
+    from core.index import ScanIndex
+    from utils.logger import log
+
+    if os.path.exists(args.index):
+        log.info(f"Using scan index [bold white]{args.index}[/bold white]")
+    else:
+        log.info(f"Creating scan index [bold white]{args.index}[/bold white]")
+    return ScanIndex(args.index, args.target)
+
+def open_known_hashes(args):
+    """Opens the hash sets given with --known-good / --known-bad, if any."""
+    if not args.known_good and not args.known_bad:
+        return None
+    from core.hashsets import KnownHashes
+    from utils.logger import log
+
+    known = KnownHashes(good=args.known_good or (), bad=args.known_bad or ())
+    for verdict, sets in (("known-good", known.good), ("known-bad", known.bad)):
+        for hash_set in sets:
+            log.info(f"Loaded {verdict} set [bold white]{hash_set.name}[/bold white] ({len(hash_set):,} {hash_set.algorithm} hashes)")
+    return known
+
+def report_known_hashes(scanner):
+    from utils.logger import log
+
+    if scanner.known_hashes and scanner.known_hashes.good:
+        log.info(f"Excluded {scanner.known_good_excluded} known-good files")
+
+def report_index_changes(index):
+    from utils.logger import log
+
+    changes = index.changes
+    log.info(
+        f"Index: {changes['added']} added, {changes['modified']} modified, "
+        f"{changes['deleted']} deleted, {changes['unchanged']} unchanged"
+        + (f", {changes['error']} unreadable (kept)" if changes["error"] else "")
+    )
+
+def open_scanner(args):
+    """Builds the Scanner (plus its index and hash sets) from scan options."""
+    from core.rules import load_rules
+    from core.scanner import Scanner
+
+    index = open_index(args)
+    known = open_known_hashes(args)
+    rules = load_rules(args.rules)
+    entropy_budget = args.entropy_budget if args.entropy else None
+    scanner = Scanner(args.target, workers=args.workers, index=index, hash_algorithms=args.hash, rules=rules,
+                      entropy_budget=entropy_budget, entropy_workers=args.entropy_workers, known_hashes=known)
+    return scanner, index, known
+
+class ScanReport:
+    """Streams scan records to the report file and keeps what the summary table shows."""
+
+    def __init__(self, args):
+        from collections import deque
+        from datetime import datetime
+        from core.report import JSONReportWriter, NDJSONReportWriter, SQLiteReportWriter
+
+        self.args = args
+        # Records are streamed to disk as they are analyzed; only what the
+        # summary table shows is kept in memory.
+        header = {"timestamp": str(datetime.now()), "scan_target": args.target}
+        if args.format == "ndjson":
+            self.report_file = "scan_report.ndjson"
+            self.writer = NDJSONReportWriter(self.report_file)
+        elif args.format == "sqlite":
+            self.report_file = "scan_report.db"
+            self.writer = SQLiteReportWriter(self.report_file)
+            for key, value in header.items():
+                self.writer.write_value(key, value)
+        else:
+            self.report_file = "scan_report.json"
+            self.writer = JSONReportWriter(self.report_file, header, pretty=args.pretty)
+        self.suspicious_rows = []
+        self.recent_rows = deque(maxlen=10)
+
+    def add(self, file_info):
+        self.writer.write(file_info)
+        if file_info["suspicious"]:
+            if len(self.suspicious_rows) < SUSPICIOUS_DISPLAY_LIMIT:
+                self.suspicious_rows.append(file_info)
+        else:
+            self.recent_rows.append(file_info)
+
+    def close(self, scanner, index, known):
+        trailer = {}
+        if index:
+            trailer["index_changes"] = index.changes
+            trailer["deleted_files"] = index.deleted_files
+        if known:
+            trailer["known_good_excluded"] = scanner.known_good_excluded
+        if self.args.format == "json":
+            self.writer.trailer.update(trailer)
+        elif self.args.format == "sqlite":
+            trailer["files_found"] = scanner.files_scanned
+            trailer["suspicious_count"] = scanner.suspicious_count
+            for key, value in trailer.items():
+                self.writer.write_value(key, value)
+        self.writer.close()
+
+    def show(self, scanner, index):
+        """Prints the results table and summary, and writes the NDJSON summary file.
+
+        Returns the run summary reported in machine mode.
+        """
+        import os
+        from datetime import datetime
+        from rich.table import Table
+        from core.report import write_summary
+        from utils.logger import console, log
+
+        console.print()
         
-        def update_progress(file_info):
-            progress.update(task, last_file=os.path.basename(file_info["path"])[:30])
+        # Display summary table
+        table = Table(title="SCAN RESULTS", title_style="bold cyan", border_style="dim white", show_lines=False)
+        table.add_column("Filename", style="bold white")
+        table.add_column("Type", style="cyan")
+        table.add_column("Path", style="dim white")
+        table.add_column("Status", style="bold red")
         
-        # Run scan
-        results = scanner.scan(progress_callback=update_progress)
-        progress.update(task, description="[bold green]Scan Complete[/bold green]", last_file=f"{len(results)} files found")
-
-    console.print() 
-    
-    # Display summary table
-    table = Table(title="SCAN RESULTS", title_style="bold cyan", border_style="dim white", show_lines=False)
-    table.add_column("Filename", style="bold white")
-    table.add_column("Type", style="cyan")
-    table.add_column("Path", style="dim white")
-    table.add_column("Status", style="bold red")
-    
-    suspicious_count = 0
-    for item in results:
-        if item["suspicious"]:
-            suspicious_count += 1
+        for item in self.suspicious_rows:
             table.add_row(
                 os.path.basename(item["path"]), 
                 item["extension_detected"] or "Unknown", 
                 item["path"][-50:], # Truncate path for display
                 "[!] SUSPICIOUS"
             )
-            
-    # If no suspicious files, show last 10 normal files
-    if suspicious_count == 0:
-        for item in results[-10:]:
-             table.add_row(
-                os.path.basename(item["path"]), 
-                item["extension_detected"] or "Unknown", 
-                item["path"][-50:], 
-                "[✓] OK"
-            )
+                
+        # If no suspicious files, show last 10 normal files
+        if not self.suspicious_rows:
+            for item in self.recent_rows:
+                 table.add_row(
+                    os.path.basename(item["path"]), 
+                    item["extension_detected"] or "Unknown", 
+                    item["path"][-50:], 
+                    "[✓] OK"
+                )
 
-    console.print(table)
-    
-    if suspicious_count > 0:
-        log.warning(f"Detected {suspicious_count} suspicious artifacts!")
-    else:
-        log.success("No suspicious artifacts detected in sample view.")
+        console.print(table)
+        
+        suspicious_count = scanner.suspicious_count
+        result = {"report": self.report_file, "files_found": scanner.files_scanned, "suspicious_count": suspicious_count}
+        if index:
+            result["index_changes"] = index.changes
+        if scanner.known_hashes:
+            result["known_good_excluded"] = scanner.known_good_excluded
+        if scanner.walk_errors:
+            result["walk_errors"] = scanner.walk_errors
+            log.warning(f"{scanner.walk_errors} directories could not be read; files below them were not scanned.")
+        if suspicious_count > len(self.suspicious_rows):
+            log.info(f"Showing first {len(self.suspicious_rows)} suspicious files; see the report for the rest.")
+        if index:
+            report_index_changes(index)
+        report_known_hashes(scanner)
+        if suspicious_count > 0:
+            log.warning(f"Detected {suspicious_count} suspicious artifacts!")
+        else:
+            log.success("No suspicious artifacts detected in sample view.")
 
-    # Save report
-    report_file = "scan_report.json"
-    report = {
-        "timestamp": str(datetime.now()),
-        "scan_target": args.target,
-        "files_found": len(results),
-        "suspicious_files": [f for f in results if f["suspicious"]],
-        "all_files": results
-    }
+        if self.args.format == "ndjson":
+            # Summary built from running counters; the records live in the NDJSON file
+            summary = {
+                "timestamp": str(datetime.now()),
+                "scan_target": self.args.target,
+                "files_found": scanner.files_scanned,
+                "suspicious_count": suspicious_count,
+                "records": self.report_file
+            }
+            if index:
+                summary["index_changes"] = index.changes
+                summary["deleted_files"] = index.deleted_files
+            if scanner.known_hashes:
+                summary["known_good_excluded"] = scanner.known_good_excluded
+            write_summary("scan_report.json", summary)
+            result["summary"] = "scan_report.json"
+            log.success(f"Records streamed to [bold white]{self.report_file}[/bold white], summary saved to [bold white]scan_report.json[/bold white]")
+        elif self.args.format == "sqlite":
+            log.success(f"Report database saved to [bold white]{self.report_file}[/bold white] (tables: files, meta; view: suspicious_files)")
+        else:
+            log.success(f"Full report saved to [bold white]{self.report_file}[/bold white]")
+        return result
+
+def cmd_scan(args):
+    """Handles the scan command with professional UI."""
+    from utils.logger import log
+    from utils.progress import ScanProgress
+
+    log.info(f"Target: [bold white]{args.target}[/bold white]")
+    log.info("Initializing scanning engine...")
     
-    with open(report_file, "w") as f:
-        json.dump(report, f, indent=4)
-    log.success(f"Full report saved to [bold white]{report_file}[/bold white]")
+    scanner, index, known = open_scanner(args)
+    report = ScanReport(args)
+    
+    # Live scan progress; per-file warnings go through the buffered log sink
+    with log.buffered(), ScanProgress("[cyan]Scanning filesystem...") as progress:
+        # Run scan
+        try:
+            for file_info in scanner.iter_scan(progress_callback=progress.advance):
+                report.add(file_info)
+        finally:
+            report.close(scanner, index, known)
+        progress.finish("[bold green]Scan Complete[/bold green]", last_file=f"{scanner.files_scanned} files found")
+
+    result = report.show(scanner, index)
+    # Closed after the summary, which streams the index's deleted paths
+    if index:
+        index.close()
+    if known:
+        known.close()
+    return result
 
 def cmd_recover(args):
     """Handles the recover command."""
+    from core.recovery import RecoveryEngine
+    from core.scanner import Scanner
+    from utils.logger import log
+
     log.info(f"Target: [bold white]{args.target}[/bold white]")
     log.info("Scanning for recoverable files...")
     
-    scanner = Scanner(args.target)
-    results = scanner.scan()
+    index = open_index(args)
+    known = open_known_hashes(args)
+    scanner = Scanner(args.target, workers=args.workers, index=index, hash_algorithms=args.hash, known_hashes=known)
+    with log.buffered():
+        results = scanner.scan()
+    if index:
+        index.close()
+        report_index_changes(index)
+    if known:
+        known.close()
+        report_known_hashes(scanner)
     
-    recovery = RecoveryEngine("output/recovered")
+    recovery = RecoveryEngine(RECOVERY_DIR, workers=args.workers, dedup=args.dedup, container=args.container)
     extensions = args.type.split(",") if args.type else None
     
     log.info(f"Recovery Filter: {extensions if extensions else 'ALL'}")
     
-    count = recovery.recover_files(results, extensions=extensions)
-    
+    with log.buffered():
+        count = recovery.recover_files(results, extensions=extensions)
+    return report_recovery(recovery, count)
+
+def report_recovery(recovery, count):
+    from utils.logger import log
+
+    if recovery.duplicates:
+        stored_in = "the container" if recovery.container else "manifest.ndjson"
+        log.info(f"{recovery.duplicates} files had duplicate content and were stored once (see {stored_in})")
     if count > 0:
-        log.success(f"Successfully recovered {count} files to [bold white]output/recovered[/bold white]")
+        log.success(f"Successfully recovered {count} files to [bold white]{recovery.container or RECOVERY_DIR}[/bold white]")
     else:
         log.warning("No matching files found to recover.")
+    return {"recovered": count, "duplicates": recovery.duplicates, "output": recovery.container or RECOVERY_DIR}
+
+def cmd_extract(args):
+    """Handles the extract command."""
+    from rich.table import Table
+    from core.container import CODEC_NAMES, ContainerReader, extraction_path
+    from utils.logger import console, log
+
+    with ContainerReader(args.container) as container:
+        if not container.complete:
+            log.warning(f"{args.container} was not closed cleanly; only files recovered from its journal are available.")
+        entries = container.entries
+        if args.path or args.sha256:
+            paths, digests = set(args.path or ()), set(args.sha256 or ())
+            entries = [e for e in entries if e["path"] in paths or e["sha256"] in digests]
+
+        if args.list:
+            table = Table(title="CONTAINER CONTENTS", title_style="bold cyan", border_style="dim white")
+            table.add_column("Path", style="bold white")
+            table.add_column("Size", style="cyan", justify="right")
+            table.add_column("SHA-256", style="dim white")
+            for entry in entries:
+                table.add_row(entry["path"], f"{entry['size']:,}", entry["sha256"])
+            console.print(table)
+            log.info(f"{len(entries)} of {len(container.entries)} entries, {len(container.chunks)} {CODEC_NAMES[container.codec]} chunks")
+            return {"entries": len(entries), "total_entries": len(container.entries)}
+
+        with log.buffered():
+            for entry in entries:
+                dest = container.extract(entry, extraction_path(args.output, entry["path"]))
+                log.info(f"Extracted: {dest}", per_file=True)
+    if entries:
+        log.success(f"Extracted {len(entries)} files to [bold white]{args.output}[/bold white]")
+    else:
+        log.warning("No matching entries in the container.")
+    return {"extracted": len(entries), "output": args.output}
+
+def cmd_carve(args):
+    """Handles the carve command."""
+    import json
+    from datetime import datetime
+    from core.carver import Carver
+    from utils.logger import log
+
+    log.info(f"Image: [bold white]{args.image}[/bold white]")
+    
+    types = args.type.split(",") if args.type else None
+    carver = Carver(args.image, args.output, types=types, workers=args.workers,
+                    max_size=args.max_size * 1024 * 1024)
+    carved = carver.carve()
+    
+    log.info(f"Searched {carver.bytes_scanned / 1e9:.2f} GB in {carver.elapsed:.2f}s ({carver.throughput:.2f} GB/s)")
+    
+    report = {
+        "timestamp": str(datetime.now()),
+        "image": args.image,
+        "bytes_scanned": carver.bytes_scanned,
+        "elapsed_seconds": carver.elapsed,
+        "files_carved": len(carved),
+        "carved_files": carved
+    }
+    with open("carve_report.json", "w") as f:
+        json.dump(report, f, indent=4)
+    
+    if carved:
+        log.success(f"Carved {len(carved)} files to [bold white]{args.output}[/bold white]")
+    else:
+        log.warning("No carvable files found in image.")
+    return {"report": "carve_report.json", "files_carved": len(carved), "bytes_scanned": carver.bytes_scanned, "output": args.output}
 
 def cmd_artifacts(args):
     """Handles the artifacts command."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.table import Table
+    from artifacts.collectors import COLLECTORS, run_collectors
+    from core.report import JSONDocumentWriter, SQLiteReportWriter
+    from utils.logger import console, log
+
     log.info("Engaging Artifact Collection Module...")
+
+    names = args.collectors or list(COLLECTORS)
+    collectors = [COLLECTORS[name].from_args(args) for name in names]
+    if args.timeout:
+        for collector in collectors:
+            collector.timeout = args.timeout
     
+    if args.format == "sqlite":
+        report_file = "artifacts_report.db"
+        writer = SQLiteReportWriter(report_file)
+    else:
+        report_file = "artifacts_report.json"
+        writer = JSONDocumentWriter(report_file, pretty=args.pretty)
+
+    # Every collector runs at once; each result is written as soon as it is ready
     with Progress(
         SpinnerColumn(),
         TextColumn("[bold cyan]{task.description}"),
-        console=console
-    ) as progress:
-        task1 = progress.add_task("[cyan]Collecting System Info...", total=None)
-        sys_info = get_system_info()
-        progress.update(task1, completed=True, description="[green]System Info Collected[/green]")
-        
-        task2 = progress.add_task("[cyan]Scanning Recent Files...", total=None)
-        recent = RecentFilesScanner().scan_recent(days=3)
-        progress.update(task2, completed=True, description="[green]Recent Files Scanned[/green]")
-        
-        task3 = progress.add_task("[cyan]Extracting Browser History...", total=None)
-        history = BrowserHistoryExtractor().get_chrome_history()
-        progress.update(task3, completed=True, description="[green]Browser History Extracted[/green]")
+        console=console,
+        # Same rule as ScanProgress: nothing is rendered in quiet mode or off a terminal
+        disable=log.quiet or not console.is_terminal
+    ) as progress, writer as report:
+        tasks = {c.name: progress.add_task(f"[cyan]Collecting {c.title}...", total=None) for c in collectors}
+
+        def on_finish(result):
+            collector = result.collector
+            if result.status == "ok":
+                items = f" ({result.items} items)" if result.items is not None else ""
+                description = f"[green]{collector.title} Collected{items} in {result.elapsed:.1f}s[/green]"
+            else:
+                description = f"[red]{collector.title}: {result.error}[/red]"
+            progress.update(tasks[collector.name], completed=True, description=description)
+
+        results = run_collectors(collectors, report, on_finish)
+        report.write_value("collectors", {r.collector.name: r.summary() for r in results})
 
     # Display System Info
-    console.print()
-    sys_table = Table(title="SYSTEM INTELLIGENCE", border_style="dim white", show_header=False)
-    for key, val in sys_info.items():
-        sys_table.add_row(f"[bold cyan]{key.upper()}[/bold cyan]", str(val))
-    console.print(sys_table)
+    sys_info = next((r.value for r in results if r.collector.name == "system_info" and r.status == "ok"), None)
+    if sys_info:
+        console.print()
+        sys_table = Table(title="SYSTEM INTELLIGENCE", border_style="dim white", show_header=False)
+        for key, val in sys_info.items():
+            sys_table.add_row(f"[bold cyan]{key.upper()}[/bold cyan]", str(val))
+        console.print(sys_table)
 
-    report = {
-        "system_info": sys_info,
-        "recent_files": recent,
-        "browser_history": history
-    }
-    
-    with open("artifacts_report.json", "w") as f:
-        json.dump(report, f, indent=4)
-    log.success("Artifacts report saved to [bold white]artifacts_report.json[/bold white]")
+    for result in results:
+        if result.status != "ok":
+            log.warning(f"Collector {result.collector.name} failed: {result.error}")
+    log.success(f"Artifacts report saved to [bold white]{report_file}[/bold white]")
+    return {"report": report_file, "collectors": {r.collector.name: r.summary() for r in results}}
+
+def export_timeline(timeline_gen, fmt, output_file, pretty):
+    if fmt == "json":
+        timeline_gen.export_json(output_file, pretty=pretty)
+    else:
+        getattr(timeline_gen, f"export_{fmt}")(output_file)
 
 def cmd_timeline(args):
     """Handles the timeline command."""
+    from core.scanner import Scanner
+    from core.timeline import DEFAULT_MEMORY_BUDGET, TimelineGenerator
+    from utils.logger import log
+
     log.info(f"Building timeline for: {args.target}")
     
-    scanner = Scanner(args.target)
-    results = scanner.scan()
+    index = open_index(args)
+    known = open_known_hashes(args)
+    scanner = Scanner(args.target, index=index, known_hashes=known)
+    
+    # Records stream straight into the columnar timeline; nothing is retained
+    timeline_gen = TimelineGenerator(scanner.iter_scan(), memory_budget=args.memory_budget or DEFAULT_MEMORY_BUDGET,
+                                     since=args.since, until=args.until)
+    with log.buffered():
+        timeline_gen.build()
+    if index:
+        index.close()
+        report_index_changes(index)
+    if known:
+        known.close()
+        report_known_hashes(scanner)
     
-    timeline_gen = TimelineGenerator(results)
-    timeline_gen.build()
-    timeline_gen.export_json("timeline.json")
+    output_file = args.output or TIMELINE_OUTPUTS[args.format]
+    export_timeline(timeline_gen, args.format, output_file, args.pretty)
+    timeline_gen.close()
     
-    log.success("Timeline generated and saved to [bold white]timeline.json[/bold white]")
+    log.success(f"Timeline generated and saved to [bold white]{output_file}[/bold white]")
+    return {"output": output_file, "events": timeline_gen.event_count}
+
+def parse_outputs(spec):
+    """Turns 'scan,recover' into a tuple of validated triage outputs."""
+    outputs = tuple(dict.fromkeys(o.strip().lower() for o in spec.split(",") if o.strip()))
+    for output in outputs:
+        if output not in TRIAGE_OUTPUTS:
+            raise ValueError(f"Unknown triage output: {output}")
+    return outputs
+
+def cmd_triage(args):
+    """Handles the triage command: one traversal feeds every requested output."""
+    from core.pipeline import Pipeline
+    from core.recovery import RecoveryEngine
+    from core.timeline import DEFAULT_MEMORY_BUDGET, TimelineGenerator
+    from utils.logger import log
+    from utils.progress import ScanProgress
+
+    log.info(f"Target: [bold white]{args.target}[/bold white]")
+    log.info(f"Triage outputs: {', '.join(args.outputs)}")
+
+    scanner, index, known = open_scanner(args)
+    pipeline = Pipeline(scanner)
+
+    report = None
+    if "scan" in args.outputs:
+        report = ScanReport(args)
+        pipeline.add("report", report.add)
+
+    timeline_gen = None
+    if "timeline" in args.outputs:
+        timeline_gen = TimelineGenerator(memory_budget=args.memory_budget or DEFAULT_MEMORY_BUDGET,
+                                         since=args.since, until=args.until)
+        pipeline.add("timeline", timeline_gen.add)
+
+    recovery = None
+    if "recover" in args.outputs:
+        recovery = RecoveryEngine(RECOVERY_DIR, workers=args.workers, dedup=args.dedup, container=args.container)
+        extensions = args.type.split(",") if args.type else None
+        log.info(f"Recovery Filter: {extensions if extensions else 'ALL'}{' (suspicious only)' if args.suspicious_only else ''}")
+        # Recovery pulls records from the scan on its own thread, copying as files are found
+        pipeline.add_consumer("recover", lambda records: recovery.recover_files(records, extensions=extensions),
+                              where=(lambda file_info: file_info["suspicious"]) if args.suspicious_only else None)
+
+    with log.buffered(), ScanProgress("[cyan]Triaging filesystem...") as progress:
+        try:
+            pipeline.run(progress_callback=progress.advance)
+        finally:
+            if report:
+                report.close(scanner, index, known)
+        progress.finish("[bold green]Triage Complete[/bold green]", last_file=f"{scanner.files_scanned} files found")
+
+        if timeline_gen:
+            timeline_gen.build()
+
+    result = {"files_found": scanner.files_scanned, "suspicious_count": scanner.suspicious_count}
+    if report:
+        result["scan"] = report.show(scanner, index)
+    else:
+        if index:
+            report_index_changes(index)
+        report_known_hashes(scanner)
+    if index:
+        index.close()
+    if known:
+        known.close()
+
+    if timeline_gen:
+        output_file = args.timeline_output or TIMELINE_OUTPUTS[args.timeline_format]
+        export_timeline(timeline_gen, args.timeline_format, output_file, args.pretty)
+        timeline_gen.close()
+        log.success(f"Timeline generated and saved to [bold white]{output_file}[/bold white]")
+        result["timeline"] = {"output": output_file, "events": timeline_gen.event_count}
+
+    if recovery:
+        result["recover"] = report_recovery(recovery, pipeline.results["recover"])
+    return result
+
+def cmd_hashset(args):
+    """Handles the hashset command."""
+    import time
+    from core.hashsets import DEFAULT_BUILD_BUDGET, build_hashset
+    from utils.logger import log
+
+    log.info(f"Compiling {len(args.inputs)} hash list(s) into [bold white]{args.output}[/bold white]...")
+    start = time.perf_counter()
+    count = build_hashset(args.inputs, args.output, algorithm=args.algorithm,
+                          memory_budget=args.memory_budget or DEFAULT_BUILD_BUDGET)
+    log.success(f"Wrote {count:,} distinct hashes to [bold white]{args.output}[/bold white] in {time.perf_counter() - start:.1f}s")
+    return {"output": args.output, "hashes": count}
 
 def main():
-    print_banner()
-    
     parser = argparse.ArgumentParser(description="NirikshaX - Digital Forensic Tool")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
+    # Instrumentation options shared by every subcommand
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--profile", nargs="?", const="nirikshax.pstats", metavar="PATH",
+                        help="Capture a cProfile of the main thread (default: nirikshax.pstats)")
+    common.add_argument("--quiet", action="store_true", help="No progress display and no per-file log lines")
+    common.add_argument("--metrics-out", metavar="PATH", help="Write stage counters, latency histograms and error counts as JSON")
+    common.add_argument("--no-banner", action="store_true", help="Skip the start-up banner")
+    common.add_argument("--machine", action="store_true",
+                        help="Batch mode: no banner, quiet, uncoloured log on stderr and a one-line JSON result on stdout")
+
+    # Known-file hash set options shared by scan, recover and timeline
+    known = argparse.ArgumentParser(add_help=False)
+    known.add_argument("--known-good", action="append", metavar="HASHSET", help="Exclude files listed in this compiled hash set (repeatable)")
+    known.add_argument("--known-bad", action="append", metavar="HASHSET", help="Flag files listed in this compiled hash set (repeatable)")
+
+    # Scanner options shared by scan and triage
+    scan_options = argparse.ArgumentParser(add_help=False, parents=[known])
+    scan_options.add_argument("target", help="Directory to scan")
+    scan_options.add_argument("--workers", type=int, default=1, help="Parallel header-read workers (default: 1, serial)")
+    scan_options.add_argument("--index", help="Persistent scan index (SQLite); only new or changed files are re-read")
+    scan_options.add_argument("--hash", type=lazy("utils.hashing", "parse_algorithms"), default=(), help="Comma-separated digests to compute in one pass (e.g. sha256,md5,sha1)")
+    scan_options.add_argument("--rules", help="Suspicious-file rules (JSON); default: config/suspicious_rules.json")
+    scan_options.add_argument("--format", choices=["json", "ndjson", "sqlite"], default="json",
+                              help="Scan report format; ndjson streams one record per line, sqlite writes an indexed report database")
+    scan_options.add_argument("--pretty", action="store_true", help="Indent JSON reports for reading (default: compact, one record per line)")
+    scan_options.add_argument("--entropy", action="store_true", help="Sample file contents for entropy and flag unexpectedly high-entropy files")
+    scan_options.add_argument("--entropy-budget", type=int, default=DEFAULT_SAMPLE_BUDGET, metavar="BYTES",
+                              help=f"Bytes sampled per file from head, middle and tail (default: {DEFAULT_SAMPLE_BUDGET})")
+    scan_options.add_argument("--entropy-workers", type=int, help="Entropy processes (default: CPU count)")
+
     # Scan Command
-    scan_parser = subparsers.add_parser("scan", help="Scan a directory")
-    scan_parser.add_argument("target", help="Directory to scan")
+    subparsers.add_parser("scan", help="Scan a directory", parents=[common, scan_options])
 
     # Recover Command
-    recover_parser = subparsers.add_parser("recover", help="Recover files")
+    recover_parser = subparsers.add_parser("recover", help="Recover files", parents=[common, known])
     recover_parser.add_argument("target", help="Source directory")
     recover_parser.add_argument("--type", help="Comma-separated file extensions to recover (e.g. jpg,pdf)")
+    recover_parser.add_argument("--workers", type=int, default=1, help="Parallel scan, hash and copy workers (default: 1, serial)")
+    recover_parser.add_argument("--dedup", action="store_true", help="Store identical content once and write a source-to-blob manifest")
+    recover_parser.add_argument("--hash", type=lazy("utils.hashing", "parse_algorithms"), default=(), help="Comma-separated digests to compute in one pass (e.g. sha256,md5,sha1)")
+    recover_parser.add_argument("--index", help="Persistent scan index (SQLite); only new or changed files are re-read")
+    recover_parser.add_argument("--container", metavar="PATH", help="Pack recovered files into one compressed, indexed evidence container")
+
+    # Carve Command
+    carve_parser = subparsers.add_parser("carve", help="Carve files out of a raw disk image", parents=[common])
+    carve_parser.add_argument("image", help="Raw image (dd) or block device")
+    carve_parser.add_argument("--output", default="output/carved", help="Directory for carved files")
+    carve_parser.add_argument("--type", help="Comma-separated file types to carve (default: all types with a known footer)")
+    carve_parser.add_argument("--workers", type=int, help="Search processes (default: CPU count)")
+    carve_parser.add_argument("--max-size", type=int, default=20, help="Largest file to carve, in MB (default: 20)")
 
     # Artifacts Command
-    subparsers.add_parser("artifacts", help="Collect system artifacts")
+    artifacts_parser = subparsers.add_parser("artifacts", help="Collect system artifacts", parents=[common])
+    artifacts_parser.add_argument("--collectors", type=lazy("artifacts.collectors", "parse_collectors"),
+                                  help="Comma-separated collectors to run: system_info, browser_history, recent_files (default: all)")
+    artifacts_parser.add_argument("--timeout", type=float, help="Seconds before a collector is abandoned (default: per collector)")
+    artifacts_parser.add_argument("--days", type=int, default=3, help="Recent files: modified within this many days (default: 3)")
+    artifacts_parser.add_argument("--root", help="Recent files: directory to search (default: home directory)")
+    artifacts_parser.add_argument("--max-depth", type=int, help="Recent files: directory levels to descend (default: 8)")
+    artifacts_parser.add_argument("--exclude", action="append", metavar="GLOB", help="Recent files: skip directories matching this name or relative-path glob (repeatable)")
+    artifacts_parser.add_argument("--no-default-excludes", action="store_true", help="Recent files: also walk node_modules, caches and similar trees")
+    artifacts_parser.add_argument("--workers", type=int, default=8, help="Recent files: top-level directories walked in parallel (default: 8)")
+    artifacts_parser.add_argument("--index", help="Recent files: answer from this scan index instead of walking")
+    artifacts_parser.add_argument("--format", choices=["json", "sqlite"], default="json", help="Report format; sqlite writes a report database")
+    artifacts_parser.add_argument("--pretty", action="store_true", help="Indent the JSON report for reading (default: compact)")
 
     # Timeline Command
-    timeline_parser = subparsers.add_parser("timeline", help="Generate timeline")
+    timeline_parser = subparsers.add_parser("timeline", help="Generate timeline", parents=[common, known])
     timeline_parser.add_argument("target", help="Directory to analyze")
+    timeline_parser.add_argument("--format", choices=list(TIMELINE_OUTPUTS), default="json", help="Export format (bodyfile is Sleuth Kit mactime input)")
+    timeline_parser.add_argument("--output", help="Output file (default: timeline.<format>, timeline.db for sqlite)")
+    timeline_parser.add_argument("--pretty", action="store_true", help="Indent JSON output for reading (default: one event per line)")
+    timeline_parser.add_argument("--since", type=lazy("core.timeline", "parse_timestamp"), help="Only keep events at or after this time (epoch or ISO 8601)")
+    timeline_parser.add_argument("--until", type=lazy("core.timeline", "parse_timestamp"), help="Only keep events at or before this time (epoch or ISO 8601)")
+    timeline_parser.add_argument("--memory-budget", type=int, help="Events kept in RAM before sorted runs spill to disk")
+    timeline_parser.add_argument("--index", help="Persistent scan index (SQLite); only new or changed files are re-read")
+
+    # Triage Command
+    triage_parser = subparsers.add_parser("triage", help="Scan once and produce the scan report, timeline and recovery together",
+                                          parents=[common, scan_options])
+    triage_parser.add_argument("--outputs", type=parse_outputs, default=TRIAGE_OUTPUTS,
+                               help=f"Comma-separated outputs to produce (default: {','.join(TRIAGE_OUTPUTS)})")
+    triage_parser.add_argument("--timeline-format", choices=list(TIMELINE_OUTPUTS), default="json", help="Timeline export format")
+    triage_parser.add_argument("--timeline-output", help="Timeline file (default: timeline.<format>, timeline.db for sqlite)")
+    triage_parser.add_argument("--since", type=lazy("core.timeline", "parse_timestamp"), help="Only keep timeline events at or after this time (epoch or ISO 8601)")
+    triage_parser.add_argument("--until", type=lazy("core.timeline", "parse_timestamp"), help="Only keep timeline events at or before this time (epoch or ISO 8601)")
+    triage_parser.add_argument("--memory-budget", type=int, help="Timeline events kept in RAM before sorted runs spill to disk")
+    triage_parser.add_argument("--type", help="Comma-separated file extensions to recover (e.g. jpg,pdf)")
+    triage_parser.add_argument("--suspicious-only", action="store_true", help="Only recover files flagged as suspicious")
+    triage_parser.add_argument("--dedup", action="store_true", help="Store identical recovered content once and write a source-to-blob manifest")
+    triage_parser.add_argument("--container", metavar="PATH", help="Pack recovered files into one compressed, indexed evidence container")
+
+    # Extract Command
+    extract_parser = subparsers.add_parser("extract", help="List or extract files from an evidence container", parents=[common])
+    extract_parser.add_argument("container", help="Evidence container written by recover --container")
+    extract_parser.add_argument("--output", default="output/extracted", help="Directory to extract into (original paths are kept below it)")
+    extract_parser.add_argument("--path", action="append", help="Only extract this original path (repeatable)")
+    extract_parser.add_argument("--sha256", action="append", help="Only extract entries with this content hash (repeatable)")
+    extract_parser.add_argument("--list", action="store_true", help="List entries instead of extracting")
+
+    # Hash Set Command
+    hashset_parser = subparsers.add_parser("hashset", help="Compile hash lists into a known-file hash set", parents=[common])
+    hashset_parser.add_argument("inputs", nargs="+", help="Hash lists: one digest per line, *sum output, or NSRL-style CSV")
+    hashset_parser.add_argument("--output", required=True, help="Compiled hash set to write")
+    hashset_parser.add_argument("--algorithm", choices=HASHSET_ALGORITHMS, help="Digest to keep (default: inferred from the first hash)")
+    hashset_parser.add_argument("--memory-budget", type=int, help="Hashes sorted in RAM before runs spill to disk")
 
     args = parser.parse_args()
 
-    if args.command == "scan":
-        cmd_scan(args)
-    elif args.command == "recover":
-        cmd_recover(args)
-    elif args.command == "artifacts":
-        cmd_artifacts(args)
-    elif args.command == "timeline":
-        cmd_timeline(args)
-    else:
+    commands = {
+        "scan": cmd_scan,
+        "recover": cmd_recover,
+        "carve": cmd_carve,
+        "artifacts": cmd_artifacts,
+        "timeline": cmd_timeline,
+        "triage": cmd_triage,
+        "extract": cmd_extract,
+        "hashset": cmd_hashset
+    }
+    if args.command not in commands:
+        from utils.logger import console
+
+        print_banner()
         console.print("[bold yellow][!] No command specified. Use --help for usage.[/bold yellow]")
+        return
+
+    from utils.logger import log, machine_output
+    from utils.metrics import metrics
+
+    if args.machine:
+        machine_output()
+    elif not args.no_banner:
+        print_banner()
+    log.quiet = args.quiet or args.machine
+    if args.metrics_out:
+        metrics.enable()
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        result = commands[args.command](args)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            log.info(f"Profile saved to [bold white]{args.profile}[/bold white] (inspect with: python -m pstats {args.profile})")
+        if args.metrics_out:
+            metrics.write(args.metrics_out)
+            log.info(f"Metrics saved to [bold white]{args.metrics_out}[/bold white]")
+    if args.machine:
+        print_result(args.command, "ok", **(result or {}))
+
+def print_result(command, status, **fields):
+    """Machine mode: the run's outcome as one JSON line on stdout."""
+    import json
+
+    print(json.dumps({"command": command, "status": status, **fields}), flush=True)
 
 if __name__ == "__main__":
+    machine = "--machine" in sys.argv[1:]
     try:
         main()
     except KeyboardInterrupt:
+        from utils.logger import console
+
         console.print("\n[bold red][!] Operation cancelled by user.[/bold red]")
+        if machine:
+            print_result(sys.argv[1], "cancelled")
+            sys.exit(130)
         sys.exit(0)
     except Exception as e:
+        from utils.logger import console
+
         console.print(f"\n[bold red][!] An unexpected error occurred: {e}[/bold red]")
+        if machine:
+            print_result(sys.argv[1], "error", error=str(e))
+            sys.exit(1)
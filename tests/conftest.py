@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tests import the tool's packages the same way nirikshax.py does, from the repository root
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def cli(tmp_path):
+    """Runs nirikshax.py in a subprocess, from tmp_path unless another cwd is given."""
+    def run(*args, cwd=None):
+        return subprocess.run([sys.executable, os.path.join(ROOT, "nirikshax.py"), *args],
+                              cwd=cwd or tmp_path, capture_output=True, text=True, timeout=120)
+    return run
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import pytest
+from artifacts.browser_history import BrowserHistoryExtractor
+
+# 2024-01-01 00:00:00 UTC
+EPOCH = 1704067200
+
+def _chromium(path, visits):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT, title TEXT);"
+                       "CREATE TABLE visits (id INTEGER PRIMARY KEY, url INTEGER, visit_time INTEGER);")
+    for n, (url, seconds) in enumerate(visits, 1):
+        conn.execute("INSERT INTO urls VALUES (?, ?, ?)", (n, url, f"title {n}"))
+        conn.execute("INSERT INTO visits (url, visit_time) VALUES (?, ?)", (n, int((seconds + 11644473600) * 1e6)))
+    conn.commit()
+    conn.close()
+
+def _firefox(path, visits):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript("CREATE TABLE moz_places (id INTEGER PRIMARY KEY, url TEXT, title TEXT);"
+                       "CREATE TABLE moz_historyvisits (id INTEGER PRIMARY KEY, place_id INTEGER, visit_date INTEGER);")
+    for n, (url, seconds) in enumerate(visits, 1):
+        conn.execute("INSERT INTO moz_places VALUES (?, ?, ?)", (n, url, None))
+        conn.execute("INSERT INTO moz_historyvisits (place_id, visit_date) VALUES (?, ?)", (n, int(seconds * 1e6)))
+    conn.commit()
+    conn.close()
+
+@pytest.fixture
+def browsers(tmp_path):
+    chrome = str(tmp_path / "chrome")
+    firefox = str(tmp_path / "firefox")
+    _chromium(os.path.join(chrome, "Default", "History"), [("https://a.example/", EPOCH), ("https://b.example/", EPOCH + 60)])
+    _chromium(os.path.join(chrome, "Profile 1", "History"), [("https://c.example/", EPOCH + 5)])
+    _firefox(os.path.join(firefox, "abcd.default", "places.sqlite"), [("https://d.example/", EPOCH + 10)])
+    os.makedirs(os.path.join(chrome, "System Profile")) # No history: not a profile
+    return [("Chrome", "chromium", chrome), ("Firefox", "firefox", firefox), ("Edge", "chromium", str(tmp_path / "missing"))]
+
+def test_finds_every_profile_with_history(browsers):
+    profiles = BrowserHistoryExtractor(roots=browsers).find_profiles()
+    assert [(browser, profile) for browser, _, profile, _ in profiles] == [
+        ("Chrome", "Default"), ("Chrome", "Profile 1"), ("Firefox", "abcd.default")]
+
+def test_streams_every_visit_with_epoch_timestamps(browsers, monkeypatch):
+    from artifacts import browser_history
+    monkeypatch.setattr(browser_history, "FETCH_BATCH", 1) # Several fetchmany() round trips
+    visits = list(BrowserHistoryExtractor(roots=browsers, workers=2).iter_history())
+    by_url = {visit["url"]: visit for visit in visits}
+    assert len(visits) == 4
+    assert by_url["https://a.example/"] == {"browser": "Chrome", "profile": "Default", "url": "https://a.example/",
+                                            "title": "title 1", "timestamp": EPOCH}
+    assert by_url["https://c.example/"]["profile"] == "Profile 1"
+    assert by_url["https://d.example/"]["browser"] == "Firefox"
+    assert by_url["https://d.example/"]["timestamp"] == EPOCH + 10
+
+def test_databases_are_left_untouched(browsers):
+    path = os.path.join(browsers[0][2], "Default", "History")
+    before = os.stat(path).st_mtime_ns, sorted(os.listdir(os.path.dirname(path)))
+    list(BrowserHistoryExtractor(roots=browsers).iter_history("chromium"))
+    assert (os.stat(path).st_mtime_ns, sorted(os.listdir(os.path.dirname(path)))) == before
+
+def test_a_live_write_ahead_log_is_read_from_a_copy(tmp_path):
+    root = str(tmp_path / "chrome")
+    path = os.path.join(root, "Default", "History")
+    _chromium(path, [("https://a.example/", EPOCH)])
+    # Keep a connection open in WAL mode so the newest visit lives only in the -wal file
+    live = sqlite3.connect(path)
+    live.execute("PRAGMA journal_mode=WAL")
+    live.execute("PRAGMA wal_autocheckpoint=0")
+    live.execute("INSERT INTO urls VALUES (2, 'https://b.example/', 'b')")
+    live.execute("INSERT INTO visits (url, visit_time) VALUES (2, 1)")
+    live.commit()
+    try:
+        assert os.path.getsize(path + "-wal")
+        urls = {v["url"] for v in BrowserHistoryExtractor(roots=[("Chrome", "chromium", root)]).iter_history()}
+    finally:
+        live.close()
+    assert urls == {"https://a.example/", "https://b.example/"}
+
+def test_a_corrupt_profile_does_not_stop_the_others(browsers):
+    with open(os.path.join(browsers[0][2], "Profile 1", "History"), "wb") as f:
+        f.write(b"not a database" * 100)
+    urls = {v["url"] for v in BrowserHistoryExtractor(roots=browsers).iter_history()}
+    assert urls == {"https://a.example/", "https://b.example/", "https://d.example/"}
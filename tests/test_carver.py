@@ -0,0 +1,77 @@
+import os
+import random
+import pytest
+from core.carver import Carver
+from utils.fileio import copy_range
+
+JPEG = b"\xFF\xD8\xFF\xE0" + bytes(100) + b"\xFF\xD9"
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(100) + b"IEND\xAE\x42\x60\x82"
+
+def _unsupported(*args):
+    raise OSError(95, "Operation not supported")
+
+@pytest.fixture(params=["copy_file_range", "sendfile", "read/write"])
+def copy_path(request, monkeypatch):
+    """Forces copy_range down one of its three paths."""
+    if request.param != "copy_file_range":
+        monkeypatch.setattr(os, "copy_file_range", _unsupported, raising=False)
+    if request.param == "read/write":
+        monkeypatch.delattr(os, "sendfile", raising=False)
+    return request.param
+
+def test_copy_range_copies_the_requested_bytes(tmp_path, copy_path):
+    data = random.Random(1).randbytes(3 * 1024 * 1024 + 17)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(data)
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        assert copy_range(s.fileno(), d.fileno(), 1000, 2 * 1024 * 1024 + 5) == 2 * 1024 * 1024 + 5
+        # Past the end of the source only what exists is copied
+        assert copy_range(s.fileno(), d.fileno(), len(data) - 10, 100) == 10
+    assert dst.read_bytes() == data[1000:1000 + 2 * 1024 * 1024 + 5] + data[-10:]
+
+def test_copy_range_resumes_where_a_failed_method_stopped(tmp_path, monkeypatch):
+    data = random.Random(2).randbytes(64 * 1024)
+    calls = []
+
+    def copy_some_then_fail(src_fd, dst_fd, count, offset):
+        if calls:
+            raise OSError(18, "Invalid cross-device link")
+        calls.append(offset)
+        block = os.pread(src_fd, 1000, offset)
+        return os.write(dst_fd, block)
+
+    monkeypatch.setattr(os, "copy_file_range", copy_some_then_fail, raising=False)
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(data)
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        assert copy_range(s.fileno(), d.fileno(), 0, len(data)) == len(data)
+    assert dst.read_bytes() == data
+
+def test_carver_finds_files_across_chunk_boundaries(tmp_path, copy_path):
+    # With 4 KiB chunks the JPEG header straddles the first boundary and the PNG ends three chunks later
+    image = bytes(4094) + JPEG + bytes(500) + PNG + bytes(9100) + PNG + bytes(7)
+    path = tmp_path / "image.dd"
+    path.write_bytes(image)
+
+    carver = Carver(str(path), str(tmp_path / "carved"), types=("jpg", "png"), workers=2, chunk_size=4096)
+    carved = carver.carve()
+    assert [(c["offset"], c["type"]) for c in carved] == [
+        (4094, "jpg"), (4094 + len(JPEG) + 500, "png"), (len(image) - 7 - len(PNG), "png")]
+    for c in carved:
+        with open(c["path"], "rb") as f:
+            assert f.read() == image[c["offset"]:c["offset"] + c["size"]]
+    assert carver.bytes_scanned == len(image)
+
+def test_carver_skips_headers_nested_in_a_carved_file(tmp_path):
+    # A thumbnail embedded in a JPEG is part of it, not a second file
+    outer = b"\xFF\xD8\xFF\xE0" + bytes(50) + JPEG + bytes(50) + b"\xFF\xD9"
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(512) + outer + bytes(512))
+    carved = Carver(str(path), str(tmp_path / "carved"), types=("jpg",), workers=1).carve()
+    # The outer file ends at the thumbnail's footer, the first one found
+    assert [(c["offset"], c["size"]) for c in carved] == [(512, 4 + 50 + len(JPEG))]
+
+def test_carver_rejects_types_without_a_signature(tmp_path):
+    with pytest.raises(ValueError, match="No signature known for: nope"):
+        Carver(str(tmp_path / "image.dd"), str(tmp_path / "carved"), types=("jpg", "nope"))
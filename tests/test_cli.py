@@ -0,0 +1,43 @@
+import json
+import pytest
+
+@pytest.mark.parametrize("args, reason", [
+    (("scan", ".", "--hash", "sha999"), "argument --hash: Unsupported hash algorithm: sha999"),
+    (("scan", ".", "--hash", "shake_128"), "Variable-length hash algorithm not supported: shake_128"),
+    (("timeline", ".", "--since", "yesterday"), "argument --since: Invalid isoformat string"),
+])
+def test_option_errors_keep_their_reason(cli, args, reason):
+    result = cli(*args)
+    assert result.returncode == 2
+    assert reason in result.stderr
+
+@pytest.fixture
+def target(tmp_path):
+    target = tmp_path / "evidence"
+    target.mkdir()
+    (target / "notes.txt").write_text("notes")
+    (target / "photo.txt").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(64))
+    return target
+
+def test_machine_mode_prints_one_json_result(cli, target):
+    result = cli("scan", str(target), "--machine")
+    assert result.returncode == 0
+    assert result.stdout.count("\n") == 1
+    assert json.loads(result.stdout) == {"command": "scan", "status": "ok", "report": "scan_report.json",
+                                         "files_found": 2, "suspicious_count": 1}
+    # The log still goes to stderr, uncoloured and without the banner
+    assert "Initializing scanning engine" in result.stderr
+    assert "\x1b[" not in result.stderr
+    assert "HUMAN" not in result.stderr + result.stdout
+
+def test_machine_mode_reports_failures(cli, tmp_path):
+    result = cli("scan", str(tmp_path / "missing"), "--machine")
+    assert result.returncode == 1
+    outcome = json.loads(result.stdout)
+    assert outcome["command"] == "scan"
+    assert outcome["status"] == "error"
+    assert "No such file or directory" in outcome["error"]
+
+def test_no_banner(cli, target):
+    assert "HUMAN" in cli("scan", str(target)).stdout
+    assert "HUMAN" not in cli("scan", str(target), "--no-banner").stdout
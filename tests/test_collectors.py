@@ -0,0 +1,75 @@
+import json
+import threading
+import pytest
+from artifacts.collectors import COLLECTORS, Collector, parse_collectors, run_collectors
+from core.report import JSONDocumentWriter
+
+class Value(Collector):
+    name = "value"
+    def collect(self, cancel):
+        return [1, 2, 3]
+
+class Broken(Collector):
+    name = "broken"
+    def collect(self, cancel):
+        raise OSError("permission denied")
+
+class Hung(Collector):
+    name = "hung"
+    timeout = 0.2
+    def __init__(self):
+        self.release = threading.Event()
+    def collect(self, cancel):
+        self.release.wait(10)
+        return "too late"
+
+class Stream(Collector):
+    name = "stream"
+    streaming = True
+    def collect(self, cancel):
+        return ({"n": n} for n in range(1000))
+
+def _run(tmp_path, collectors):
+    path = tmp_path / "artifacts.json"
+    report = JSONDocumentWriter(str(path))
+    try:
+        results = run_collectors(collectors, report)
+    finally:
+        report.close()
+    return {r.collector.name: r for r in results}, json.loads(path.read_text())
+
+def test_results_statuses_and_report(tmp_path):
+    hung = Hung()
+    try:
+        results, document = _run(tmp_path, [Value(), Broken(), hung, Stream()])
+    finally:
+        hung.release.set()
+
+    assert {name: r.status for name, r in results.items()} == {
+        "value": "ok", "broken": "error", "hung": "timeout", "stream": "ok"}
+    assert results["value"].summary()["items"] == 3
+    assert results["stream"].items == 1000
+    assert results["hung"].error == "Timed out after 0.2s"
+
+    assert document["value"] == [1, 2, 3]
+    assert document["broken"] == {"error": "permission denied"}
+    assert document["hung"] == {"error": "Timed out after 0.2s"}
+    assert document["stream"] == [{"n": n} for n in range(1000)]
+
+def test_a_hung_collector_does_not_hold_up_the_others(tmp_path):
+    hung = Hung()
+    finished = []
+    path = tmp_path / "artifacts.json"
+    report = JSONDocumentWriter(str(path))
+    try:
+        run_collectors([hung, Value()], report, on_finish=lambda r: finished.append(r.collector.name))
+    finally:
+        report.close()
+        hung.release.set()
+    assert finished == ["value", "hung"]
+
+def test_parse_collectors():
+    assert parse_collectors(" system_info, recent_files,system_info ,") == ["system_info", "recent_files"]
+    assert set(parse_collectors(",".join(COLLECTORS))) == set(COLLECTORS)
+    with pytest.raises(ValueError, match="Unknown collector: nope"):
+        parse_collectors("system_info,nope")
@@ -0,0 +1,72 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.concurrency import BackgroundConsumer, ordered_map
+
+def test_ordered_map_keeps_input_order():
+    rng = random.Random(3)
+    delays = [rng.uniform(0, 0.005) for _ in range(100)]
+
+    def slow_square(n):
+        time.sleep(delays[n])
+        return n * n
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(ordered_map(pool, slow_square, range(100), window=16)) == [n * n for n in range(100)]
+
+def test_ordered_map_bounds_work_in_flight():
+    in_flight, peak, lock = 0, 0, threading.Lock()
+
+    def track(n):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.001)
+        with lock:
+            in_flight -= 1
+        return n
+
+    consumed = []
+
+    def items():
+        for n in range(50):
+            consumed.append(n)
+            yield n
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = ordered_map(pool, track, items(), window=4)
+        assert next(results) == 0
+        # Input is pulled lazily: only the window has been submitted so far
+        assert len(consumed) == 4
+        assert list(results) == list(range(1, 50))
+    assert peak <= 4
+
+def test_ordered_map_propagates_errors():
+    def fail_on_three(n):
+        if n == 3:
+            raise ValueError(n)
+        return n
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        with pytest.raises(ValueError):
+            list(ordered_map(pool, fail_on_three, range(10), window=2))
+
+def test_background_consumer_returns_result_and_reraises():
+    consumer = BackgroundConsumer(sum, maxsize=2)
+    for n in range(10):
+        consumer.put(n)
+    assert consumer.close() == 45
+
+    def broken(items):
+        next(items)
+        raise RuntimeError("consumer died")
+
+    consumer = BackgroundConsumer(broken, maxsize=1)
+    with pytest.raises(RuntimeError):
+        # put() must not block forever once the consumer is gone
+        for n in range(100):
+            consumer.put(n)
+        consumer.close()
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import pytest
+from core import container as container_module
+from core.container import ContainerReader, ContainerWriter, extraction_path, journal_path
+
+def _file(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+def _record(path):
+    stats = os.stat(path)
+    return {"path": path, "size": stats.st_size, "modified": stats.st_mtime, "accessed": stats.st_atime}
+
+def _sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+@pytest.fixture
+def sources(tmp_path):
+    directory = tmp_path / "src"
+    directory.mkdir()
+    return {
+        "small": _file(directory, "small.txt", b"hello evidence"),
+        "copy": _file(directory, "copy.txt", b"hello evidence"),
+        "large": _file(directory, "large.bin", os.urandom(300_000)),
+        "empty": _file(directory, "empty.txt", b""),
+    }
+
+def test_round_trip_deduplicates_and_restores_content(tmp_path, sources):
+    container_path = str(tmp_path / "case.nxc")
+    # Small chunks so the large file spans several of them
+    with ContainerWriter(container_path, chunk_size=64 * 1024) as writer:
+        for name in ("small", "copy", "large", "empty"):
+            writer.add(_record(sources[name]))
+    assert writer.duplicates == 1
+    assert not os.path.exists(journal_path(container_path))
+
+    with ContainerReader(container_path) as reader:
+        assert reader.complete
+        assert len(reader.entries) == 4
+        assert len(reader.blobs) == 3
+        for path in sources.values():
+            with open(path, "rb") as f:
+                content = f.read()
+            (entry,) = reader.find(path=path)
+            assert entry["sha256"] == _sha256(content)
+            assert "changed_since_scan" not in entry
+            assert reader.read(entry["sha256"]) == content
+
+            dest = reader.extract(entry, extraction_path(str(tmp_path / "out"), path))
+            with open(dest, "rb") as f:
+                assert f.read() == content
+            assert int(os.stat(dest).st_mtime) == int(entry["modified"])
+
+def test_scan_digest_is_checked_against_packed_content(tmp_path, sources):
+    container_path = str(tmp_path / "case.nxc")
+    with ContainerWriter(container_path) as writer:
+        writer.add(_record(sources["small"]), "0" * 64)
+        writer.add(_record(sources["large"]), _sha256(open(sources["large"], "rb").read()))
+
+    with ContainerReader(container_path) as reader:
+        stale, fresh = reader.entries
+        assert stale["sha256"] == _sha256(b"hello evidence")
+        assert stale["changed_since_scan"]
+        assert "changed_since_scan" not in fresh
+
+def test_unclosed_container_is_read_from_its_journal(tmp_path, sources):
+    container_path = str(tmp_path / "case.nxc")
+    writer = ContainerWriter(container_path, chunk_size=64 * 1024)
+    writer.add(_record(sources["small"]))
+    writer.add(_record(sources["large"]))
+    # Simulate a crash once the writer thread has written its chunks, before the TOC
+    writer._queue.put(None)
+    writer._writer.join()
+    writer._file.close()
+    writer._journal.close()
+    with open(journal_path(container_path), "a") as journal:
+        journal.write('["entry", {"path": "torn')
+
+    with ContainerReader(container_path) as reader:
+        assert not reader.complete
+        assert [entry["path"] for entry in reader.entries] == [sources["small"], sources["large"]]
+        for entry in reader.entries:
+            with open(entry["path"], "rb") as f:
+                assert reader.read(entry["sha256"]) == f.read()
+
+def test_journal_drops_entries_past_the_last_written_chunk(tmp_path, sources):
+    container_path = str(tmp_path / "case.nxc")
+    with ContainerWriter(container_path, chunk_size=64 * 1024) as writer:
+        writer.add(_record(sources["small"]))
+        writer.add(_record(sources["large"]))
+    with ContainerReader(container_path) as reader:
+        small_blob = reader.blobs[reader.entries[0]["sha256"]]
+        large_entry = reader.entries[1]
+        first_chunk = reader.chunks[0]
+
+    # Rebuild the state of a crash after the first chunk: only that chunk is journaled
+    with open(container_path, "r+b") as f:
+        header = bytearray(f.read(24))
+        header[8:24] = bytes(16) # Zero TOC offset and length
+        f.seek(0)
+        f.write(header)
+    with open(journal_path(container_path), "w") as journal:
+        for line in (["chunk", first_chunk], ["blob", [reader.entries[0]["sha256"], *small_blob]],
+                     ["entry", reader.entries[0]], ["blob", [large_entry["sha256"], *reader.blobs[large_entry["sha256"]]]],
+                     ["entry", large_entry]):
+            journal.write(json.dumps(line) + "\n")
+
+    with ContainerReader(container_path) as recovered:
+        assert [entry["path"] for entry in recovered.entries] == [sources["small"]]
+
+def test_unclosed_container_without_journal_is_rejected(tmp_path, sources):
+    container_path = str(tmp_path / "case.nxc")
+    writer = ContainerWriter(container_path)
+    writer.add(_record(sources["small"]))
+    writer._queue.put(None)
+    writer._writer.join()
+    writer._file.close()
+    writer._journal.close()
+    os.remove(journal_path(container_path))
+
+    with pytest.raises(ValueError, match="was not closed cleanly and has no journal"):
+        ContainerReader(container_path)
+
+def test_unhashed_duplicate_longer_than_the_hold_back_shares_the_first_blob(tmp_path, sources, monkeypatch):
+    monkeypatch.setattr(container_module, "_HOLD_BACK", 1024)
+    monkeypatch.setattr(container_module, "_READ_SIZE", 1024)
+    copy = _file(str(tmp_path / "src"), "large copy.bin", open(sources["large"], "rb").read())
+    container_path = str(tmp_path / "case.nxc")
+    with ContainerWriter(container_path, chunk_size=64 * 1024) as writer:
+        assert not writer.add(_record(sources["large"]))
+        assert writer.add(_record(copy))
+    assert writer.bytes_in == 300_000
+
+    with ContainerReader(container_path) as reader:
+        first, second = reader.entries
+        assert first["sha256"] == second["sha256"]
+        assert len(reader.blobs) == 1
+        assert reader.read(second["sha256"]) == open(sources["large"], "rb").read()
+
+def test_corrupt_blob_is_detected_on_read_and_extract(tmp_path, sources):
+    container_path = str(tmp_path / "case.nxc")
+    with ContainerWriter(container_path) as writer:
+        writer.add(_record(sources["small"]))
+        writer.add(_record(sources["large"]))
+
+    with ContainerReader(container_path) as reader:
+        small, large = reader.entries
+        # Point the small file's blob at bytes of the large one
+        size = reader.blobs[small["sha256"]][1]
+        reader.blobs[small["sha256"]] = (reader.blobs[large["sha256"]][0], size)
+        with pytest.raises(ValueError, match="is corrupt"):
+            reader.read(small["sha256"])
+        with pytest.raises(ValueError, match="does not match its SHA-256"):
+            reader.extract(small, str(tmp_path / "out" / "small.txt"))
+
+def test_rejects_files_that_are_not_containers(tmp_path):
+    path = _file(str(tmp_path), "not.nxc", b"x" * 64)
+    with pytest.raises(ValueError):
+        ContainerReader(path)
+
+def test_extraction_path_stays_inside_output_dir(tmp_path):
+    output = str(tmp_path / "out")
+    assert extraction_path(output, "/evidence/../etc/passwd") == os.path.join(output, "evidence", "etc", "passwd")
+    assert extraction_path(output, "C:\\Users\\a.txt").startswith(output)
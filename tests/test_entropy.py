@@ -0,0 +1,66 @@
+import os
+import random
+import pytest
+from core import entropy
+from core.entropy import analyze_batch, byte_features, sample_blocks
+
+SAMPLES = [
+    b"",
+    b"a" * 1000,
+    bytes(range(256)) * 16,
+    b"The quick brown fox jumps over the lazy dog.\r\n\t" * 50,
+    bytes(random.Random(5).randrange(256) for _ in range(50_000)),
+]
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    # As if NumPy were not installed
+    monkeypatch.setattr(entropy, "_numpy", None)
+
+def test_known_values(pure_python):
+    assert byte_features(b"") == {"entropy": 0.0, "chi_square": 0.0, "printable_ratio": 0.0}
+    assert byte_features(b"a" * 1000)["entropy"] == 0.0
+    uniform = byte_features(bytes(range(256)) * 16)
+    assert uniform["entropy"] == 8.0
+    assert uniform["chi_square"] == 0.0
+    assert uniform["printable_ratio"] == round(98 / 256, 4)
+    assert byte_features(SAMPLES[3])["printable_ratio"] == 1.0
+
+@pytest.mark.parametrize("data", SAMPLES, ids=["empty", "constant", "uniform", "text", "random"])
+def test_pure_python_matches_numpy(monkeypatch, data):
+    numpy = pytest.importorskip("numpy")
+    monkeypatch.setattr(entropy, "_numpy", numpy)
+    vectorized = byte_features(data)
+    monkeypatch.setattr(entropy, "_numpy", None)
+    assert byte_features(data) == vectorized
+
+def test_sample_blocks_reads_head_middle_and_tail(tmp_path):
+    data = bytes(range(256)) * 100
+    path = tmp_path / "blob.bin"
+    path.write_bytes(data)
+    assert sample_blocks(str(path), len(data), budget=len(data)) == data
+    block = 300
+    sampled = sample_blocks(str(path), len(data), budget=3 * block)
+    middle = (len(data) - block) // 2
+    assert sampled == data[:block] + data[middle:middle + block] + data[-block:]
+
+def test_analyze_batch_marks_unreadable_files(tmp_path):
+    path = tmp_path / "random.bin"
+    path.write_bytes(os.urandom(8192))
+    readable, missing = analyze_batch([(str(path), 8192, 4096), (str(tmp_path / "gone"), 10, 4096)])
+    assert readable["entropy"] > 7.0
+    assert missing is None
+
+def test_scan_entropy_stage_flags_encrypted_looking_files(tmp_path):
+    from core.scanner import Scanner
+
+    (tmp_path / "notes.txt").write_bytes(b"plain words " * 1000)
+    (tmp_path / "secret.txt").write_bytes(os.urandom(64 * 1024))
+    scanner = Scanner(str(tmp_path), entropy_budget=16 * 1024, entropy_workers=1)
+    records = {os.path.basename(r["path"]): r for r in scanner.iter_scan()}
+
+    assert records["notes.txt"]["entropy"] < 4
+    assert not records["notes.txt"]["suspicious"]
+    assert records["secret.txt"]["entropy"] > 7.5
+    assert records["secret.txt"]["suspicious"]
+    assert set(records["secret.txt"]["byte_features"]) == {"chi_square", "printable_ratio"}
@@ -0,0 +1,75 @@
+import hashlib
+import pytest
+from core.hashsets import HashSet, KnownHashes, build_hashset
+
+def _sha1(n):
+    return hashlib.sha1(str(n).encode()).hexdigest()
+
+def test_lookup_after_multi_run_build(tmp_path):
+    digests = [_sha1(n) for n in range(2000)]
+    plain = tmp_path / "plain.txt"
+    plain.write_text("# comment\n" + "\n".join(digests[:1500]) + "\nnot-a-hash\n")
+    sums = tmp_path / "sums.txt"
+    # Overlaps the plain list, so the build must de-duplicate across inputs
+    sums.write_text("".join(f"{d}  file{n}\n" for n, d in enumerate(digests[1000:])))
+
+    output = str(tmp_path / "set.nxh")
+    # A tiny budget forces many sorted runs to be merged
+    assert build_hashset([str(plain), str(sums)], output, memory_budget=97) == 2000
+
+    hash_set = HashSet(output)
+    try:
+        assert hash_set.algorithm == "sha1"
+        assert len(hash_set) == 2000
+        assert all(d in hash_set for d in digests)
+        assert digests[0].upper() in hash_set
+        assert bytes.fromhex(digests[1]) in hash_set
+        assert _sha1("absent") not in hash_set
+        assert "zz" not in hash_set
+        assert hashlib.md5(b"x").hexdigest() not in hash_set # Wrong width
+    finally:
+        hash_set.close()
+
+def test_nsrl_csv_uses_the_requested_column(tmp_path):
+    md5, sha1 = hashlib.md5(b"a").hexdigest(), hashlib.sha1(b"a").hexdigest()
+    csv = tmp_path / "NSRLFile.txt"
+    csv.write_text('"SHA-1","MD5","FileName"\n' f'"{sha1.upper()}","{md5.upper()}","a.txt"\n')
+
+    output = str(tmp_path / "nsrl.nxh")
+    assert build_hashset([str(csv)], output, algorithm="md5") == 1
+    hash_set = HashSet(output)
+    try:
+        assert hash_set.algorithm == "md5"
+        assert md5 in hash_set
+    finally:
+        hash_set.close()
+
+def test_build_without_digests_fails(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_text("nothing here\n")
+    with pytest.raises(ValueError):
+        build_hashset([str(empty)], str(tmp_path / "set.nxh"))
+
+def test_known_bad_takes_precedence(tmp_path):
+    listed = hashlib.sha256(b"listed").hexdigest()
+    good_only = hashlib.sha256(b"good").hexdigest()
+    (tmp_path / "good.txt").write_text(f"{listed}\n{good_only}\n")
+    (tmp_path / "bad.txt").write_text(f"{listed}\n")
+    build_hashset([str(tmp_path / "good.txt")], str(tmp_path / "nsrl.nxh"))
+    build_hashset([str(tmp_path / "bad.txt")], str(tmp_path / "malware.nxh"))
+
+    known = KnownHashes(good=[str(tmp_path / "nsrl.nxh")], bad=[str(tmp_path / "malware.nxh")])
+    try:
+        assert known.algorithms == ("sha256",)
+        assert known.classify({"sha256": listed}) == ("bad", "malware")
+        assert known.classify({"sha256": good_only}) == ("good", "nsrl")
+        assert known.classify({"sha256": hashlib.sha256(b"other").hexdigest()}) is None
+        assert known.classify({}) is None
+    finally:
+        known.close()
+
+def test_rejects_files_that_are_not_hash_sets(tmp_path):
+    path = tmp_path / "bogus.nxh"
+    path.write_bytes(b"not a hash set")
+    with pytest.raises(ValueError):
+        HashSet(str(path))
@@ -0,0 +1,96 @@
+import os
+import pytest
+from core.index import ScanIndex
+from core.scanner import Scanner
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+def _scan(root, db_path):
+    index = ScanIndex(db_path, root)
+    try:
+        scanner = Scanner(root, index=index)
+        records = {os.path.relpath(r["path"], root): r["index_status"] for r in scanner.iter_scan()}
+        return records, dict(index.changes), list(index.deleted_files)
+    finally:
+        index.close()
+
+@pytest.fixture
+def tree(tmp_path):
+    root = str(tmp_path / "evidence")
+    _write(os.path.join(root, "a.txt"), b"alpha")
+    _write(os.path.join(root, "b.txt"), b"bravo")
+    _write(os.path.join(root, "sub", "c.pdf"), b"%PDF-1.4")
+    return root, str(tmp_path / "case.db")
+
+def test_first_scan_adds_every_file(tree):
+    root, db_path = tree
+    records, changes, deleted = _scan(root, db_path)
+    assert set(records.values()) == {"added"}
+    assert changes == {"added": 3, "modified": 0, "unchanged": 0, "error": 0, "deleted": 0}
+    assert deleted == []
+
+def test_rescan_counts_unchanged_modified_added_and_deleted(tree):
+    root, db_path = tree
+    _scan(root, db_path)
+
+    _write(os.path.join(root, "b.txt"), b"bravo, longer")
+    _write(os.path.join(root, "d.txt"), b"delta")
+    os.remove(os.path.join(root, "sub", "c.pdf"))
+    records, changes, deleted = _scan(root, db_path)
+
+    assert records == {"a.txt": "unchanged", "b.txt": "modified", "d.txt": "added"}
+    assert changes == {"added": 1, "modified": 1, "unchanged": 1, "error": 0, "deleted": 1}
+    assert deleted == [os.path.join(os.path.abspath(root), "sub", "c.pdf")]
+
+    # Deleted entries are gone from the index, so they are not reported twice
+    _, changes, deleted = _scan(root, db_path)
+    assert changes["unchanged"] == 3 and changes["deleted"] == 0
+    assert deleted == []
+
+def test_unchanged_files_keep_their_detected_type(tree):
+    root, db_path = tree
+    _scan(root, db_path)
+    index = ScanIndex(db_path, root)
+    try:
+        path = os.path.join(root, "sub", "c.pdf")
+        status, cached = index.lookup(path, os.stat(path))
+    finally:
+        index.close()
+    assert status == "unchanged"
+    assert cached["extension_detected"] == "pdf"
+
+def test_entries_below_an_unlisted_directory_are_kept(tree):
+    root, db_path = tree
+    _scan(root, db_path)
+
+    index = ScanIndex(db_path, root)
+    try:
+        # As the scanner does when a directory cannot be listed
+        index.keep_tree(os.path.join(root, "sub"))
+        index.keep(os.path.join(root, "b.txt"))
+        index.stage(os.path.join(root, "a.txt"), os.stat(os.path.join(root, "a.txt")), "unchanged", None)
+        changes = index.finish()
+        deleted = list(index.deleted_files)
+    finally:
+        index.close()
+    assert changes["deleted"] == 0
+    assert changes["error"] == 2
+    assert deleted == []
+
+def test_entries_outside_the_root_are_left_alone(tree, tmp_path):
+    root, db_path = tree
+    _scan(root, db_path)
+    other = str(tmp_path / "other")
+    _write(os.path.join(other, "e.txt"), b"echo")
+    _, changes, deleted = _scan(other, db_path)
+    assert changes["deleted"] == 0 and deleted == []
+
+    _, changes, _ = _scan(root, db_path)
+    assert changes["unchanged"] == 3
+
+def test_reading_a_missing_index_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ScanIndex(str(tmp_path / "missing.db"), str(tmp_path), create=False)
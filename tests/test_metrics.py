@@ -0,0 +1,55 @@
+import json
+import pstats
+from utils.metrics import Histogram, Metrics
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics()
+    with metrics.timer("stat"):
+        pass
+    metrics.incr("files_scanned")
+    metrics.error("walk", OSError())
+    report = metrics.to_dict()
+    assert report["counters"] == {} and report["latency"] == {} and report["errors"] == {}
+
+def test_enabled_metrics_count_time_and_errors(tmp_path):
+    metrics = Metrics()
+    metrics.enable()
+    for _ in range(3):
+        with metrics.timer("stat"):
+            pass
+    metrics.incr("bytes_copied", 100)
+    metrics.incr("bytes_copied", 23)
+    metrics.error("walk", PermissionError())
+    metrics.error("walk", PermissionError())
+    metrics.error("analyze", ValueError())
+
+    output = str(tmp_path / "metrics.json")
+    metrics.write(output)
+    with open(output) as f:
+        report = json.load(f)
+    assert report["counters"] == {"bytes_copied": 123}
+    assert report["latency"]["stat"]["count"] == 3
+    assert report["errors"] == {"walk": {"PermissionError": 2}, "analyze": {"ValueError": 1}}
+
+def test_histogram_percentiles_use_bucket_upper_bounds():
+    histogram = Histogram()
+    for seconds in [0.000001] * 90 + [0.001] * 10:
+        histogram.observe(seconds)
+    assert histogram.percentile(0.5) == 2e-6 # Below 2 microseconds
+    assert histogram.percentile(0.99) == 1024e-6
+    summary = histogram.to_dict()
+    assert summary["count"] == 100 and summary["max_ms"] == 1.0
+
+def test_scan_writes_metrics_and_profile(cli, tmp_path):
+    target = tmp_path / "evidence"
+    target.mkdir()
+    (target / "a.txt").write_text("alpha")
+    (target / "b.pdf").write_bytes(b"%PDF-1.4")
+    result = cli("scan", str(target), "--no-banner", "--quiet", "--metrics-out", "metrics.json", "--profile", "scan.pstats")
+    assert result.returncode == 0, result.stderr
+
+    with open(tmp_path / "metrics.json") as f:
+        report = json.load(f)
+    assert report["counters"]["files_scanned"] == 2
+    assert {"stat", "open_read", "signature_match", "suspicious_check"} <= set(report["latency"])
+    assert pstats.Stats(str(tmp_path / "scan.pstats")).total_calls > 0
@@ -0,0 +1,61 @@
+import json
+import os
+import pytest
+from core.pipeline import Pipeline
+from core.scanner import Scanner
+
+@pytest.fixture
+def target(tmp_path):
+    root = tmp_path / "evidence"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("alpha")
+    (root / "photo.jpg").write_bytes(b"\xFF\xD8\xFF\xE0" + bytes(100))
+    (root / "sub" / "invoice.pdf.exe").write_bytes(b"MZ" + bytes(100))
+    return str(root)
+
+def test_every_sink_sees_one_scan(target, monkeypatch):
+    scanner = Scanner(target)
+    analyzed = []
+    analyze_file = scanner.analyze_file
+    monkeypatch.setattr(scanner, "analyze_file", lambda path, stats=None: analyzed.append(path) or analyze_file(path, stats))
+
+    everything, suspicious = [], []
+    pipeline = Pipeline(scanner)
+    pipeline.add("all", lambda record: everything.append(record["path"]))
+    pipeline.add("suspicious", lambda record: suspicious.append(record["path"]), where=lambda record: record["suspicious"])
+    pipeline.add_consumer("count", lambda records: sum(1 for _ in records))
+
+    assert pipeline.run() == 3
+    assert sorted(analyzed) == sorted(everything)
+    assert len(analyzed) == 3 # Each file was read once, whatever the number of sinks
+    assert suspicious == [os.path.join(target, "sub", "invoice.pdf.exe")]
+    assert pipeline.results == {"count": 3}
+
+def test_consumers_are_joined_when_the_scan_fails(target):
+    scanner = Scanner(target)
+    pipeline = Pipeline(scanner)
+
+    def fail(record):
+        raise RuntimeError("sink failed")
+
+    seen = []
+    pipeline.add_consumer("collect", lambda records: seen.extend(records) or len(seen))
+    pipeline.add("fail", fail)
+    with pytest.raises(RuntimeError):
+        pipeline.run()
+    assert pipeline.results == {"collect": 1}
+
+def test_triage_produces_every_output_from_one_pass(cli, tmp_path, target):
+    result = cli("triage", target, "--machine", "--suspicious-only", "--timeline-format", "ndjson")
+    assert result.returncode == 0, result.stderr
+    outcome = json.loads(result.stdout)
+    assert outcome["status"] == "ok"
+    assert outcome["files_found"] == 3 and outcome["suspicious_count"] == 1
+    assert outcome["timeline"]["events"] == 9
+    assert outcome["recover"]["recovered"] == 1
+
+    with open(tmp_path / "scan_report.json") as f:
+        assert json.load(f)["files_found"] == 3
+    with open(tmp_path / outcome["timeline"]["output"]) as f:
+        assert len(f.readlines()) == 9
+    assert os.listdir(tmp_path / "output" / "recovered") == ["invoice.pdf.exe"]
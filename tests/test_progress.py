@@ -0,0 +1,50 @@
+import pytest
+from utils.logger import console, log
+from utils.progress import ScanProgress
+
+def _files(count):
+    return [{"path": f"/evidence/file{n}.txt", "size": 10} for n in range(count)]
+
+def test_disabled_progress_only_counts():
+    with ScanProgress("scan", enabled=False) as progress:
+        for file_info in _files(25):
+            progress.advance(file_info)
+        progress.finish("done")
+    assert progress.files == 25 and progress.bytes == 250
+    assert progress._progress is None
+
+def test_rendering_is_rate_limited(monkeypatch):
+    renders = []
+    with ScanProgress("scan", every_files=10, interval=3600, enabled=True) as progress:
+        render = progress._render
+        def spy(*args, **kwargs):
+            renders.append(progress.files)
+            render(*args, **kwargs)
+        monkeypatch.setattr(progress, "_render", spy)
+        for file_info in _files(35):
+            progress.advance(file_info)
+    assert renders == [10, 20, 30]
+
+def test_progress_is_off_in_quiet_mode(monkeypatch):
+    monkeypatch.setattr(log, "quiet", True)
+    assert not ScanProgress("scan").enabled
+
+@pytest.fixture
+def printed(monkeypatch):
+    """Lines handed to the console, from any thread."""
+    lines = []
+    monkeypatch.setattr(console, "print", lambda text="", *args, **kwargs: lines.extend(str(text).splitlines()))
+    return lines
+
+def test_buffered_log_prints_every_message_in_order(monkeypatch, printed):
+    monkeypatch.setattr(log, "quiet", False)
+    with log.buffered():
+        for n in range(1200): # More than one printer batch
+            log.info(f"line {n}", per_file=True)
+    assert printed == [f"[bold cyan][*][/bold cyan] line {n}" for n in range(1200)]
+
+def test_quiet_mode_drops_per_file_lines_only(monkeypatch, printed):
+    monkeypatch.setattr(log, "quiet", True)
+    log.info("per file", per_file=True)
+    log.success("summary")
+    assert printed == ["[bold green][+][/bold green] summary"]
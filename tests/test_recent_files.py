@@ -0,0 +1,55 @@
+import os
+import time
+import pytest
+from artifacts.recent_files import DEFAULT_EXCLUDES, RecentFilesScanner
+from core.index import ScanIndex
+from core.scanner import Scanner
+
+def _touch(root, relative, age_days=0):
+    path = os.path.join(root, *relative.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(relative)
+    stamp = time.time() - age_days * 86400
+    os.utime(path, (stamp, stamp))
+    return path
+
+@pytest.fixture
+def home(tmp_path):
+    root = str(tmp_path / "home")
+    for relative in ("notes.txt", "Documents/report.docx", "Documents/a/b/c/deep.txt",
+                     ".ssh/known_hosts", "project/node_modules/pkg/index.js", "Library/Caches/app/blob"):
+        _touch(root, relative)
+    _touch(root, "Documents/old.txt", age_days=30)
+    return root
+
+def _found(scanner, root, **kwargs):
+    return sorted(os.path.relpath(f["path"], root).replace(os.sep, "/") for f in scanner.scan_recent(**kwargs))
+
+def test_default_walk_skips_old_hidden_and_excluded_files(home):
+    scanner = RecentFilesScanner(root=home, workers=2)
+    assert _found(scanner, home, days=7) == ["Documents/a/b/c/deep.txt", "Documents/report.docx", "notes.txt"]
+
+def test_depth_limit(home):
+    scanner = RecentFilesScanner(root=home, max_depth=2)
+    assert _found(scanner, home, days=7) == ["Documents/report.docx", "notes.txt"]
+
+def test_custom_excludes_and_hidden_folders(home):
+    scanner = RecentFilesScanner(root=home, exclude=DEFAULT_EXCLUDES + ("Documents",), skip_hidden=False)
+    assert _found(scanner, home, days=7) == [".ssh/known_hosts", "notes.txt"]
+
+def test_index_answers_the_same_as_a_walk(home, tmp_path):
+    db_path = str(tmp_path / "case.db")
+    index = ScanIndex(db_path, home)
+    try:
+        for _ in Scanner(home, index=index).iter_scan():
+            pass
+    finally:
+        index.close()
+
+    index = ScanIndex(db_path, home, create=False)
+    try:
+        from_index = _found(RecentFilesScanner(root=home), home, days=7, index=index)
+    finally:
+        index.close()
+    assert from_index == _found(RecentFilesScanner(root=home), home, days=7)
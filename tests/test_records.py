@@ -0,0 +1,66 @@
+import json
+import pickle
+import pytest
+from core.records import FileRecord, RecordStore, json_default
+
+def _record(path="/evidence/docs/report.pdf", **extra):
+    record = FileRecord(path, 1234, 1.5, 2.5, 3.5, "pdf", "pdf")
+    for key, value in extra.items():
+        record[key] = value
+    return record
+
+def test_record_behaves_like_the_dict_it_replaces():
+    record = _record(hashes={"sha256": "ab"})
+    assert record["path"] == "/evidence/docs/report.pdf"
+    assert record.get("reason") is None
+    assert "hashes" in record and "reason" not in record
+    assert list(record) == ["path", "size", "created", "modified", "accessed", "extension_claimed",
+                            "extension_detected", "suspicious", "hashes"]
+    assert record.to_dict() == dict(record)
+
+    record["suspicious"] = True
+    record["reason"] = "test"
+    record["extension_detected"] = "exe"
+    assert record.to_dict()["suspicious"] and record["extension_detected"] == "exe"
+    del record["reason"]
+    with pytest.raises(KeyError):
+        record["reason"]
+    with pytest.raises(TypeError):
+        del record["size"]
+
+def test_record_round_trips_through_json_and_pickle():
+    record = _record(entropy=7.2)
+    assert json.loads(json.dumps(record, default=json_default)) == record.to_dict()
+    assert pickle.loads(pickle.dumps(record)).to_dict() == record.to_dict()
+    assert FileRecord.from_dict(record.to_dict()).to_dict() == record.to_dict()
+
+def test_records_in_one_directory_share_its_prefix():
+    a, b = _record("/evidence/docs/a.txt"), _record("/evidence/docs/b.txt")
+    assert a._dir is b._dir
+
+def test_store_returns_equal_independent_records():
+    records = [
+        _record("/evidence/docs/a.txt"),
+        _record("/evidence/docs/b\udcff.bin", hashes={"md5": "00"}), # Undecodable name
+        _record("relative.txt", suspicious=True),
+        {"path": "/evidence/c.txt", "size": 1, "created": 0.0, "modified": 0.0, "accessed": 0.0,
+         "extension_claimed": "txt", "extension_detected": None, "suspicious": False},
+    ]
+    store = RecordStore(records)
+    assert len(store) == 4
+    assert [r.to_dict() for r in store] == [dict(r) for r in records]
+    assert store[-1]["path"] == "/evidence/c.txt"
+    assert [r["path"] for r in store[1:3]] == ["/evidence/docs/b\udcff.bin", "relative.txt"]
+    with pytest.raises(IndexError):
+        store[4]
+
+    # Changing a materialised record leaves the stored copy alone
+    first = store[1]
+    first["hashes"] = {"md5": "ff"}
+    first["size"] = 0
+    assert store[1]["hashes"] == {"md5": "00"} and store[1]["size"] == 1234
+
+def test_store_survives_pickling():
+    store = RecordStore([_record(), _record("/evidence/x.jpg", known_good="nsrl")])
+    copy = pickle.loads(pickle.dumps(store))
+    assert [r.to_dict() for r in copy] == [r.to_dict() for r in store]
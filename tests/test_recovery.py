@@ -0,0 +1,90 @@
+import glob
+import hashlib
+import json
+import os
+from core.recovery import RecoveryEngine
+
+def _sources(directory, contents):
+    os.makedirs(directory)
+    records = []
+    for name, content in contents.items():
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        records.append({"path": path, "size": len(content), "created": 0, "extension_detected": None})
+    return records
+
+def _manifest(output_dir):
+    with open(os.path.join(output_dir, "manifest.ndjson")) as f:
+        return [json.loads(line) for line in f]
+
+def test_recovery_renames_clashing_names(tmp_path):
+    records = _sources(str(tmp_path / "a"), {"same.txt": b"one"}) + _sources(str(tmp_path / "b"), {"same.txt": b"two"})
+    output = str(tmp_path / "out")
+    assert RecoveryEngine(output, workers=2).recover_files(records) == 2
+    recovered = sorted(os.listdir(output))
+    assert len(recovered) == 2 and "same.txt" in recovered
+
+def test_dedup_stores_identical_content_once(tmp_path):
+    records = _sources(str(tmp_path / "src"), {"a.txt": b"same", "b.txt": b"same", "c.txt": b"other"})
+    output = str(tmp_path / "out")
+    engine = RecoveryEngine(output, workers=4, dedup=True)
+    assert engine.recover_files(records) == 3
+    assert engine.duplicates == 1
+    assert len(glob.glob(os.path.join(output, "blobs", "*", "*"))) == 2
+
+    manifest = _manifest(output)
+    assert [entry["duplicate"] for entry in manifest].count(True) == 1
+    for entry in manifest:
+        with open(os.path.join(output, entry["blob"]), "rb") as f:
+            assert hashlib.sha256(f.read()).hexdigest() == entry["sha256"]
+
+def test_dedup_rewrites_a_corrupt_blob_from_an_earlier_run(tmp_path):
+    records = _sources(str(tmp_path / "src"), {"a.txt": b"evidence"})
+    output = str(tmp_path / "out")
+    RecoveryEngine(output, dedup=True).recover_files(records)
+    (blob,) = glob.glob(os.path.join(output, "blobs", "*", "*"))
+    # Same size, different bytes: a size check alone would trust it
+    with open(blob, "wb") as f:
+        f.write(b"EVIDENCE")
+
+    assert RecoveryEngine(output, dedup=True).recover_files(records) == 1
+    with open(blob, "rb") as f:
+        assert f.read() == b"evidence"
+
+def test_dedup_refuses_content_that_does_not_match_its_digest(tmp_path):
+    records = _sources(str(tmp_path / "src"), {"a.txt": b"evidence"})
+    # A scan digest that no longer matches the file, as if it changed after the scan
+    records[0]["hashes"] = {"sha256": hashlib.sha256(b"stale").hexdigest()}
+    output = str(tmp_path / "out")
+    assert RecoveryEngine(output, dedup=True).recover_files(records) == 0
+    assert glob.glob(os.path.join(output, "blobs", "*", "*")) == []
+
+def test_checksum_lists_match_recovered_files(tmp_path):
+    records = _sources(str(tmp_path / "src"), {"a.txt": b"alpha", "b.txt": b"bravo"})
+    for record in records:
+        with open(record["path"], "rb") as f:
+            record["hashes"] = {"sha256": hashlib.sha256(f.read()).hexdigest()}
+    output = str(tmp_path / "out")
+    RecoveryEngine(output, dedup=True).recover_files(records)
+    with open(os.path.join(output, "SHA256SUMS")) as f:
+        for line in f:
+            digest, name = line.rstrip("\n").split("  ", 1)
+            with open(os.path.join(output, name), "rb") as blob:
+                assert hashlib.sha256(blob.read()).hexdigest() == digest
+
+def test_container_recovery_reads_each_file_once(tmp_path, monkeypatch):
+    from core import container
+    records = _sources(str(tmp_path / "src"), {"a.txt": b"same", "b.txt": b"same", "c.txt": b"other"})
+    calls = []
+    real_hash_file = container.hash_file
+    monkeypatch.setattr(container, "hash_file", lambda path, *a: calls.append(path) or real_hash_file(path, *a))
+
+    engine = RecoveryEngine(str(tmp_path / "out"), container=str(tmp_path / "case.nxc"))
+    assert engine.recover_files(records) == 3
+    assert engine.duplicates == 1
+    # Without scan digests the writer's own hashing pass is the only read
+    assert calls == []
+    with container.ContainerReader(str(tmp_path / "case.nxc")) as reader:
+        assert len(reader.blobs) == 2
+        assert all(reader.read(entry["sha256"]) for entry in reader.entries)
@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import time
+from core.records import FileRecord
+from core.report import ChunkedWriter, JSONReportWriter, RecordSpool, SQLiteReportWriter, write_summary
+
+def _records(count):
+    records = []
+    for n in range(count):
+        record = FileRecord(f"/evidence/file{n}.txt", n, 1.0, 2.0, 3.0, "txt", None)
+        if n % 3 == 0:
+            record["suspicious"] = True
+            record["reason"] = "test"
+        records.append(record)
+    return records
+
+def test_json_report_lists_spooled_suspicious_records(tmp_path):
+    records = _records(10)
+    output = str(tmp_path / "scan_report.json")
+    writer = JSONReportWriter(output, {"scan_target": "/evidence"})
+    for record in records:
+        writer.write(record)
+    writer.trailer["deleted_files"] = iter(["/evidence/gone.txt"])
+    writer.close()
+
+    with open(output) as f:
+        report = json.load(f)
+    assert report["files_found"] == 10
+    assert [r["path"] for r in report["all_files"]] == [r["path"] for r in records]
+    assert report["suspicious_files"] == [r.to_dict() for r in records if r["suspicious"]]
+    assert report["deleted_files"] == ["/evidence/gone.txt"]
+
+def test_pretty_json_report_matches_json_dump(tmp_path):
+    records = _records(4)
+    output = str(tmp_path / "scan_report.json")
+    with JSONReportWriter(output, {"scan_target": "/evidence"}, pretty=True) as writer:
+        for record in records:
+            writer.write(record)
+
+    expected = {
+        "scan_target": "/evidence",
+        "all_files": [r.to_dict() for r in records],
+        "suspicious_files": [r.to_dict() for r in records if r["suspicious"]],
+        "files_found": 4
+    }
+    with open(output) as f:
+        assert f.read() == json.dumps(expected, indent=4) + "\n"
+
+def test_record_spool_can_be_read_more_than_once():
+    spool = RecordSpool()
+    try:
+        for path in ("/a", "/b\udcff"): # Undecodable names survive the round trip
+            spool.append(path)
+        assert spool.count == 2
+        assert list(spool) == ["/a", "/b\udcff"]
+        spool.append("/c")
+        assert list(spool) == ["/a", "/b\udcff", "/c"]
+    finally:
+        spool.close()
+
+def test_summary_streams_iterator_values(tmp_path):
+    output = str(tmp_path / "summary.json")
+    write_summary(output, {"files_found": 2, "deleted_files": iter(["/a", "/b"]), "index_changes": {"deleted": 2}})
+    with open(output) as f:
+        assert json.load(f) == {"files_found": 2, "deleted_files": ["/a", "/b"], "index_changes": {"deleted": 2}}
+
+def test_sqlite_report_stores_records_and_lists(tmp_path):
+    output = str(tmp_path / "scan_report.db")
+    with SQLiteReportWriter(output, batch_size=3) as writer:
+        for record in _records(10):
+            writer.write(record)
+        writer.write_value("deleted_files", iter(["/evidence/gone.txt"]))
+        writer.write_value("files_found", 10)
+
+    conn = sqlite3.connect(output)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM files").fetchone() == (10,)
+        assert conn.execute("SELECT COUNT(*) FROM suspicious_files").fetchone() == (4,)
+        assert conn.execute("SELECT data FROM records WHERE section = 'deleted_files'").fetchall() == [('"/evidence/gone.txt"',)]
+        assert conn.execute("SELECT value FROM meta WHERE key = 'files_found'").fetchone() == ("10",)
+    finally:
+        conn.close()
+
+def test_chunks_reach_disk_before_close(tmp_path):
+    output = tmp_path / "out.txt"
+    writer = ChunkedWriter(str(output), chunk_size=10)
+    try:
+        writer.write("12345")
+        writer.write("67890") # Completes a chunk
+        writer.write("tail")
+        # The background thread writes and flushes the first chunk on its own
+        for _ in range(100):
+            if output.read_text():
+                break
+            time.sleep(0.01)
+        assert output.read_text() == "1234567890"
+    finally:
+        writer.close()
+    assert output.read_text() == "1234567890tail"
+
+def test_scan_writes_an_sqlite_report(cli, tmp_path):
+    target = tmp_path / "evidence"
+    target.mkdir()
+    for n in range(5):
+        (target / f"file{n}.txt").write_text("text")
+    (target / "image.txt").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(64))
+    result = cli("scan", str(target), "--format", "sqlite", "--machine")
+    assert json.loads(result.stdout)["report"] == "scan_report.db"
+
+    conn = sqlite3.connect(str(tmp_path / "scan_report.db"))
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM files").fetchone() == (6,)
+        assert conn.execute("SELECT extension_detected FROM suspicious_files").fetchall() == [("png",)]
+        indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"files_path", "files_suspicious", "records_section"} <= indexes
+    finally:
+        conn.close()
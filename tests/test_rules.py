@@ -0,0 +1,72 @@
+import re
+import pytest
+from core.rules import RuleEngine, load_rules
+
+def _record(path, detected=None, size=1000, **extra):
+    name = path.rsplit("/", 1)[-1]
+    claimed = name.rsplit(".", 1)[1].lower() if "." in name else ""
+    return {"path": path, "size": size, "extension_claimed": claimed, "extension_detected": detected, **extra}
+
+@pytest.fixture(scope="module")
+def rules():
+    return load_rules()
+
+@pytest.mark.parametrize("path, detected, reason", [
+    ("/evidence/invoice.pdf.exe", "exe", "Double extension detected"),
+    ("/evidence/invoice.pdf", "exe", "Extension Mismatch (Claimed: pdf, Detected: exe)"),
+    ("/evidence/.cache/payload.exe", "exe", "Executable in hidden location"),
+    ("/evidence/Downloads/setup.exe", "exe", "Executable in temporary or download location"),
+    ("/evidence/report.docx.locked", None, "Ransomware-associated extension"),
+    ("/evidence/HOW_TO_DECRYPT.txt", None, "Possible ransom note"),
+])
+def test_default_rules_flag(rules, path, detected, reason):
+    assert reason in rules.evaluate(_record(path, detected), path[len("/evidence"):])
+
+@pytest.mark.parametrize("path, detected", [
+    ("/evidence/photo.jpg", "jpg"),
+    ("/evidence/notes.txt", None),
+    ("/evidence/Downloads/manual.pdf", "pdf"),
+    ("/evidence/.config/settings.json", None), # Hidden, but not an executable
+])
+def test_default_rules_pass_ordinary_files(rules, path, detected):
+    assert rules.evaluate(_record(path, detected), path[len("/evidence"):]) == []
+
+def test_location_rules_only_see_the_path_below_the_root(rules):
+    record = _record("/home/.case/evidence/tool.exe", "exe")
+    assert "Executable in hidden location" in rules.evaluate(record)
+    assert "Executable in hidden location" not in rules.evaluate(record, "/evidence/tool.exe")
+
+def test_size_rules(rules):
+    assert "Empty executable" in rules.evaluate(_record("/e/a.exe", "exe", size=0), "/a.exe")
+    assert "Unusually large script" in rules.evaluate(_record("/e/a.ps1", size=2 * 1024 * 1024), "/a.ps1")
+    assert "Unusually large script" not in rules.evaluate(_record("/e/a.ps1", size=1024), "/a.ps1")
+
+def test_entropy_rule(rules):
+    def flagged(path, detected, entropy, size=100_000):
+        return any(r.startswith("High-entropy") for r in rules.evaluate(_record(path, detected, size, entropy=entropy), path))
+
+    assert flagged("/notes.txt", None, 7.9)
+    assert not flagged("/notes.txt", None, 5.0)
+    assert not flagged("/notes.txt", None, 7.9, size=100) # Too small to judge
+    assert not flagged("/photo.jpg", "jpg", 7.9) # Compressed by design
+    assert flagged("/photo.jpg", None, 7.9) # A .jpg that lost its header
+
+def test_known_bad_rule_names_the_set(rules):
+    assert "Hash listed in known-bad set malware" in rules.evaluate(_record("/a.txt", known_bad="malware"), "/a.txt")
+
+def test_every_matching_rule_contributes_a_reason(rules):
+    reasons = rules.evaluate(_record("/e/Downloads/invoice.pdf.exe", "exe", size=0), "/Downloads/invoice.pdf.exe")
+    assert len(reasons) == 3
+
+def test_reason_defaults_to_the_rule_name():
+    engine = RuleEngine([{"name": "bad_ext", "type": "extension", "extensions": ["BAD"]}])
+    assert engine.evaluate(_record("/a.bad")) == ["bad_ext"]
+
+@pytest.mark.parametrize("rule, message", [
+    ({"type": "extension", "extensions": ["x"], "reason": "No name"}, "Rule 1 has no name"),
+    ({"name": "odd", "type": "bogus"}, "Unknown rule type 'bogus' in rule 1 ('odd')"),
+])
+def test_invalid_rules_are_rejected_with_their_position(rule, message):
+    valid = {"name": "ok", "type": "extension", "extensions": ["x"]}
+    with pytest.raises(ValueError, match=re.escape(message)):
+        RuleEngine([valid, rule])
@@ -0,0 +1,87 @@
+import os
+import pytest
+from core.carver import Carver
+from core.recovery import RecoveryEngine
+from core.rules import load_rules
+from core.signatures import HEADER_SIZE, SignatureMatcher, get_file_type
+
+ZIP_HEADER = b"PK\x03\x04\x0a\x00\x00\x00"
+DOCX_HEADER = b"PK\x03\x04\x14\x00\x06\x00"
+
+@pytest.mark.parametrize("header, expected", [
+    (b"\xFF\xD8\xFF\xE0" + bytes(20), "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"%PDF-1.7\n", "pdf"),
+    (ZIP_HEADER, "zip"),
+    (DOCX_HEADER, "docx"), # Longest signature wins over its zip prefix
+    (b"MZ\x90\x00", "exe"),
+    (b"\x00\x00\x00\x1cftypisom", "mp4"), # Signature at offset 4
+    (bytes(257) + b"ustar\x0000", "tar"), # Signature at offset 257
+    (b"plain text", None),
+    (b"", None),
+])
+def test_get_file_type(header, expected):
+    assert get_file_type(header) == expected
+
+def test_header_size_covers_every_offset_signature():
+    assert HEADER_SIZE >= 257 + len(b"ustar")
+
+def test_truncated_header_does_not_match_deeper_signatures():
+    assert get_file_type(bytes(100)) is None
+
+def test_matcher_prefers_longest_signature_across_offsets():
+    matcher = SignatureMatcher({"short": [b"AB"], "long": [(2, b"CDEF")], "longer": [b"ABCDEFG"]})
+    assert matcher.match(b"ABCDEFG") == "longer"
+    assert matcher.match(b"ABCDEF") == "long"
+    assert matcher.match(b"ABXX") == "short"
+
+def _record(name, detected):
+    return {"path": f"/evidence/{name}", "size": 1000, "extension_claimed": os.path.splitext(name)[1][1:],
+            "extension_detected": detected, "suspicious": False}
+
+@pytest.mark.parametrize("name, detected", [
+    ("archive.zip", "docx"), # A zip written with docx header bytes
+    ("report.docx", "zip"),
+    ("book.epub", "zip"),
+    ("photo.jpeg", "jpg"),
+    ("clip.mov", "mp4"),
+    ("library.dll", "exe"),
+])
+def test_compatible_types_are_not_mismatches(name, detected):
+    reasons = load_rules().evaluate(_record(name, detected))
+    assert not any("Mismatch" in reason for reason in reasons)
+
+def test_incompatible_types_are_mismatches():
+    reasons = load_rules().evaluate(_record("invoice.pdf", "exe"))
+    assert "Extension Mismatch (Claimed: pdf, Detected: exe)" in reasons
+
+@pytest.mark.parametrize("detected, requested, wanted", [
+    ("docx", ["zip"], True),
+    ("zip", ["docx"], False), # A plain zip is not a docx
+    ("zip", ["apk"], False),
+    ("zip", ["zip"], True),
+    ("png", ["zip"], False),
+    ("jpg", ["jpg", "png"], True),
+    ("pdf", None, True),
+])
+def test_recovery_matches_specialised_types(tmp_path, detected, requested, wanted):
+    engine = RecoveryEngine(str(tmp_path / "out"))
+    assert engine._wanted(_record("archive.zip", detected), requested) is wanted
+
+def test_carver_carves_docx_header_zip_when_zip_is_requested(tmp_path):
+    # Minimal archive: local header, padding, end of central directory record
+    archive = DOCX_HEADER + bytes(40) + b"PK\x05\x06" + bytes(18)
+    image = tmp_path / "image.dd"
+    image.write_bytes(bytes(4096) + archive + bytes(4096))
+
+    carver = Carver(str(image), str(tmp_path / "carved"), types=("zip",), workers=1)
+    (carved,) = carver.carve()
+    assert carved["offset"] == 4096
+    assert carved["type"] == "zip"
+    with open(carved["path"], "rb") as f:
+        assert f.read() == archive
+
+@pytest.mark.parametrize("name", ["bundle.apk", "sheet.xlsx", "book.epub", "archive.zip"])
+def test_recovering_docx_skips_other_zip_containers(tmp_path, name):
+    engine = RecoveryEngine(str(tmp_path / "out"))
+    assert not engine._wanted(_record(name, "zip"), ["docx"])
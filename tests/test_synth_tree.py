@@ -0,0 +1,31 @@
+import hashlib
+import os
+from benchmarks.synth_tree import generate_tree
+from core.scanner import Scanner
+
+SMALL = {"files": 300, "size_median": 512, "size_max": 4096, "mismatch": 0.1, "double_ext": 0.05}
+
+def _digest_tree(root):
+    tree = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                tree[os.path.relpath(path, root)] = hashlib.sha256(f.read()).hexdigest()
+    return tree
+
+def test_same_seed_same_tree(tmp_path):
+    first = generate_tree(str(tmp_path / "a"), seed=3, **SMALL)
+    second = generate_tree(str(tmp_path / "b"), seed=3, **SMALL)
+    other = generate_tree(str(tmp_path / "c"), seed=4, **SMALL)
+    assert first == second
+    assert _digest_tree(tmp_path / "a") == _digest_tree(tmp_path / "b")
+    assert _digest_tree(tmp_path / "a") != _digest_tree(tmp_path / "c")
+    assert first["files"] == len(_digest_tree(tmp_path / "a")) == 300
+    assert first["bytes"] == sum(os.path.getsize(os.path.join(d, n)) for d, _, names in os.walk(tmp_path / "a") for n in names)
+
+def test_planted_anomalies_are_exactly_what_the_scanner_flags(tmp_path):
+    summary = generate_tree(str(tmp_path), seed=3, **SMALL)
+    assert summary["mismatch"] and summary["double_ext"]
+    suspicious = sum(1 for record in Scanner(str(tmp_path)).iter_scan() if record["suspicious"])
+    assert suspicious == summary["mismatch"] + summary["double_ext"]
@@ -0,0 +1,142 @@
+import csv
+import json
+import os
+import random
+import sqlite3
+from core import timeline as timeline_module
+from core.timeline import TimelineGenerator, parse_timestamp
+
+def _record(n, created, modified, accessed):
+    return {"path": f"/evidence/file{n}.txt", "size": n, "created": created, "modified": modified, "accessed": accessed}
+
+def _records(count, seed=7):
+    rng = random.Random(seed)
+    return [_record(n, *(rng.uniform(0, 1e9) for _ in range(3))) for n in range(count)]
+
+def test_external_sort_matches_in_memory_sort():
+    records = _records(500)
+    # A budget far below the event count spills many runs to merge
+    spilled = TimelineGenerator(records, memory_budget=64)
+    in_memory = TimelineGenerator(records)
+    try:
+        assert spilled.build() == in_memory.build() == 1500
+        assert spilled._runs and not in_memory._runs
+        events = list(spilled.iter_events())
+        assert events == list(in_memory.iter_events())
+        timestamps = [event["timestamp"] for event in events]
+        assert timestamps == sorted(timestamps)
+    finally:
+        spilled.close()
+        in_memory.close()
+
+def test_block_sort_merges_to_a_stable_order(monkeypatch):
+    # Tiny sort blocks, with many equal timestamps spread across them
+    monkeypatch.setattr(timeline_module, "_SORT_BLOCK", 7)
+    rng = random.Random(11)
+    records = [_record(n, *(float(rng.randrange(20)) for _ in range(3))) for n in range(100)]
+    timeline = TimelineGenerator(records, memory_budget=64)
+    try:
+        timeline.build()
+        events = [(e["timestamp"], e["file"], e["type"]) for e in timeline.iter_events()]
+    finally:
+        timeline.close()
+
+    expected = sorted(
+        ((r[field], r["path"], kind) for r in records for kind, field in zip(("CREATED", "MODIFIED", "ACCESSED"), ("created", "modified", "accessed"))),
+        key=lambda event: event[0]
+    )
+    assert events == expected
+
+def test_equal_timestamps_keep_insertion_order():
+    timeline = TimelineGenerator([_record(1, 5.0, 5.0, 5.0), _record(2, 5.0, 5.0, 5.0)], memory_budget=2)
+    try:
+        timeline.build()
+        assert [(e["file"], e["type"]) for e in timeline.iter_events()] == [
+            ("/evidence/file1.txt", "CREATED"), ("/evidence/file1.txt", "MODIFIED"), ("/evidence/file1.txt", "ACCESSED"),
+            ("/evidence/file2.txt", "CREATED"), ("/evidence/file2.txt", "MODIFIED"), ("/evidence/file2.txt", "ACCESSED"),
+        ]
+    finally:
+        timeline.close()
+
+def test_time_window_applies_to_every_export(tmp_path):
+    records = [_record(1, 50.0, 150.0, 250.0), _record(2, 10.0, 20.0, 30.0), _record(3, 100.0, 200.0, 120.0)]
+    timeline = TimelineGenerator(records, since=100, until=200)
+    try:
+        timeline.build()
+        expected = [(100.0, "CREATED", "/evidence/file3.txt"), (120.0, "ACCESSED", "/evidence/file3.txt"),
+                    (150.0, "MODIFIED", "/evidence/file1.txt"), (200.0, "MODIFIED", "/evidence/file3.txt")]
+
+        timeline.export_ndjson(str(tmp_path / "t.ndjson"))
+        with open(tmp_path / "t.ndjson") as f:
+            assert [(e["timestamp"], e["type"], e["file"]) for e in map(json.loads, f)] == expected
+
+        timeline.export_json(str(tmp_path / "t.json"))
+        with open(tmp_path / "t.json") as f:
+            assert [(e["timestamp"], e["type"], e["file"]) for e in json.load(f)] == expected
+
+        timeline.export_csv(str(tmp_path / "t.csv"))
+        with open(tmp_path / "t.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [(float(r["timestamp"]), r["type"], r["file"]) for r in rows] == expected
+
+        # Times outside the window are blanked to 0 rather than written
+        timeline.export_bodyfile(str(tmp_path / "t.body"))
+        lines = (tmp_path / "t.body").read_text().splitlines()
+        assert lines == [
+            "0|/evidence/file1.txt|0|0|0|0|1|0|150|0|0",
+            "0|/evidence/file3.txt|0|0|0|0|3|120|200|100|0",
+        ]
+    finally:
+        timeline.close()
+
+def test_bodyfile_escapes_separators(tmp_path):
+    timeline = TimelineGenerator([{"path": "/evidence/a|b\nc", "size": 1, "created": 1.0, "modified": 2.0, "accessed": 3.0}])
+    try:
+        timeline.build()
+        timeline.export_bodyfile(str(tmp_path / "t.body"))
+        assert (tmp_path / "t.body").read_text() == "0|/evidence/a\\|b\\nc|0|0|0|0|1|3|2|1|0\n"
+    finally:
+        timeline.close()
+
+def test_parse_timestamp():
+    assert parse_timestamp("1700000000.5") == 1700000000.5
+    assert parse_timestamp("2024-01-01") == parse_timestamp("2024-01-01T00:00:00")
+
+def test_sqlite_export_keeps_only_events_in_the_window(tmp_path):
+    records = [_record(1, 50.0, 150.0, 250.0), _record(2, 10.0, 20.0, 30.0)]
+    timeline = TimelineGenerator(records, since=100)
+    try:
+        # File 2 has no event in the window, so nothing of it is stored
+        assert timeline.build() == 2
+        assert len(timeline.paths) == 1
+        timeline.export_sqlite(str(tmp_path / "timeline.db"))
+    finally:
+        timeline.close()
+
+    conn = sqlite3.connect(str(tmp_path / "timeline.db"))
+    try:
+        assert conn.execute("SELECT timestamp, type, file FROM events ORDER BY timestamp").fetchall() == [
+            (150.0, "MODIFIED", "/evidence/file1.txt"), (250.0, "ACCESSED", "/evidence/file1.txt")]
+        assert conn.execute("SELECT value FROM meta WHERE key = 'event_count'").fetchone() == ("2",)
+    finally:
+        conn.close()
+
+def test_timeline_command_filters_and_streams_ndjson(cli, tmp_path):
+    target = tmp_path / "evidence"
+    target.mkdir()
+    for name, stamp in (("old.txt", 1_000_000_000), ("new.txt", 1_700_000_000)):
+        path = target / name
+        path.write_text(name)
+        os.utime(path, (stamp, stamp))
+
+    result = cli("timeline", str(target), "--format", "ndjson", "--since", "2020-01-01T00:00:00+00:00", "--machine")
+    assert result.returncode == 0, result.stderr
+    outcome = json.loads(result.stdout)
+    assert outcome["output"] == "timeline.ndjson"
+
+    with open(tmp_path / "timeline.ndjson") as f:
+        events = [json.loads(line) for line in f]
+    assert len(events) == outcome["events"]
+    # Both files were created just now; only new.txt was also modified and accessed after 2020
+    assert {e["file"] for e in events if e["type"] != "CREATED"} == {str(target / "new.txt")}
+    assert all(e["timestamp"] >= 1577836800 for e in events)
@@ -0,0 +1,79 @@
+import queue
+import threading
+from collections import deque
+
+def ordered_map(executor, fn, iterable, window):
+    """Maps fn over iterable on an executor, yielding results in input order.
+
+    At most `window` calls are in flight at once, so arbitrarily long inputs
+    are consumed lazily and memory stays bounded.
+    """
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Abandon queued work if the consumer stops early
+        for future in pending:
+            future.cancel()
+
+class BackgroundConsumer:
+    """Runs a pull-based consumer on its own thread and feeds it with put().
+
+    `consume` receives an iterator over everything put() before close();
+    close() waits for it and returns its result, re-raising its exception.
+    The queue is bounded, so a slow consumer applies back-pressure.
+    """
+
+    _DONE = object()
+
+    def __init__(self, consume, maxsize=1024, name=None):
+        self._queue = queue.Queue(maxsize)
+        self._stopped = False
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(consume,), name=name, daemon=True)
+        self._thread.start()
+
+    def _items(self):
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            yield item
+
+    def _run(self, consume):
+        try:
+            self._result = consume(self._items())
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._stopped = True
+
+    def put(self, item):
+        # Retry with a timeout so a consumer that died never blocks the producer
+        while not self._stopped:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        if self._error:
+            raise self._error
+
+    def close(self):
+        self.put(self._DONE)
+        self._thread.join()
+        if self._error:
+            raise self._error
+        return self._result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
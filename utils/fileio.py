@@ -0,0 +1,69 @@
+import hashlib
+import os
+import shutil
+
+def copy_range(src_fd, dst_fd, offset, count):
+    """Copies `count` bytes from `offset` in src_fd to dst_fd's position, in-kernel when possible.
+
+    Uses copy_file_range (reflink-capable) first, then sendfile, and only
+    falls back to a userspace read/write loop when neither is supported.
+    Returns the number of bytes copied.
+    """
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while copied < count:
+                n = os.copy_file_range(src_fd, dst_fd, count - copied, offset + copied)
+                if n == 0:
+                    return copied
+                copied += n
+            return copied
+        except OSError:
+            pass # e.g. cross-device on older kernels; continue where we stopped
+
+    if hasattr(os, "sendfile"):
+        try:
+            while copied < count:
+                n = os.sendfile(dst_fd, src_fd, offset + copied, count - copied)
+                if n == 0:
+                    return copied
+                copied += n
+            return copied
+        except OSError:
+            pass
+
+    while copied < count:
+        block = os.pread(src_fd, min(1024 * 1024, count - copied), offset + copied)
+        if not block:
+            break
+        os.write(dst_fd, block)
+        copied += len(block)
+    return copied
+
+def copy_file(src_path, dst_path):
+    """Copies a file and its metadata (like shutil.copy2) without pulling data through Python."""
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        copied = copy_range(src.fileno(), dst.fileno(), 0, os.fstat(src.fileno()).st_size)
+    shutil.copystat(src_path, dst_path)
+    return copied
+
+def copy_file_hashed(src_path, dst_path, algorithm="sha256"):
+    """Copies a file and its metadata, hashing the bytes as they are written.
+
+    Returns (bytes copied, hex digest). The data passes through Python, so
+    use copy_file when the digest of the copy is not needed.
+    """
+    hasher = hashlib.new(algorithm)
+    copied = 0
+    buffer = memoryview(bytearray(1024 * 1024))
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        while True:
+            n = src.readinto(buffer)
+            if not n:
+                break
+            with buffer[:n] as block:
+                hasher.update(block)
+                dst.write(block)
+            copied += n
+    shutil.copystat(src_path, dst_path)
+    return copied, hasher.hexdigest()
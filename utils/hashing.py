@@ -1,13 +1,59 @@
 import hashlib
+import mmap
+import os
+import threading
+
+# Read size per pass; large enough that hashlib drops the GIL for each update
+CHUNK_SIZE = 1024 * 1024
+# Files at least this big are hashed straight from an mmap
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+_local = threading.local()
+
+def _read_buffer():
+    """Per-thread reusable read buffer."""
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = _local.buffer = memoryview(bytearray(CHUNK_SIZE))
+    return buffer
+
+def parse_algorithms(spec):
+    """Turns 'sha256,md5' into a tuple of validated hashlib algorithm names."""
+    algorithms = tuple(dict.fromkeys(a.strip().lower() for a in spec.split(",") if a.strip()))
+    for algorithm in algorithms:
+        if algorithm not in hashlib.algorithms_available:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        if hashlib.new(algorithm).digest_size == 0:
+            # SHAKE digests are variable-length and need an output size to hexdigest()
+            raise ValueError(f"Variable-length hash algorithm not supported: {algorithm}")
+    return algorithms
+
+def hash_file(file_path, algorithms=("sha256",)):
+    """Computes every requested digest of a file in a single read pass."""
+    hashers = [hashlib.new(algorithm) for algorithm in algorithms]
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    for start in range(0, size, CHUNK_SIZE):
+                        with view[start:start + CHUNK_SIZE] as block:
+                            for hasher in hashers:
+                                hasher.update(block)
+        else:
+            buffer = _read_buffer()
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                with buffer[:n] as block:
+                    for hasher in hashers:
+                        hasher.update(block)
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in zip(algorithms, hashers)}
 
 def calculate_sha256(file_path):
     """Calculates SHA256 hash of a file."""
-    sha256_hash = hashlib.sha256()
     try:
-        with open(file_path, "rb") as f:
-            # Read and update hash string value in blocks of 4K
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return hash_file(file_path, ("sha256",))["sha256"]
     except Exception as e:
         return None
@@ -1,4 +1,8 @@
 import logging
+import queue
+import sys
+import threading
+from contextlib import contextmanager
 from rich.console import Console
 from rich.theme import Theme
 
@@ -13,17 +17,75 @@ custom_theme = Theme({
 
 console = Console(theme=custom_theme)
 
+# Largest number of queued messages rendered in one console.print call
+_BATCH_LIMIT = 500
+
 class DFIRLogger:
-    def info(self, message):
-        console.print(f"[bold cyan][*][/bold cyan] {message}")
+    def __init__(self):
+        # Drops per-file messages (quiet mode); summaries are always shown
+        self.quiet = False
+        self._queue = None
+
+    def _emit(self, text, per_file):
+        if per_file and self.quiet:
+            return
+        sink = self._queue
+        if sink is not None:
+            sink.put(text)
+        else:
+            console.print(text)
+
+    def info(self, message, per_file=False):
+        self._emit(f"[bold cyan][*][/bold cyan] {message}", per_file)
+
+    def success(self, message, per_file=False):
+        self._emit(f"[bold green][+][/bold green] {message}", per_file)
+
+    def warning(self, message, per_file=False):
+        self._emit(f"[bold yellow][!][/bold yellow] {message}", per_file)
 
-    def success(self, message):
-        console.print(f"[bold green][+][/bold green] {message}")
+    def error(self, message, per_file=False):
+        self._emit(f"[bold red][!][/bold red] {message}", per_file)
 
-    def warning(self, message):
-        console.print(f"[bold yellow][!][/bold yellow] {message}")
-    
-    def error(self, message):
-        console.print(f"[bold red][!][/bold red] {message}")
+    @contextmanager
+    def buffered(self):
+        """Routes messages through a background printer for the duration of the block.
+
+        Callers only enqueue, so hot loops are not held up by terminal
+        rendering; queued lines are printed in batches and flushed on exit.
+        """
+        if self._queue is not None:
+            yield
+            return
+
+        sink = queue.SimpleQueue()
+        done = object()
+
+        def drain():
+            while True:
+                batch = [sink.get()]
+                while len(batch) < _BATCH_LIMIT and not sink.empty():
+                    batch.append(sink.get())
+                stop = batch[-1] is done
+                lines = [line for line in batch if line is not done]
+                if lines:
+                    console.print("\n".join(lines))
+                if stop:
+                    return
+
+        printer = threading.Thread(target=drain, name="log-sink", daemon=True)
+        printer.start()
+        self._queue = sink
+        try:
+            yield
+        finally:
+            self._queue = None
+            sink.put(done)
+            printer.join()
 
 log = DFIRLogger()
+
+def machine_output():
+    """Sends all console output to stderr, uncoloured, leaving stdout to machine-readable results."""
+    console.file = sys.stderr
+    console.no_color = True
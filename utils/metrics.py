@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+# Shared no-op returned by timer() while metrics are off, so disabled
+# instrumentation costs one attribute check and an empty `with`.
+_DISABLED = nullcontext()
+
+class Histogram:
+    """Latency histogram with power-of-two microsecond buckets."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = Counter()
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        # Bucket n holds samples below 2**n microseconds
+        self.buckets[max(0, int(seconds * 1e6)).bit_length()] += 1
+
+    def percentile(self, fraction):
+        """Upper bound, in seconds, of the bucket holding the given percentile."""
+        target, seen = self.count * fraction, 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return (1 << bucket) / 1e6
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_ms": self.total / self.count * 1e3 if self.count else None,
+            "min_ms": self.min * 1e3 if self.min is not None else None,
+            "max_ms": self.max * 1e3,
+            "p50_ms": self.percentile(0.50) * 1e3,
+            "p90_ms": self.percentile(0.90) * 1e3,
+            "p99_ms": self.percentile(0.99) * 1e3,
+            "buckets_us": {f"<{1 << bucket}": n for bucket, n in sorted(self.buckets.items())}
+        }
+
+class _Timer:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+class Metrics:
+    """Process-wide counters, latency histograms and error tallies.
+
+    Disabled by default; call enable() before the work starts.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = Counter()
+        self.histograms = {}
+        self.errors = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+        self.started = time.perf_counter()
+
+    def timer(self, name):
+        """Context manager recording the block's duration under `name`."""
+        return _Timer(self, name) if self.enabled else _DISABLED
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def incr(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += n
+
+    def error(self, stage, exc):
+        """Counts an exception by stage and type, even when it is otherwise swallowed."""
+        if self.enabled:
+            with self._lock:
+                by_type = self.errors.setdefault(stage, Counter())
+                by_type[type(exc).__name__] += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "wall_time_s": time.perf_counter() - self.started,
+                "counters": dict(self.counters),
+                "latency": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+                "errors": {stage: dict(by_type) for stage, by_type in self.errors.items()}
+            }
+
+    def write(self, output_path):
+        with open(output_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+metrics = Metrics()
@@ -0,0 +1,68 @@
+import os
+import time
+from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+from utils.logger import console, log
+
+class ScanProgress:
+    """Rate-limited progress display for per-file loops.
+
+    advance() only counts; the display is updated at most once every
+    `every_files` files or `interval` seconds, whichever comes first. When
+    output is not a terminal, or in quiet mode, nothing is rendered at all.
+    """
+
+    def __init__(self, description, every_files=1000, interval=0.1, enabled=None):
+        self.description = description
+        self.every_files = every_files
+        self.interval = interval
+        self.enabled = (console.is_terminal and not log.quiet) if enabled is None else enabled
+        self.files = 0
+        self.bytes = 0
+        self._progress = None
+
+    def __enter__(self):
+        self.started = self._rendered_at = time.perf_counter()
+        self._rendered_files = 0
+        if self.enabled:
+            self._progress = Progress(
+                SpinnerColumn(style="bold cyan"),
+                TextColumn("[bold cyan]{task.description}"),
+                BarColumn(bar_width=None, style="dim white"),
+                TextColumn("[bold white]{task.fields[files]}"),
+                TextColumn("[cyan]{task.fields[rate]}"),
+                TextColumn("[bold green]{task.fields[last_file]}"),
+                console=console
+            )
+            self._progress.__enter__()
+            self._task = self._progress.add_task(self.description, total=None, files="", rate="", last_file="")
+        return self
+
+    def advance(self, file_info):
+        self.files += 1
+        self.bytes += file_info["size"]
+        if self._progress is None:
+            return
+        now = time.perf_counter()
+        if self.files - self._rendered_files >= self.every_files or now - self._rendered_at >= self.interval:
+            self._render(now, os.path.basename(file_info["path"])[:30])
+
+    def _render(self, now, last_file, description=None):
+        elapsed = max(now - self.started, 1e-9)
+        fields = {
+            "files": f"{self.files:,} files",
+            "rate": f"{self.files / elapsed:,.0f} files/s  {self.bytes / elapsed / 1e6:,.1f} MB/s",
+            "last_file": last_file
+        }
+        if description:
+            fields["description"] = description
+        self._progress.update(self._task, **fields)
+        self._rendered_at = now
+        self._rendered_files = self.files
+
+    def finish(self, description, last_file=""):
+        if self._progress is not None:
+            self._render(time.perf_counter(), last_file, description)
+
+    def __exit__(self, *exc):
+        if self._progress is not None:
+            self._progress.__exit__(*exc)